@@ -0,0 +1,63 @@
+"""add full-text search vectors
+
+Revision ID: 20250401120000
+Revises: 20250320120000
+Create Date: 2025-04-01 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250401120000"
+down_revision = "20250320120000"
+branch_labels = None
+depends_on = None
+
+_SEARCH_VECTORS = {
+    "risk_version": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'C')"
+    ),
+    "control_version": (
+        "setweight(to_tsvector('simple', coalesce(control_code, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(framework, '')), 'C')"
+    ),
+    "incident_version": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'C')"
+    ),
+    "evidence_item": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table_name, expression in _SEARCH_VECTORS.items():
+        op.add_column(
+            table_name,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"ix_{table_name}_search_vector",
+            table_name,
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    for table_name in reversed(list(_SEARCH_VECTORS)):
+        op.drop_index(f"ix_{table_name}_search_vector", table_name=table_name)
+        op.drop_column(table_name, "search_vector")
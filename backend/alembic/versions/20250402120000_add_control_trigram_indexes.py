@@ -0,0 +1,38 @@
+"""add control trigram indexes
+
+Revision ID: 20250402120000
+Revises: 20250401120000
+Create Date: 2025-04-02 12:00:00.000000
+"""
+
+from alembic import op
+
+revision = "20250402120000"
+down_revision = "20250401120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_control_version_control_code_trgm",
+        "control_version",
+        ["control_code"],
+        postgresql_using="gin",
+        postgresql_ops={"control_code": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_control_version_title_trgm",
+        "control_version",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_version_title_trgm", table_name="control_version")
+    op.drop_index(
+        "ix_control_version_control_code_trgm", table_name="control_version"
+    )
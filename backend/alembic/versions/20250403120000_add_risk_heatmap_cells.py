@@ -0,0 +1,77 @@
+"""add risk heatmap cells
+
+Revision ID: 20250403120000
+Revises: 20250402120000
+Create Date: 2025-04-03 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250403120000"
+down_revision = "20250402120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "risk_heatmap_cell",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            nullable=False,
+        ),
+        sa.Column("likelihood", sa.Integer, nullable=False),
+        sa.Column("impact", sa.Integer, nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("risk_count", sa.Integer, nullable=False),
+        sa.UniqueConstraint(
+            "organisation_id",
+            "likelihood",
+            "impact",
+            "status",
+            "category",
+            name="uq_risk_heatmap_cell_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+        sa.CheckConstraint(
+            "risk_count >= 0", name="ck_risk_heatmap_cell_risk_count"
+        ),
+    )
+
+    op.execute(
+        """
+        INSERT INTO risk_heatmap_cell (
+            id, organisation_id, likelihood, impact, status, category, risk_count
+        )
+        SELECT
+            gen_random_uuid(),
+            latest.organisation_id,
+            latest.likelihood,
+            latest.impact,
+            latest.status,
+            latest.category,
+            count(*)
+        FROM (
+            SELECT DISTINCT ON (risk_id)
+                organisation_id, likelihood, impact, status, category
+            FROM risk_version
+            ORDER BY risk_id, version DESC
+        ) AS latest
+        GROUP BY
+            latest.organisation_id,
+            latest.likelihood,
+            latest.impact,
+            latest.status,
+            latest.category
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("risk_heatmap_cell")
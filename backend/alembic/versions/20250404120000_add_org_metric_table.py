@@ -0,0 +1,101 @@
+"""add org metric rollup table
+
+Revision ID: 20250404120000
+Revises: 20250403120000
+Create Date: 2025-04-04 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250404120000"
+down_revision = "20250403120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_metric",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            nullable=False,
+        ),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("dimension", sa.String(), nullable=False),
+        sa.Column("value", sa.BigInteger, nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "organisation_id",
+            "metric",
+            "dimension",
+            name="uq_org_metric_organisation_id_metric_dimension",
+        ),
+    )
+
+    op.execute(
+        """
+        WITH latest_risk AS (
+            SELECT DISTINCT ON (risk_id)
+                organisation_id, status, likelihood * impact AS score
+            FROM risk_version
+            ORDER BY risk_id, version DESC
+        ),
+        latest_control AS (
+            SELECT DISTINCT ON (control_id) organisation_id, status
+            FROM control_version
+            ORDER BY control_id, version DESC
+        ),
+        latest_incident AS (
+            SELECT iv.organisation_id, iv.status, iv.severity
+            FROM incident i
+            JOIN incident_version iv
+                ON iv.incident_id = i.id AND iv.version = i.latest_version
+        ),
+        metrics AS (
+            SELECT organisation_id, 'risk.count' AS metric, '' AS dimension,
+                count(*) AS value
+            FROM latest_risk GROUP BY organisation_id
+            UNION ALL
+            SELECT organisation_id, 'risk.score_total', '', sum(score)
+            FROM latest_risk GROUP BY organisation_id
+            UNION ALL
+            SELECT organisation_id, 'risk.by_status', status, count(*)
+            FROM latest_risk GROUP BY organisation_id, status
+            UNION ALL
+            SELECT organisation_id, 'control.count', '', count(*)
+            FROM latest_control GROUP BY organisation_id
+            UNION ALL
+            SELECT organisation_id, 'control.by_status', status, count(*)
+            FROM latest_control GROUP BY organisation_id, status
+            UNION ALL
+            SELECT organisation_id, 'incident.count', '', count(*)
+            FROM latest_incident GROUP BY organisation_id
+            UNION ALL
+            SELECT organisation_id, 'incident.by_status', status, count(*)
+            FROM latest_incident GROUP BY organisation_id, status
+            UNION ALL
+            SELECT organisation_id, 'incident.open_by_severity', severity,
+                count(*)
+            FROM latest_incident
+            WHERE lower(status) NOT IN ('closed', 'resolved')
+            GROUP BY organisation_id, severity
+        )
+        INSERT INTO org_metric (id, organisation_id, metric, dimension, value)
+        SELECT gen_random_uuid(), organisation_id, metric, dimension, value
+        FROM metrics
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("org_metric")
@@ -0,0 +1,46 @@
+"""add version created_at indexes for as-of reads
+
+Revision ID: 20250405120000
+Revises: 20250404120000
+Create Date: 2025-04-05 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250405120000"
+down_revision = "20250404120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_risk_version_risk_id_created_at_desc",
+        "risk_version",
+        ["risk_id", sa.text("created_at DESC"), sa.text("version DESC")],
+    )
+    op.create_index(
+        "ix_control_version_control_id_created_at_desc",
+        "control_version",
+        ["control_id", sa.text("created_at DESC"), sa.text("version DESC")],
+    )
+    op.create_index(
+        "ix_incident_version_incident_id_created_at_desc",
+        "incident_version",
+        ["incident_id", sa.text("created_at DESC"), sa.text("version DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_incident_version_incident_id_created_at_desc",
+        table_name="incident_version",
+    )
+    op.drop_index(
+        "ix_control_version_control_id_created_at_desc",
+        table_name="control_version",
+    )
+    op.drop_index(
+        "ix_risk_version_risk_id_created_at_desc", table_name="risk_version"
+    )
@@ -0,0 +1,42 @@
+"""add per-organisation change counter
+
+Revision ID: 20250406120000
+Revises: 20250405120000
+Create Date: 2025-04-06 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250406120000"
+down_revision = "20250405120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_change_counter",
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            primary_key=True,
+        ),
+        sa.Column("seq", sa.BigInteger, nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        "INSERT INTO org_change_counter (organisation_id, seq) "
+        "SELECT id, 1 FROM organisation"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("org_change_counter")
@@ -0,0 +1,74 @@
+"""add per-organisation change log
+
+Revision ID: 20250407120000
+Revises: 20250406120000
+Create Date: 2025-04-07 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250407120000"
+down_revision = "20250406120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_change",
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            primary_key=True,
+        ),
+        sa.Column("seq", sa.BigInteger, primary_key=True),
+        sa.Column("entity_type", sa.String, nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    # Seed one change per existing entity above each organisation's current
+    # sequence so a sync from cursor 0 returns the whole register.
+    op.execute(
+        """
+        INSERT INTO org_change (organisation_id, seq, entity_type, entity_id, created_at)
+        SELECT
+            e.organisation_id,
+            coalesce(c.seq, 0)
+                + row_number() OVER (
+                    PARTITION BY e.organisation_id ORDER BY e.created_at, e.id
+                ),
+            e.entity_type,
+            e.id,
+            e.created_at
+        FROM (
+            SELECT organisation_id, 'risk' AS entity_type, id, created_at FROM risk
+            UNION ALL
+            SELECT organisation_id, 'control', id, created_at FROM control
+            UNION ALL
+            SELECT organisation_id, 'incident', id, created_at FROM incident
+            UNION ALL
+            SELECT organisation_id, 'evidence', id, created_at FROM evidence_item
+        ) AS e
+        LEFT JOIN org_change_counter AS c
+            ON c.organisation_id = e.organisation_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO org_change_counter (organisation_id, seq)
+        SELECT organisation_id, max(seq) FROM org_change GROUP BY organisation_id
+        ON CONFLICT (organisation_id) DO UPDATE SET seq = excluded.seq
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("org_change")
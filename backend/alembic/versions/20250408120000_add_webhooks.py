@@ -0,0 +1,120 @@
+"""add webhook endpoints and delivery outbox
+
+Revision ID: 20250408120000
+Revises: 20250407120000
+Create Date: 2025-04-08 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250408120000"
+down_revision = "20250407120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_endpoint",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            nullable=False,
+        ),
+        sa.Column("url", sa.String, nullable=False),
+        sa.Column("secret", sa.String, nullable=False),
+        sa.Column("event_types", postgresql.ARRAY(sa.String), nullable=False),
+        sa.Column(
+            "is_active",
+            sa.Boolean,
+            server_default=sa.text("true"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_by_user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("user_account.id"),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_webhook_endpoint_organisation_id",
+        "webhook_endpoint",
+        ["organisation_id"],
+    )
+
+    op.create_table(
+        "webhook_delivery",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "endpoint_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("webhook_endpoint.id"),
+            nullable=False,
+        ),
+        sa.Column("event_type", sa.String, nullable=False),
+        sa.Column("payload", postgresql.JSONB, nullable=False),
+        sa.Column(
+            "status",
+            sa.String,
+            server_default=sa.text("'pending'"),
+            nullable=False,
+        ),
+        sa.Column(
+            "attempts",
+            sa.Integer,
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String, nullable=True),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_webhook_delivery_endpoint_id",
+        "webhook_delivery",
+        ["endpoint_id"],
+    )
+    op.create_index(
+        "ix_webhook_delivery_pending_due",
+        "webhook_delivery",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_delivery_pending_due", table_name="webhook_delivery")
+    op.drop_index("ix_webhook_delivery_endpoint_id", table_name="webhook_delivery")
+    op.drop_table("webhook_delivery")
+    op.drop_index(
+        "ix_webhook_endpoint_organisation_id", table_name="webhook_endpoint"
+    )
+    op.drop_table("webhook_endpoint")
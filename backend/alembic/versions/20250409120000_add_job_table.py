@@ -0,0 +1,81 @@
+"""add background job queue table
+
+Revision ID: 20250409120000
+Revises: 20250408120000
+Create Date: 2025-04-09 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250409120000"
+down_revision = "20250408120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organisation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("organisation.id"),
+            nullable=True,
+        ),
+        sa.Column("kind", sa.String, nullable=False),
+        sa.Column(
+            "payload",
+            postgresql.JSONB,
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column(
+            "priority", sa.Integer, server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "status",
+            sa.String,
+            server_default=sa.text("'queued'"),
+            nullable=False,
+        ),
+        sa.Column(
+            "attempts", sa.Integer, server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "max_attempts",
+            sa.Integer,
+            server_default=sa.text("3"),
+            nullable=False,
+        ),
+        sa.Column(
+            "run_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("locked_by", sa.String, nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.String, nullable=True),
+        sa.Column("result", postgresql.JSONB, nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_job_queued_priority_run_at",
+        "job",
+        [sa.text("priority DESC"), "run_at"],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_queued_priority_run_at", table_name="job")
+    op.drop_table("job")
@@ -0,0 +1,40 @@
+"""add extracted evidence content vector
+
+Revision ID: 20250410120000
+Revises: 20250409120000
+Create Date: 2025-04-10 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250410120000"
+down_revision = "20250409120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "evidence_item",
+        sa.Column("content_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.add_column(
+        "evidence_item",
+        sa.Column(
+            "content_indexed_at", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+    op.create_index(
+        "ix_evidence_item_content_vector",
+        "evidence_item",
+        ["content_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_evidence_item_content_vector", table_name="evidence_item")
+    op.drop_column("evidence_item", "content_indexed_at")
+    op.drop_column("evidence_item", "content_vector")
@@ -0,0 +1,45 @@
+"""add evidence integrity verification fields
+
+Revision ID: 20250411120000
+Revises: 20250410120000
+Create Date: 2025-04-11 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250411120000"
+down_revision = "20250410120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "evidence_item",
+        sa.Column("last_verified_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "evidence_item",
+        sa.Column("integrity_status", sa.String, nullable=True),
+    )
+    op.create_index(
+        "ix_evidence_item_last_verified_at",
+        "evidence_item",
+        [sa.text("last_verified_at NULLS FIRST")],
+    )
+    op.create_index(
+        "ix_evidence_item_organisation_id_last_verified_at",
+        "evidence_item",
+        ["organisation_id", sa.text("last_verified_at NULLS FIRST")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_evidence_item_organisation_id_last_verified_at",
+        table_name="evidence_item",
+    )
+    op.drop_index("ix_evidence_item_last_verified_at", table_name="evidence_item")
+    op.drop_column("evidence_item", "integrity_status")
+    op.drop_column("evidence_item", "last_verified_at")
@@ -0,0 +1,25 @@
+"""add evidence content encoding
+
+Revision ID: 20250412120000
+Revises: 20250411120000
+Create Date: 2025-04-12 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250412120000"
+down_revision = "20250411120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "evidence_item",
+        sa.Column("content_encoding", sa.String, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("evidence_item", "content_encoding")
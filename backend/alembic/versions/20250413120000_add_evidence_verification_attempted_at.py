@@ -0,0 +1,33 @@
+"""add evidence verification attempted at
+
+Revision ID: 20250413120000
+Revises: 20250412120000
+Create Date: 2025-04-13 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250413120000"
+down_revision = "20250412120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "evidence_item",
+        sa.Column(
+            "verification_attempted_at", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+    # Errored checks used to be recorded as verified; send them back for
+    # another attempt.
+    op.execute(
+        "UPDATE evidence_item SET last_verified_at = NULL, integrity_status = NULL "
+        "WHERE integrity_status = 'error'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("evidence_item", "verification_attempted_at")
@@ -0,0 +1,46 @@
+"""index versions by number for as-of reads
+
+Revision ID: 20250414120000
+Revises: 20250413120000
+Create Date: 2025-04-14 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250414120000"
+down_revision = "20250413120000"
+branch_labels = None
+depends_on = None
+
+# As-of reads now pick the highest version created at or before the
+# instant, so the index leads with version rather than created_at.
+_TABLES = (
+    ("risk_version", "risk_id"),
+    ("control_version", "control_id"),
+    ("incident_version", "incident_id"),
+)
+
+
+def upgrade() -> None:
+    for table, entity_column in _TABLES:
+        op.drop_index(
+            f"ix_{table}_{entity_column}_created_at_desc", table_name=table
+        )
+        op.create_index(
+            f"ix_{table}_{entity_column}_version_desc_created_at",
+            table,
+            [entity_column, sa.text("version DESC"), "created_at"],
+        )
+
+
+def downgrade() -> None:
+    for table, entity_column in reversed(_TABLES):
+        op.drop_index(
+            f"ix_{table}_{entity_column}_version_desc_created_at", table_name=table
+        )
+        op.create_index(
+            f"ix_{table}_{entity_column}_created_at_desc",
+            table,
+            [entity_column, sa.text("created_at DESC"), sa.text("version DESC")],
+        )
@@ -1,19 +1,27 @@
 from fastapi import APIRouter
 from app.api.routes.auth import router as auth_router
 from app.api.routes.bootstrap import router as bootstrap_router
+from app.api.routes.changes import router as changes_router
 from app.api.routes.control import router as control_router
 from app.api.routes.evidence import router as evidence_router
 from app.api.routes.incident import router as incident_router
+from app.api.routes.job import router as job_router
 from app.api.routes.organisation import router as organisation_router
 from app.api.routes.risk import router as risk_router
+from app.api.routes.search import router as search_router
 from app.api.routes.user_account import router as user_router
+from app.api.routes.webhook import router as webhook_router
 
 api_router = APIRouter()
 api_router.include_router(auth_router)
 api_router.include_router(bootstrap_router)
+api_router.include_router(changes_router)
 api_router.include_router(control_router)
 api_router.include_router(evidence_router)
 api_router.include_router(incident_router)
+api_router.include_router(job_router)
 api_router.include_router(organisation_router)
 api_router.include_router(risk_router)
+api_router.include_router(search_router)
 api_router.include_router(user_router)
+api_router.include_router(webhook_router)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.authorization import ORG_READ, require_permission
+from app.core.tenant import assert_path_matches_tenant, require_tenant_context
+from app.db.models import UserAccount
+from app.db.session import get_db
+from app.schemas.changes import ChangesOut
+from app.services.change_feed import iter_change_events
+from app.services.delta_sync import load_changes_since
+
+router = APIRouter(tags=["changes"])
+
+
+@router.get(
+    "/organisations/{organisation_id}/changes", response_model=ChangesOut
+)
+def list_changes(
+    organisation_id: UUID,
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=1000),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> ChangesOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+    return load_changes_since(db, organisation_id, since, limit)
+
+
+@router.get(
+    "/organisations/{organisation_id}/changes/stream",
+    response_class=StreamingResponse,
+)
+async def stream_changes(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> StreamingResponse:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+    # The stream can stay open for hours; hand the pooled connection back
+    # once the permission check is done.
+    db.close()
+
+    return StreamingResponse(
+        iter_change_events(organisation_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
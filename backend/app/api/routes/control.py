@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy import Integer, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import distinct_on
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.core.auth import get_actor
 from app.core.authorization import (
@@ -13,6 +23,12 @@ from app.core.authorization import (
     ORG_READ,
     require_permission,
 )
+from app.core.etag import apply_etag
+from app.core.responses import (
+    ndjson_stream_response,
+    orjson_list_response,
+    wants_ndjson,
+)
 from app.core.tenant import assert_path_matches_tenant, require_tenant_context
 from app.db.models import (
     Control,
@@ -23,16 +39,32 @@ from app.db.models import (
     UserAccount,
 )
 from app.db.session import get_db
+from app.db.statements import CONTROL_FOR_ORG, LATEST_CONTROL_VERSION
 from app.schemas.control import (
+    CONTROL_ROWS_ADAPTER,
     ControlCreate,
     ControlEvidenceLinkCreate,
     ControlEvidenceLinkOut,
+    ControlLookupOut,
     ControlOut,
     ControlVersionCreate,
     ControlVersionOut,
 )
 from app.schemas.evidence import EvidenceOut
+from app.schemas.version_diff import VersionChangelogOut, VersionDiffOut
 from app.services.audit import emit_audit_event
+from app.services.change_tracking import (
+    get_organisation_change_seq,
+    record_organisation_change,
+)
+from app.services.entity_cache import (
+    get_cached_entity,
+    invalidate_cached_entity,
+    store_cached_entity,
+)
+from app.services.org_metrics import apply_control_metrics_change
+from app.services.organisation_summary import invalidate_organisation_summary
+from app.services.version_diff import get_version_changelog, get_version_diff
 
 router = APIRouter(tags=["controls"])
 
@@ -42,10 +74,8 @@ def _require_control_for_org(
 ) -> Control:
     control = (
         db.execute(
-            select(Control).where(
-                Control.id == control_id,
-                Control.organisation_id == organisation_id,
-            )
+            CONTROL_FOR_ORG,
+            {"control_id": control_id, "organisation_id": organisation_id},
         )
         .scalars()
         .first()
@@ -93,6 +123,24 @@ def _control_out_from_latest(
     )
 
 
+def _control_row_columns(version) -> tuple:
+    # Labels match ControlOut so result rows map straight onto ControlRow dicts.
+    return (
+        Control.id.label("control_id"),
+        Control.organisation_id,
+        version.version.label("latest_version"),
+        version.framework,
+        version.control_code,
+        version.title,
+        version.description,
+        version.status,
+        version.owner_user_id,
+        literal(None, Integer).label("score"),
+        Control.created_at,
+        version.created_at.label("updated_at"),
+    )
+
+
 @router.post(
     "/organisations/{organisation_id}/controls", response_model=ControlOut
 )
@@ -130,6 +178,7 @@ def create_control(
         created_by_user_id=actor_user.id,
     )
     db.add(control_version)
+    apply_control_metrics_change(db, organisation_id, None, control_version)
 
     emit_audit_event(
         db,
@@ -151,6 +200,7 @@ def create_control(
         entity_id=control_version.id,
         metadata={"control_id": str(control.id), "version": 1},
     )
+    record_organisation_change(db, organisation_id, "control", control.id)
 
     try:
         db.commit()
@@ -158,6 +208,7 @@ def create_control(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
     db.refresh(control)
     db.refresh(control_version)
     return _control_out_from_latest(control, control_version)
@@ -168,37 +219,152 @@ def create_control(
 )
 def list_controls(
     organisation_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> list[ControlOut] | Response:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    not_modified = apply_etag(
+        request, response, get_organisation_change_seq(db, organisation_id)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if as_of is not None:
+        versions_as_of_subq = (
+            select(ControlVersion)
+            .ext(distinct_on(ControlVersion.control_id))
+            .where(
+                ControlVersion.organisation_id == organisation_id,
+                ControlVersion.created_at <= as_of,
+            )
+            .order_by(
+                ControlVersion.control_id,
+                ControlVersion.version.desc(),
+            )
+            .subquery()
+        )
+        version_as_of = aliased(ControlVersion, versions_as_of_subq)
+        statement = (
+            select(*_control_row_columns(version_as_of))
+            .join(version_as_of, version_as_of.control_id == Control.id)
+            .where(Control.organisation_id == organisation_id)
+        )
+    else:
+        latest_versions_subq = (
+            select(
+                ControlVersion.control_id,
+                func.max(ControlVersion.version).label("max_version"),
+            )
+            .where(ControlVersion.organisation_id == organisation_id)
+            .group_by(ControlVersion.control_id)
+            .subquery()
+        )
+        statement = (
+            select(*_control_row_columns(ControlVersion))
+            .join(
+                latest_versions_subq,
+                latest_versions_subq.c.control_id == Control.id,
+            )
+            .join(
+                ControlVersion,
+                (ControlVersion.control_id == latest_versions_subq.c.control_id)
+                & (ControlVersion.version == latest_versions_subq.c.max_version),
+            )
+            .where(Control.organisation_id == organisation_id)
+        )
+
+    if wants_ndjson(request):
+        return ndjson_stream_response(CONTROL_ROWS_ADAPTER, statement, response)
+    rows = db.execute(statement).mappings()
+    return orjson_list_response(
+        CONTROL_ROWS_ADAPTER, [dict(row) for row in rows], response
+    )
+
+
+@router.get(
+    "/organisations/{organisation_id}/controls/lookup",
+    response_model=list[ControlLookupOut],
+)
+def lookup_controls(
+    organisation_id: UUID,
+    q: str = Query(..., min_length=1, max_length=128),
+    limit: int = Query(default=10, ge=1, le=50),
+    threshold: float = Query(default=0.3, gt=0, le=1),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> list[ControlOut]:
+) -> list[ControlLookupOut]:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
-    latest_versions_subq = (
+    # Transaction-local thresholds let the % and <% operators use the
+    # trigram GIN indexes instead of filtering on similarity() afterwards.
+    db.execute(
         select(
-            ControlVersion.control_id,
-            func.max(ControlVersion.version).label("max_version"),
+            func.set_config(
+                "pg_trgm.similarity_threshold", str(threshold), True
+            ),
+            func.set_config(
+                "pg_trgm.word_similarity_threshold", str(threshold), True
+            ),
         )
-        .where(ControlVersion.organisation_id == organisation_id)
-        .group_by(ControlVersion.control_id)
-        .subquery()
+    )
+
+    newer = aliased(ControlVersion)
+    latest_version = (
+        select(func.max(newer.version))
+        .where(newer.control_id == ControlVersion.control_id)
+        .scalar_subquery()
+    )
+    code_prefix_match = ControlVersion.control_code.istartswith(
+        q, autoescape=True
+    )
+    similarity = func.greatest(
+        func.similarity(ControlVersion.control_code, q),
+        func.word_similarity(q, ControlVersion.title),
     )
 
     rows = db.execute(
-        select(Control, ControlVersion)
-        .join(
-            latest_versions_subq,
-            latest_versions_subq.c.control_id == Control.id,
+        select(
+            ControlVersion.control_id,
+            ControlVersion.control_code,
+            ControlVersion.title,
+            ControlVersion.framework,
+            ControlVersion.status,
+            similarity.label("similarity"),
         )
-        .join(
-            ControlVersion,
-            (ControlVersion.control_id == latest_versions_subq.c.control_id)
-            & (ControlVersion.version == latest_versions_subq.c.max_version),
+        .where(
+            ControlVersion.organisation_id == organisation_id,
+            or_(
+                code_prefix_match,
+                ControlVersion.control_code.bool_op("%")(q),
+                literal(q).bool_op("<%")(ControlVersion.title),
+            ),
+            ControlVersion.version == latest_version,
         )
-        .where(Control.organisation_id == organisation_id)
+        .order_by(
+            code_prefix_match.desc(),
+            similarity.desc(),
+            ControlVersion.control_code,
+        )
+        .limit(limit)
     ).all()
 
-    return [_control_out_from_latest(control, version) for control, version in rows]
+    return [
+        ControlLookupOut(
+            control_id=row.control_id,
+            control_code=row.control_code,
+            title=row.title,
+            framework=row.framework,
+            status=row.status,
+            similarity=row.similarity,
+        )
+        for row in rows
+    ]
 
 
 @router.get(
@@ -208,28 +374,42 @@ def list_controls(
 def get_control(
     organisation_id: UUID,
     control_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> ControlOut:
+) -> ControlOut | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
+    seq = get_organisation_change_seq(db, organisation_id)
+    not_modified = apply_etag(request, response, seq)
+    if not_modified is not None:
+        return not_modified
+
+    if as_of is None:
+        cached = get_cached_entity(
+            "control", organisation_id, control_id, seq, ControlOut
+        )
+        if cached is not None:
+            return cached
+
     control = _require_control_for_org(db, organisation_id, control_id)
 
+    version_query = LATEST_CONTROL_VERSION
+    if as_of is not None:
+        version_query = version_query.where(ControlVersion.created_at <= as_of)
     version = (
-        db.execute(
-            select(ControlVersion)
-            .where(ControlVersion.control_id == control.id)
-            .order_by(ControlVersion.version.desc())
-            .limit(1)
-        )
-        .scalars()
-        .first()
+        db.execute(version_query, {"control_id": control.id}).scalars().first()
     )
     if not version:
         raise HTTPException(status_code=404, detail="Control version not found")
 
-    return _control_out_from_latest(control, version)
+    control_out = _control_out_from_latest(control, version)
+    if as_of is None:
+        store_cached_entity("control", organisation_id, control_id, seq, control_out)
+    return control_out
 
 
 @router.post(
@@ -251,15 +431,12 @@ def create_control_version(
     if payload.owner_user_id is not None:
         _require_owner_user(db, organisation_id, payload.owner_user_id)
 
-    next_version = (
-        db.execute(
-            select(func.max(ControlVersion.version)).where(
-                ControlVersion.control_id == control.id
-            )
-        )
-        .scalar_one_or_none()
-        or 0
-    ) + 1
+    previous_version = (
+        db.execute(LATEST_CONTROL_VERSION, {"control_id": control.id})
+        .scalars()
+        .first()
+    )
+    next_version = (previous_version.version if previous_version else 0) + 1
 
     control_version = ControlVersion(
         organisation_id=organisation_id,
@@ -274,6 +451,9 @@ def create_control_version(
         created_by_user_id=actor_user.id,
     )
     db.add(control_version)
+    apply_control_metrics_change(
+        db, organisation_id, previous_version, control_version
+    )
 
     emit_audit_event(
         db,
@@ -285,6 +465,7 @@ def create_control_version(
         entity_id=control_version.id,
         metadata={"control_id": str(control.id), "version": next_version},
     )
+    record_organisation_change(db, organisation_id, "control", control_id)
 
     try:
         db.commit()
@@ -292,6 +473,8 @@ def create_control_version(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
+    invalidate_cached_entity("control", organisation_id, control_id)
     db.refresh(control)
     db.refresh(control_version)
     return _control_out_from_latest(control, control_version)
@@ -328,6 +511,53 @@ def list_control_versions(
     return list(versions)
 
 
+@router.get(
+    "/organisations/{organisation_id}/controls/{control_id}"
+    "/versions/{from_version}/diff/{to_version}",
+    response_model=VersionDiffOut,
+)
+def get_control_version_diff(
+    organisation_id: UUID,
+    control_id: UUID,
+    from_version: int = Path(ge=1),
+    to_version: int = Path(ge=1),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionDiffOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_control_for_org(db, organisation_id, control_id)
+
+    diff = get_version_diff(db, "control", control_id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Control version not found")
+    return diff
+
+
+@router.get(
+    "/organisations/{organisation_id}/controls/{control_id}/changelog",
+    response_model=VersionChangelogOut,
+)
+def get_control_changelog(
+    organisation_id: UUID,
+    control_id: UUID,
+    before: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionChangelogOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_control_for_org(db, organisation_id, control_id)
+
+    entries, next_before = get_version_changelog(
+        db, "control", control_id, before, limit
+    )
+    return VersionChangelogOut(entries=entries, next_before=next_before)
+
+
 @router.get(
     "/organisations/{organisation_id}/controls/{control_id}/evidence",
     response_model=list[EvidenceOut],
@@ -426,6 +656,7 @@ def link_control_evidence(
             "evidence_item_id": str(evidence.id),
         },
     )
+    record_organisation_change(db, organisation_id, "control", control.id)
 
     try:
         db.commit()
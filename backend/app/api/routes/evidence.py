@@ -1,42 +1,98 @@
 from __future__ import annotations
 
 import os
+import re
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from starlette.background import BackgroundTask
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.config import get_gcs_signed_url_ttl_seconds
+from app.core.config import (
+    get_gcs_signed_url_ttl_seconds,
+    get_s3_signed_url_ttl_seconds,
+)
 from app.core.auth import get_actor
 from app.core.authorization import (
     ORG_MANAGE_EVIDENCE,
     ORG_READ,
     require_permission,
 )
+from app.core.responses import ndjson_stream_response, wants_ndjson
 from app.core.tenant import assert_path_matches_tenant, require_tenant_context
 from app.db.models import EvidenceItem, Organisation, UserAccount
 from app.db.session import get_db
 from app.schemas.evidence import (
+    EVIDENCE_ROWS_ADAPTER,
     EvidenceCreate,
     EvidenceDownloadUrlOut,
+    EvidenceIntegrityItemOut,
+    EvidenceIntegrityOut,
     EvidenceOut,
+    EvidenceUploadUrlCreate,
+    EvidenceUploadUrlOut,
 )
+from app.schemas.job import JobOut
 from app.services.audit import emit_audit_event
+from app.services.change_tracking import record_organisation_change
 from app.services.evidence_storage import (
     EvidenceStorageCollision,
     EvidenceStorageError,
     LocalEvidenceStorage,
+    build_object_key,
     generate_gcs_signed_url,
     get_evidence_storage,
+    open_decoded_file,
 )
+from app.services.evidence_integrity import (
+    INTEGRITY_OK,
+    INTEGRITY_VERDICTS,
+    enqueue_evidence_verification,
+)
+from app.services.evidence_text import enqueue_evidence_text_extraction
+from app.services.organisation_summary import invalidate_organisation_summary
 
 router = APIRouter(tags=["evidence"])
 
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+SIGNED_URL_BACKENDS = {"gcs", "s3"}
+# S3 caps a single PUT at 5 GiB.
+MAX_DIRECT_UPLOAD_BYTES = 5 * 1024**3
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+_EVIDENCE_ROW_COLUMNS = (
+    EvidenceItem.id,
+    EvidenceItem.organisation_id,
+    EvidenceItem.title,
+    EvidenceItem.description,
+    EvidenceItem.evidence_type,
+    EvidenceItem.source,
+    EvidenceItem.external_uri,
+    EvidenceItem.storage_backend,
+    EvidenceItem.object_key,
+    EvidenceItem.original_filename,
+    EvidenceItem.sha256,
+    EvidenceItem.content_type,
+    EvidenceItem.size_bytes,
+    EvidenceItem.uploaded_at,
+    EvidenceItem.created_by_user_id,
+    EvidenceItem.created_at,
+)
+
 
 @router.post(
     "/organisations/{organisation_id}/evidence", response_model=EvidenceOut
@@ -79,6 +135,7 @@ def create_evidence_item(
         entity_id=evidence.id,
         metadata={"title": payload.title, "evidence_type": payload.evidence_type},
     )
+    record_organisation_change(db, organisation_id, "evidence", evidence.id)
 
     try:
         db.commit()
@@ -86,6 +143,7 @@ def create_evidence_item(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
     db.refresh(evidence)
     return evidence
 
@@ -95,13 +153,45 @@ def create_evidence_item(
 )
 def list_evidence_items(
     organisation_id: UUID,
+    request: Request,
+    response: Response,
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor: dict[str, UUID | str | None] = Depends(get_actor),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> list[EvidenceOut]:
+) -> list[EvidenceOut] | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
+    if wants_ndjson(request):
+        # The row count is unknown until the stream finishes, so the audit
+        # event records the export format instead.
+        emit_audit_event(
+            db,
+            organisation_id=organisation_id,
+            actor_user_id=actor_user.id,
+            actor_email=actor.get("actor_email"),
+            action="evidence.listed",
+            entity_type="evidence_item",
+            entity_id=None,
+            metadata={
+                "control_id": None,
+                "risk_id": None,
+                "count": None,
+                "format": "ndjson",
+            },
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        return ndjson_stream_response(
+            EVIDENCE_ROWS_ADAPTER,
+            select(*_EVIDENCE_ROW_COLUMNS).where(
+                EvidenceItem.organisation_id == organisation_id
+            ),
+            response,
+        )
+
     rows = db.execute(
         select(EvidenceItem).where(
             EvidenceItem.organisation_id == organisation_id
@@ -175,7 +265,10 @@ async def upload_evidence_file(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     try:
-        stored = storage.store_file(
+        # Off the event loop: the fsyncs block, and group-commit durability
+        # only batches uploads that are waiting concurrently.
+        stored = await run_in_threadpool(
+            storage.store_file,
             organisation_id,
             evidence.id,
             filename,
@@ -195,6 +288,7 @@ async def upload_evidence_file(
     evidence.sha256 = stored["sha256"]
     evidence.size_bytes = stored["size_bytes"]
     evidence.content_type = stored["content_type"]
+    evidence.content_encoding = stored.get("content_encoding")
     evidence.uploaded_at = datetime.now(timezone.utc)
 
     emit_audit_event(
@@ -212,6 +306,192 @@ async def upload_evidence_file(
             "backend": storage.backend,
         },
     )
+    record_organisation_change(db, organisation_id, "evidence", evidence.id)
+    enqueue_evidence_text_extraction(db, evidence)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    invalidate_organisation_summary(organisation_id)
+    db.refresh(evidence)
+    return evidence
+
+
+@router.post(
+    "/organisations/{organisation_id}/evidence/upload-url",
+    response_model=EvidenceUploadUrlOut,
+)
+def create_evidence_upload_url(
+    organisation_id: UUID,
+    payload: EvidenceUploadUrlCreate,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_EVIDENCE)),
+) -> EvidenceUploadUrlOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    organisation = db.get(Organisation, organisation_id)
+    if not organisation:
+        raise HTTPException(status_code=404, detail="Organisation not found")
+
+    sha256 = payload.sha256.lower()
+    if not SHA256_PATTERN.fullmatch(sha256):
+        raise HTTPException(
+            status_code=400, detail="sha256 must be a hex SHA-256 digest"
+        )
+    if not 0 <= payload.size_bytes <= MAX_DIRECT_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=400, detail="size_bytes is outside the direct upload limit"
+        )
+
+    try:
+        storage = get_evidence_storage()
+    except EvidenceStorageError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if storage.backend != "s3":
+        raise HTTPException(
+            status_code=409, detail="Direct uploads need the S3 backend; use /upload."
+        )
+
+    # The row has no object key until the upload is completed, so nothing
+    # downloads or verifies the object before its digest has been checked.
+    evidence = EvidenceItem(
+        organisation_id=organisation_id,
+        title=payload.title or payload.filename,
+        description=payload.description,
+        evidence_type=payload.evidence_type,
+        source=payload.source,
+        external_uri=payload.external_uri,
+        storage_backend=storage.backend,
+        original_filename=payload.filename,
+        sha256=sha256,
+        size_bytes=payload.size_bytes,
+        content_type=payload.content_type,
+        created_by_user_id=actor_user.id,
+    )
+    db.add(evidence)
+    db.flush()
+
+    ttl_seconds = get_s3_signed_url_ttl_seconds()
+    url, headers = storage.generate_signed_upload_url(
+        build_object_key(organisation_id, evidence.id, sha256, payload.filename),
+        ttl_seconds,
+        sha256,
+        payload.content_type,
+    )
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="evidence_item.upload_url_generated",
+        entity_type="evidence_item",
+        entity_id=evidence.id,
+        metadata={
+            "sha256": sha256,
+            "original_filename": payload.filename,
+            "size_bytes": payload.size_bytes,
+            "ttl_seconds": ttl_seconds,
+        },
+    )
+    record_organisation_change(db, organisation_id, "evidence", evidence.id)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    invalidate_organisation_summary(organisation_id)
+    return EvidenceUploadUrlOut(
+        evidence_id=evidence.id, url=url, expires_in=ttl_seconds, headers=headers
+    )
+
+
+@router.post(
+    "/organisations/{organisation_id}/evidence/{evidence_id}/complete-upload",
+    response_model=EvidenceOut,
+)
+def complete_evidence_upload(
+    organisation_id: UUID,
+    evidence_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_EVIDENCE)),
+) -> EvidenceOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    evidence = db.get(EvidenceItem, evidence_id)
+    if evidence is None or evidence.organisation_id != organisation_id:
+        raise HTTPException(status_code=404, detail="Evidence item not found")
+    if evidence.object_key is not None:
+        raise HTTPException(
+            status_code=409, detail="Evidence upload already completed"
+        )
+    if (
+        evidence.storage_backend != "s3"
+        or not evidence.sha256
+        or not evidence.original_filename
+    ):
+        raise HTTPException(
+            status_code=409, detail="Evidence item has no pending upload"
+        )
+
+    try:
+        storage = get_evidence_storage()
+    except EvidenceStorageError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if storage.backend != evidence.storage_backend:
+        raise HTTPException(
+            status_code=409,
+            detail="Evidence storage backend is not the configured backend",
+        )
+
+    object_key = build_object_key(
+        organisation_id, evidence.id, evidence.sha256, evidence.original_filename
+    )
+    stored = storage.stat_file(object_key)
+    if stored is None:
+        raise HTTPException(
+            status_code=409, detail="Evidence file has not been uploaded"
+        )
+    # S3 already refuses a PUT whose bytes miss the signed checksum; this
+    # catches objects written some other way under the same key.
+    if (
+        stored["sha256"] != evidence.sha256
+        or stored["size_bytes"] != evidence.size_bytes
+    ):
+        raise HTTPException(
+            status_code=409,
+            detail="Uploaded file does not match the declared sha256 and size",
+        )
+
+    evidence.object_key = object_key
+    evidence.uploaded_at = datetime.now(timezone.utc)
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="evidence_item.uploaded",
+        entity_type="evidence_item",
+        entity_id=evidence.id,
+        metadata={
+            "sha256": evidence.sha256,
+            "original_filename": evidence.original_filename,
+            "size_bytes": evidence.size_bytes,
+            "backend": storage.backend,
+        },
+    )
+    record_organisation_change(db, organisation_id, "evidence", evidence.id)
+    enqueue_evidence_text_extraction(db, evidence)
 
     try:
         db.commit()
@@ -219,6 +499,7 @@ async def upload_evidence_file(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
     db.refresh(evidence)
     return evidence
 
@@ -229,6 +510,7 @@ async def upload_evidence_file(
 def download_evidence_file(
     organisation_id: UUID,
     evidence_id: UUID,
+    request: Request,
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor: dict[str, UUID | str | None] = Depends(get_actor),
@@ -244,18 +526,31 @@ def download_evidence_file(
             status_code=404, detail="Evidence file not available"
         )
     if evidence.storage_backend != "local":
-        if evidence.storage_backend == "gcs":
+        if evidence.storage_backend in SIGNED_URL_BACKENDS:
             raise HTTPException(
                 status_code=409,
-                detail="Evidence stored in GCS; use /download-url.",
+                detail=(
+                    f"Evidence stored in {evidence.storage_backend.upper()}; "
+                    "use /download-url."
+                ),
             )
         raise HTTPException(
             status_code=409, detail="Evidence storage backend unsupported"
         )
 
-    storage = LocalEvidenceStorage()
+    # Clients that accept zstd get the stored bytes untouched; everyone else
+    # gets the original file, decompressed as it streams.
+    pass_through = evidence.content_encoding is not None and _accepts_encoding(
+        request, evidence.content_encoding
+    )
     try:
-        file_handle = storage.open_file(evidence.object_key)
+        storage = get_evidence_storage(LocalEvidenceStorage.backend)
+        if pass_through:
+            file_handle = storage.open_file(evidence.object_key)
+        else:
+            file_handle = open_decoded_file(
+                storage, evidence.object_key, evidence.content_encoding
+            )
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=404, detail="Evidence file not available"
@@ -269,6 +564,10 @@ def download_evidence_file(
     headers = {
         "Content-Disposition": f'attachment; filename="{filename}"'
     }
+    if evidence.content_encoding is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if pass_through:
+            headers["Content-Encoding"] = evidence.content_encoding
     media_type = evidence.content_type or "application/octet-stream"
 
     if _should_emit_download_audit():
@@ -291,7 +590,7 @@ def download_evidence_file(
             db.rollback()
 
     return StreamingResponse(
-        file_handle,
+        iter(lambda: file_handle.read(DOWNLOAD_CHUNK_BYTES), b""),
         media_type=media_type,
         headers=headers,
         background=BackgroundTask(file_handle.close),
@@ -319,29 +618,41 @@ def create_evidence_download_url(
         raise HTTPException(
             status_code=404, detail="Evidence file not available"
         )
-    if evidence.storage_backend != "gcs":
+    if evidence.storage_backend not in SIGNED_URL_BACKENDS:
         raise HTTPException(
             status_code=409, detail="Evidence stored locally; use /download."
         )
+    if evidence.content_encoding is not None:
+        # A signed URL would hand out the stored bytes with no decoding.
+        raise HTTPException(
+            status_code=409, detail="Evidence stored compressed; use /download."
+        )
 
     try:
         storage = get_evidence_storage()
     except EvidenceStorageError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    if storage.backend != "gcs":
+    if storage.backend != evidence.storage_backend:
         raise HTTPException(
-            status_code=409, detail="Evidence stored locally; use /download."
+            status_code=409,
+            detail="Evidence storage backend is not the configured backend",
         )
 
-    ttl_seconds = get_gcs_signed_url_ttl_seconds()
     filename = evidence.original_filename or f"{evidence.id}.bin"
-    bucket = storage.client.bucket(storage.bucket_name)
-    url = generate_gcs_signed_url(
-        bucket,
-        evidence.object_key,
-        filename,
-        ttl_seconds,
-    )
+    if storage.backend == "s3":
+        ttl_seconds = get_s3_signed_url_ttl_seconds()
+        url = storage.generate_signed_download_url(
+            evidence.object_key, filename, ttl_seconds
+        )
+    else:
+        ttl_seconds = get_gcs_signed_url_ttl_seconds()
+        bucket = storage.client.bucket(storage.bucket_name)
+        url = generate_gcs_signed_url(
+            bucket,
+            evidence.object_key,
+            filename,
+            ttl_seconds,
+        )
 
     emit_audit_event(
         db,
@@ -364,6 +675,103 @@ def create_evidence_download_url(
     return EvidenceDownloadUrlOut(url=url, expires_in=ttl_seconds)
 
 
+@router.post(
+    "/organisations/{organisation_id}/evidence/verify",
+    response_model=JobOut,
+    status_code=202,
+)
+def request_evidence_verification(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_EVIDENCE)),
+) -> JobOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    job = enqueue_evidence_verification(db, organisation_id)
+    db.flush()
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="evidence_item.verification_requested",
+        entity_type="job",
+        entity_id=job.id,
+        metadata=None,
+    )
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    db.refresh(job)
+    return JobOut.model_validate(job)
+
+
+@router.get(
+    "/organisations/{organisation_id}/evidence/integrity",
+    response_model=EvidenceIntegrityOut,
+)
+def get_evidence_integrity(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> EvidenceIntegrityOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    stored_count, verified_count, oldest_verified_at = db.execute(
+        select(
+            func.count(),
+            func.count().filter(
+                EvidenceItem.integrity_status.in_(INTEGRITY_VERDICTS)
+            ),
+            func.min(EvidenceItem.last_verified_at),
+        ).where(
+            EvidenceItem.organisation_id == organisation_id,
+            EvidenceItem.object_key.is_not(None),
+        )
+    ).one()
+    failures = (
+        db.execute(
+            select(EvidenceItem)
+            .where(
+                EvidenceItem.organisation_id == organisation_id,
+                EvidenceItem.integrity_status != INTEGRITY_OK,
+            )
+            .order_by(EvidenceItem.last_verified_at.desc(), EvidenceItem.id)
+            .limit(100)
+        )
+        .scalars()
+        .all()
+    )
+    return EvidenceIntegrityOut(
+        stored_count=stored_count,
+        verified_count=verified_count,
+        unverified_count=stored_count - verified_count,
+        oldest_verified_at=oldest_verified_at,
+        failures=[EvidenceIntegrityItemOut.model_validate(item) for item in failures],
+    )
+
+
 def _should_emit_download_audit() -> bool:
     value = os.getenv("EVIDENCE_DOWNLOAD_AUDIT", "0").lower()
     return value in {"1", "true", "yes", "on"}
+
+
+def _accepts_encoding(request: Request, content_encoding: str) -> bool:
+    for entry in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = entry.partition(";")
+        if coding.strip().lower() != content_encoding:
+            continue
+        quality = params.strip().lower().removeprefix("q=")
+        try:
+            return not params.strip() or float(quality) > 0
+        except ValueError:
+            return False
+    return False
@@ -3,23 +3,53 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import distinct_on
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.core.auth import get_actor
 from app.core.authorization import ORG_MANAGE_INCIDENTS, ORG_READ, require_permission
+from app.core.etag import apply_etag
+from app.core.responses import (
+    ndjson_stream_response,
+    orjson_list_response,
+    wants_ndjson,
+)
 from app.core.tenant import assert_path_matches_tenant, require_tenant_context
 from app.db.models import Incident, IncidentVersion, Organisation, UserAccount
 from app.db.session import get_db
+from app.db.statements import INCIDENT_FOR_ORG
 from app.schemas.incident import (
+    INCIDENT_ROWS_ADAPTER,
     IncidentCreate,
     IncidentOut,
     IncidentVersionCreate,
     IncidentVersionOut,
 )
+from app.schemas.version_diff import VersionChangelogOut, VersionDiffOut
 from app.services.audit import emit_audit_event
+from app.services.change_tracking import (
+    get_organisation_change_seq,
+    record_organisation_change,
+)
+from app.services.entity_cache import (
+    get_cached_entity,
+    invalidate_cached_entity,
+    store_cached_entity,
+)
+from app.services.org_metrics import apply_incident_metrics_change
+from app.services.organisation_summary import invalidate_organisation_summary
+from app.services.version_diff import get_version_changelog, get_version_diff
 
 router = APIRouter(tags=["incidents"])
 
@@ -29,10 +59,8 @@ def _require_incident_for_org(
 ) -> Incident:
     incident = (
         db.execute(
-            select(Incident).where(
-                Incident.id == incident_id,
-                Incident.organisation_id == organisation_id,
-            )
+            INCIDENT_FOR_ORG,
+            {"incident_id": incident_id, "organisation_id": organisation_id},
         )
         .scalars()
         .first()
@@ -70,6 +98,33 @@ def _incident_out_from_latest(
     )
 
 
+def _incident_row_columns(version, latest_version, updated_at) -> tuple:
+    # Labels match IncidentOut so result rows map straight onto IncidentRow
+    # dicts; as_of reads take the version number and timestamp from the
+    # version row instead of the incident.
+    return (
+        Incident.id.label("incident_id"),
+        Incident.organisation_id,
+        latest_version.label("latest_version"),
+        version.title,
+        version.description,
+        version.severity,
+        version.status,
+        version.category,
+        version.owner_user_id,
+        Incident.created_at,
+        updated_at.label("updated_at"),
+    )
+
+
+def _incident_out_as_of(
+    incident: Incident, version: IncidentVersion
+) -> IncidentOut:
+    return _incident_out_from_latest(incident, version).model_copy(
+        update={"latest_version": version.version, "updated_at": version.created_at}
+    )
+
+
 @router.post(
     "/organisations/{organisation_id}/incidents",
     response_model=IncidentOut,
@@ -109,6 +164,7 @@ def create_incident(
         created_by_user_id=actor_user.id,
     )
     db.add(incident_version)
+    apply_incident_metrics_change(db, organisation_id, None, incident_version)
 
     emit_audit_event(
         db,
@@ -134,6 +190,7 @@ def create_incident(
         entity_id=incident_version.id,
         metadata={"incident_id": str(incident.id), "version": 1},
     )
+    record_organisation_change(db, organisation_id, "incident", incident.id)
 
     try:
         db.commit()
@@ -141,6 +198,7 @@ def create_incident(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
     db.refresh(incident)
     db.refresh(incident_version)
     return _incident_out_from_latest(incident, incident_version)
@@ -152,23 +210,68 @@ def create_incident(
 )
 def list_incidents(
     organisation_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> list[IncidentOut]:
+) -> list[IncidentOut] | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
-    rows = db.execute(
-        select(Incident, IncidentVersion)
-        .join(
-            IncidentVersion,
-            (IncidentVersion.incident_id == Incident.id)
-            & (IncidentVersion.version == Incident.latest_version),
+    not_modified = apply_etag(
+        request, response, get_organisation_change_seq(db, organisation_id)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if as_of is not None:
+        versions_as_of_subq = (
+            select(IncidentVersion)
+            .ext(distinct_on(IncidentVersion.incident_id))
+            .where(
+                IncidentVersion.organisation_id == organisation_id,
+                IncidentVersion.created_at <= as_of,
+            )
+            .order_by(
+                IncidentVersion.incident_id,
+                IncidentVersion.version.desc(),
+            )
+            .subquery()
+        )
+        version_as_of = aliased(IncidentVersion, versions_as_of_subq)
+        statement = (
+            select(
+                *_incident_row_columns(
+                    version_as_of,
+                    version_as_of.version,
+                    version_as_of.created_at,
+                )
+            )
+            .join(version_as_of, version_as_of.incident_id == Incident.id)
+            .where(Incident.organisation_id == organisation_id)
+        )
+    else:
+        statement = (
+            select(
+                *_incident_row_columns(
+                    IncidentVersion, Incident.latest_version, Incident.updated_at
+                )
+            )
+            .join(
+                IncidentVersion,
+                (IncidentVersion.incident_id == Incident.id)
+                & (IncidentVersion.version == Incident.latest_version),
+            )
+            .where(Incident.organisation_id == organisation_id)
         )
-        .where(Incident.organisation_id == organisation_id)
-    ).all()
 
-    return [_incident_out_from_latest(incident, version) for incident, version in rows]
+    if wants_ndjson(request):
+        return ndjson_stream_response(INCIDENT_ROWS_ADAPTER, statement, response)
+    rows = db.execute(statement).mappings()
+    return orjson_list_response(
+        INCIDENT_ROWS_ADAPTER, [dict(row) for row in rows], response
+    )
 
 
 @router.get(
@@ -178,28 +281,53 @@ def list_incidents(
 def get_incident(
     organisation_id: UUID,
     incident_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> IncidentOut:
+) -> IncidentOut | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
+    seq = get_organisation_change_seq(db, organisation_id)
+    not_modified = apply_etag(request, response, seq)
+    if not_modified is not None:
+        return not_modified
+
+    if as_of is None:
+        cached = get_cached_entity(
+            "incident", organisation_id, incident_id, seq, IncidentOut
+        )
+        if cached is not None:
+            return cached
+
     incident = _require_incident_for_org(db, organisation_id, incident_id)
 
-    version = (
-        db.execute(
-            select(IncidentVersion).where(
+    if as_of is not None:
+        version_query = (
+            select(IncidentVersion)
+            .where(
                 IncidentVersion.incident_id == incident.id,
-                IncidentVersion.version == incident.latest_version,
+                IncidentVersion.created_at <= as_of,
             )
+            .order_by(IncidentVersion.version.desc())
+            .limit(1)
         )
-        .scalars()
-        .first()
-    )
+    else:
+        version_query = select(IncidentVersion).where(
+            IncidentVersion.incident_id == incident.id,
+            IncidentVersion.version == incident.latest_version,
+        )
+    version = db.execute(version_query).scalars().first()
     if not version:
         raise HTTPException(status_code=404, detail="Incident version not found")
 
-    return _incident_out_from_latest(incident, version)
+    if as_of is not None:
+        return _incident_out_as_of(incident, version)
+    incident_out = _incident_out_from_latest(incident, version)
+    store_cached_entity("incident", organisation_id, incident_id, seq, incident_out)
+    return incident_out
 
 
 @router.post(
@@ -235,6 +363,16 @@ def create_incident_version(
     if payload.owner_user_id is not None:
         _require_owner_user(db, organisation_id, payload.owner_user_id)
 
+    previous_version = (
+        db.execute(
+            select(IncidentVersion).where(
+                IncidentVersion.incident_id == incident.id,
+                IncidentVersion.version == incident.latest_version,
+            )
+        )
+        .scalars()
+        .first()
+    )
     next_version = (incident.latest_version or 0) + 1
 
     incident_version = IncidentVersion(
@@ -250,6 +388,9 @@ def create_incident_version(
         created_by_user_id=actor_user.id,
     )
     db.add(incident_version)
+    apply_incident_metrics_change(
+        db, organisation_id, previous_version, incident_version
+    )
 
     incident.latest_version = next_version
     incident.updated_at = datetime.now(timezone.utc)
@@ -264,6 +405,7 @@ def create_incident_version(
         entity_id=incident_version.id,
         metadata={"incident_id": str(incident.id), "version": next_version},
     )
+    record_organisation_change(db, organisation_id, "incident", incident_id)
 
     try:
         db.commit()
@@ -271,6 +413,8 @@ def create_incident_version(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
+    invalidate_cached_entity("incident", organisation_id, incident_id)
     db.refresh(incident)
     db.refresh(incident_version)
     return _incident_out_from_latest(incident, incident_version)
@@ -305,3 +449,82 @@ def list_incident_versions(
     )
 
     return list(versions)
+
+
+@router.get(
+    "/organisations/{organisation_id}/incidents/{incident_id}/versions/{version}",
+    response_model=IncidentVersionOut,
+)
+def get_incident_version(
+    organisation_id: UUID,
+    incident_id: UUID,
+    version: int = Path(ge=1),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> IncidentVersionOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_incident_for_org(db, organisation_id, incident_id)
+
+    incident_version = (
+        db.execute(
+            select(IncidentVersion).where(
+                IncidentVersion.organisation_id == organisation_id,
+                IncidentVersion.incident_id == incident_id,
+                IncidentVersion.version == version,
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if not incident_version:
+        raise HTTPException(status_code=404, detail="Incident version not found")
+    return incident_version
+
+
+@router.get(
+    "/organisations/{organisation_id}/incidents/{incident_id}"
+    "/versions/{from_version}/diff/{to_version}",
+    response_model=VersionDiffOut,
+)
+def get_incident_version_diff(
+    organisation_id: UUID,
+    incident_id: UUID,
+    from_version: int = Path(ge=1),
+    to_version: int = Path(ge=1),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionDiffOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_incident_for_org(db, organisation_id, incident_id)
+
+    diff = get_version_diff(db, "incident", incident_id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Incident version not found")
+    return diff
+
+
+@router.get(
+    "/organisations/{organisation_id}/incidents/{incident_id}/changelog",
+    response_model=VersionChangelogOut,
+)
+def get_incident_changelog(
+    organisation_id: UUID,
+    incident_id: UUID,
+    before: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionChangelogOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_incident_for_org(db, organisation_id, incident_id)
+
+    entries, next_before = get_version_changelog(
+        db, "incident", incident_id, before, limit
+    )
+    return VersionChangelogOut(entries=entries, next_before=next_before)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.authorization import ORG_READ, require_permission
+from app.core.tenant import assert_path_matches_tenant, require_tenant_context
+from app.db.models import Job, UserAccount
+from app.db.session import get_db
+from app.schemas.job import JobOut
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/organisations/{organisation_id}/jobs/{job_id}", response_model=JobOut)
+def get_job(
+    organisation_id: UUID,
+    job_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> JobOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    job = db.get(Job, job_id)
+    if not job or job.organisation_id != organisation_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobOut.model_validate(job)
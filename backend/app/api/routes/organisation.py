@@ -10,8 +10,15 @@ from app.core.tenant import assert_path_matches_tenant, require_tenant_context
 from app.db.models import UserAccount
 from app.db.models.organisation import Organisation
 from app.db.session import get_db
-from app.schemas.organisation import OrganisationCreate, OrganisationOut
+from app.schemas.organisation import (
+    OrganisationCreate,
+    OrganisationMetricsOut,
+    OrganisationOut,
+    OrganisationSummaryOut,
+)
 from app.services.audit import emit_audit_event
+from app.services.org_metrics import get_organisation_metrics
+from app.services.organisation_summary import get_organisation_summary
 
 router = APIRouter(tags=["organisations"])
 
@@ -32,6 +39,36 @@ def get_organisation(
     return organisation
 
 
+@router.get(
+    "/organisations/{organisation_id}/summary",
+    response_model=OrganisationSummaryOut,
+)
+def get_organisation_summary_counts(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> OrganisationSummaryOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    return get_organisation_summary(db, organisation_id)
+
+
+@router.get(
+    "/organisations/{organisation_id}/metrics",
+    response_model=OrganisationMetricsOut,
+)
+def get_organisation_metrics_rollup(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> OrganisationMetricsOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    return get_organisation_metrics(db, organisation_id)
+
+
 @router.post("/organisations", response_model=OrganisationOut)
 def create_organisation(
     payload: OrganisationCreate,
@@ -1,35 +1,87 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import distinct_on
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.core.auth import get_actor
 from app.core.authorization import ORG_MANAGE_RISKS, ORG_READ, require_permission
+from app.core.etag import apply_etag
+from app.core.responses import (
+    ndjson_stream_response,
+    orjson_list_response,
+    wants_ndjson,
+)
 from app.core.tenant import assert_path_matches_tenant, require_tenant_context
 from app.db.models import (
     Control,
+    ControlEvidenceLink,
     ControlVersion,
+    EvidenceItem,
     Organisation,
     Risk,
     RiskControlLink,
+    RiskHeatmapCell,
     RiskVersion,
     UserAccount,
 )
 from app.db.session import get_db
+from app.db.statements import (
+    CONTROL_FOR_ORG,
+    LATEST_RISK_VERSION,
+    RISK_FOR_ORG,
+)
 from app.schemas.control import ControlOut
+from app.schemas.evidence import EvidenceOut
 from app.schemas.risk import (
+    RISK_ROWS_ADAPTER,
     RiskControlLinkCreate,
     RiskControlLinkOut,
+    RiskControlMatrixOut,
+    RiskCoverageControlOut,
+    RiskCoverageOut,
     RiskCreate,
+    RiskHeatmapCellOut,
+    RiskHeatmapOut,
     RiskOut,
     RiskVersionCreate,
     RiskVersionOut,
 )
+from app.schemas.version_diff import VersionChangelogOut, VersionDiffOut
 from app.services.audit import emit_audit_event
+from app.services.change_tracking import (
+    get_organisation_change_seq,
+    record_organisation_change,
+)
+from app.services.entity_cache import (
+    get_cached_entity,
+    invalidate_cached_entity,
+    store_cached_entity,
+)
+from app.services.org_metrics import apply_risk_metrics_change
+from app.services.organisation_summary import invalidate_organisation_summary
+from app.services.risk_control_matrix import (
+    iter_risk_control_matrix_csv,
+    iter_risk_control_matrix_xlsx,
+    load_risk_control_matrix,
+)
+from app.services.risk_heatmap import apply_risk_heatmap_change
+from app.services.version_diff import get_version_changelog, get_version_diff
 
 router = APIRouter(tags=["risks"])
 
@@ -39,10 +91,8 @@ def _require_risk_for_org(
 ) -> Risk:
     risk = (
         db.execute(
-            select(Risk).where(
-                Risk.id == risk_id,
-                Risk.organisation_id == organisation_id,
-            )
+            RISK_FOR_ORG,
+            {"risk_id": risk_id, "organisation_id": organisation_id},
         )
         .scalars()
         .first()
@@ -67,10 +117,8 @@ def _require_control_for_org(
 ) -> Control:
     control = (
         db.execute(
-            select(Control).where(
-                Control.id == control_id,
-                Control.organisation_id == organisation_id,
-            )
+            CONTROL_FOR_ORG,
+            {"control_id": control_id, "organisation_id": organisation_id},
         )
         .scalars()
         .first()
@@ -98,6 +146,25 @@ def _risk_out_from_latest(risk: Risk, version: RiskVersion) -> RiskOut:
     )
 
 
+def _risk_row_columns(version) -> tuple:
+    # Labels match RiskOut so result rows map straight onto RiskRow dicts.
+    return (
+        Risk.id.label("risk_id"),
+        Risk.organisation_id,
+        version.version.label("latest_version"),
+        version.title,
+        version.description,
+        version.category,
+        version.likelihood,
+        version.impact,
+        (version.likelihood * version.impact).label("score"),
+        version.status,
+        version.owner_user_id,
+        Risk.created_at,
+        version.created_at.label("updated_at"),
+    )
+
+
 def _control_out_from_latest(
     control: Control, version: ControlVersion
 ) -> ControlOut:
@@ -155,6 +222,8 @@ def create_risk(
         created_by_user_id=actor_user.id,
     )
     db.add(risk_version)
+    apply_risk_heatmap_change(db, organisation_id, None, risk_version)
+    apply_risk_metrics_change(db, organisation_id, None, risk_version)
 
     emit_audit_event(
         db,
@@ -176,6 +245,7 @@ def create_risk(
         entity_id=risk_version.id,
         metadata={"risk_id": str(risk.id), "version": 1},
     )
+    record_organisation_change(db, organisation_id, "risk", risk.id)
 
     try:
         db.commit()
@@ -183,6 +253,7 @@ def create_risk(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
     db.refresh(risk)
     db.refresh(risk_version)
     return _risk_out_from_latest(risk, risk_version)
@@ -193,37 +264,175 @@ def create_risk(
 )
 def list_risks(
     organisation_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> list[RiskOut]:
+) -> list[RiskOut] | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
-    latest_versions_subq = (
-        select(
-            RiskVersion.risk_id,
-            func.max(RiskVersion.version).label("max_version"),
-        )
-        .where(RiskVersion.organisation_id == organisation_id)
-        .group_by(RiskVersion.risk_id)
-        .subquery()
+    not_modified = apply_etag(
+        request, response, get_organisation_change_seq(db, organisation_id)
     )
+    if not_modified is not None:
+        return not_modified
 
-    rows = db.execute(
-        select(Risk, RiskVersion)
-        .join(
-            latest_versions_subq,
-            latest_versions_subq.c.risk_id == Risk.id,
+    if as_of is not None:
+        versions_as_of_subq = (
+            select(RiskVersion)
+            .ext(distinct_on(RiskVersion.risk_id))
+            .where(
+                RiskVersion.organisation_id == organisation_id,
+                RiskVersion.created_at <= as_of,
+            )
+            .order_by(
+                RiskVersion.risk_id,
+                RiskVersion.version.desc(),
+            )
+            .subquery()
         )
-        .join(
-            RiskVersion,
-            (RiskVersion.risk_id == latest_versions_subq.c.risk_id)
-            & (RiskVersion.version == latest_versions_subq.c.max_version),
+        version_as_of = aliased(RiskVersion, versions_as_of_subq)
+        statement = (
+            select(*_risk_row_columns(version_as_of))
+            .join(version_as_of, version_as_of.risk_id == Risk.id)
+            .where(Risk.organisation_id == organisation_id)
+        )
+    else:
+        latest_versions_subq = (
+            select(
+                RiskVersion.risk_id,
+                func.max(RiskVersion.version).label("max_version"),
+            )
+            .where(RiskVersion.organisation_id == organisation_id)
+            .group_by(RiskVersion.risk_id)
+            .subquery()
+        )
+        statement = (
+            select(*_risk_row_columns(RiskVersion))
+            .join(
+                latest_versions_subq,
+                latest_versions_subq.c.risk_id == Risk.id,
+            )
+            .join(
+                RiskVersion,
+                (RiskVersion.risk_id == latest_versions_subq.c.risk_id)
+                & (RiskVersion.version == latest_versions_subq.c.max_version),
+            )
+            .where(Risk.organisation_id == organisation_id)
         )
-        .where(Risk.organisation_id == organisation_id)
+
+    if wants_ndjson(request):
+        return ndjson_stream_response(RISK_ROWS_ADAPTER, statement, response)
+    rows = db.execute(statement).mappings()
+    return orjson_list_response(
+        RISK_ROWS_ADAPTER, [dict(row) for row in rows], response
+    )
+
+
+@router.get(
+    "/organisations/{organisation_id}/risks/heatmap",
+    response_model=RiskHeatmapOut,
+)
+def get_risk_heatmap(
+    organisation_id: UUID,
+    split_by: list[Literal["status", "category"]] | None = Query(default=None),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> RiskHeatmapOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    split_columns = [
+        getattr(RiskHeatmapCell, dimension)
+        for dimension in ("status", "category")
+        if split_by and dimension in split_by
+    ]
+    group_columns = [
+        RiskHeatmapCell.likelihood,
+        RiskHeatmapCell.impact,
+        *split_columns,
+    ]
+    risk_count = func.sum(RiskHeatmapCell.risk_count)
+
+    rows = db.execute(
+        select(*group_columns, risk_count.label("count"))
+        .where(RiskHeatmapCell.organisation_id == organisation_id)
+        .group_by(*group_columns)
+        .having(risk_count > 0)
+        .order_by(*group_columns)
     ).all()
 
-    return [_risk_out_from_latest(risk, version) for risk, version in rows]
+    cells = [RiskHeatmapCellOut(**row._mapping) for row in rows]
+    return RiskHeatmapOut(
+        cells=cells,
+        total=sum(cell.count for cell in cells),
+    )
+
+
+@router.get(
+    "/organisations/{organisation_id}/risk-control-matrix",
+    response_model=RiskControlMatrixOut,
+)
+def get_risk_control_matrix(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> RiskControlMatrixOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    return load_risk_control_matrix(db, organisation_id)
+
+
+@router.get("/organisations/{organisation_id}/risk-control-matrix/export")
+def export_risk_control_matrix(
+    organisation_id: UUID,
+    format: Literal["csv", "xlsx"] = Query(default="csv"),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> StreamingResponse:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    matrix = load_risk_control_matrix(db, organisation_id)
+    if format == "xlsx":
+        try:
+            content = iter_risk_control_matrix_xlsx(matrix)
+        except ImportError as exc:
+            raise HTTPException(
+                status_code=501, detail="XLSX export is not available"
+            ) from exc
+        media_type = (
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    else:
+        content = iter_risk_control_matrix_csv(matrix)
+        media_type = "text/csv; charset=utf-8"
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="risk_control_matrix.exported",
+        entity_type="organisation",
+        entity_id=organisation_id,
+        metadata={"format": format, "link_count": len(matrix.risk_index)},
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+    headers = {
+        "Content-Disposition": (
+            f'attachment; filename="risk-control-matrix.{format}"'
+        )
+    }
+    return StreamingResponse(content, media_type=media_type, headers=headers)
 
 
 @router.get(
@@ -233,28 +442,40 @@ def list_risks(
 def get_risk(
     organisation_id: UUID,
     risk_id: UUID,
+    request: Request,
+    response: Response,
+    as_of: datetime | None = Query(default=None),
     tenant_org_id: UUID = Depends(require_tenant_context),
     db: Session = Depends(get_db),
     actor_user: UserAccount = Depends(require_permission(ORG_READ)),
-) -> RiskOut:
+) -> RiskOut | Response:
     assert_path_matches_tenant(organisation_id, tenant_org_id)
 
+    seq = get_organisation_change_seq(db, organisation_id)
+    not_modified = apply_etag(request, response, seq)
+    if not_modified is not None:
+        return not_modified
+
+    if as_of is None:
+        cached = get_cached_entity("risk", organisation_id, risk_id, seq, RiskOut)
+        if cached is not None:
+            return cached
+
     risk = _require_risk_for_org(db, organisation_id, risk_id)
 
+    version_query = LATEST_RISK_VERSION
+    if as_of is not None:
+        version_query = version_query.where(RiskVersion.created_at <= as_of)
     version = (
-        db.execute(
-            select(RiskVersion)
-            .where(RiskVersion.risk_id == risk.id)
-            .order_by(RiskVersion.version.desc())
-            .limit(1)
-        )
-        .scalars()
-        .first()
+        db.execute(version_query, {"risk_id": risk.id}).scalars().first()
     )
     if not version:
         raise HTTPException(status_code=404, detail="Risk version not found")
 
-    return _risk_out_from_latest(risk, version)
+    risk_out = _risk_out_from_latest(risk, version)
+    if as_of is None:
+        store_cached_entity("risk", organisation_id, risk_id, seq, risk_out)
+    return risk_out
 
 
 @router.post(
@@ -276,15 +497,10 @@ def create_risk_version(
     if payload.owner_user_id is not None:
         _require_owner_user(db, organisation_id, payload.owner_user_id)
 
-    next_version = (
-        db.execute(
-            select(func.max(RiskVersion.version)).where(
-                RiskVersion.risk_id == risk.id
-            )
-        )
-        .scalar_one_or_none()
-        or 0
-    ) + 1
+    previous_version = (
+        db.execute(LATEST_RISK_VERSION, {"risk_id": risk.id}).scalars().first()
+    )
+    next_version = (previous_version.version if previous_version else 0) + 1
 
     risk_version = RiskVersion(
         organisation_id=organisation_id,
@@ -300,6 +516,12 @@ def create_risk_version(
         created_by_user_id=actor_user.id,
     )
     db.add(risk_version)
+    apply_risk_heatmap_change(
+        db, organisation_id, previous_version, risk_version
+    )
+    apply_risk_metrics_change(
+        db, organisation_id, previous_version, risk_version
+    )
 
     emit_audit_event(
         db,
@@ -311,6 +533,7 @@ def create_risk_version(
         entity_id=risk_version.id,
         metadata={"risk_id": str(risk.id), "version": next_version},
     )
+    record_organisation_change(db, organisation_id, "risk", risk_id)
 
     try:
         db.commit()
@@ -318,6 +541,8 @@ def create_risk_version(
         db.rollback()
         raise HTTPException(status_code=409, detail="Write failed")
 
+    invalidate_organisation_summary(organisation_id)
+    invalidate_cached_entity("risk", organisation_id, risk_id)
     db.refresh(risk)
     db.refresh(risk_version)
     return _risk_out_from_latest(risk, risk_version)
@@ -354,6 +579,53 @@ def list_risk_versions(
     return list(versions)
 
 
+@router.get(
+    "/organisations/{organisation_id}/risks/{risk_id}"
+    "/versions/{from_version}/diff/{to_version}",
+    response_model=VersionDiffOut,
+)
+def get_risk_version_diff(
+    organisation_id: UUID,
+    risk_id: UUID,
+    from_version: int = Path(ge=1),
+    to_version: int = Path(ge=1),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionDiffOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_risk_for_org(db, organisation_id, risk_id)
+
+    diff = get_version_diff(db, "risk", risk_id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Risk version not found")
+    return diff
+
+
+@router.get(
+    "/organisations/{organisation_id}/risks/{risk_id}/changelog",
+    response_model=VersionChangelogOut,
+)
+def get_risk_changelog(
+    organisation_id: UUID,
+    risk_id: UUID,
+    before: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> VersionChangelogOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    _require_risk_for_org(db, organisation_id, risk_id)
+
+    entries, next_before = get_version_changelog(
+        db, "risk", risk_id, before, limit
+    )
+    return VersionChangelogOut(entries=entries, next_before=next_before)
+
+
 @router.get(
     "/organisations/{organisation_id}/risks/{risk_id}/controls",
     response_model=list[ControlOut],
@@ -403,6 +675,124 @@ def list_risk_controls(
     return [_control_out_from_latest(control, version) for control, version in rows]
 
 
+@router.get(
+    "/organisations/{organisation_id}/risks/{risk_id}/coverage",
+    response_model=RiskCoverageOut,
+)
+def get_risk_coverage(
+    organisation_id: UUID,
+    risk_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> RiskCoverageOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    risk_row = db.execute(
+        select(Risk, RiskVersion)
+        .join(RiskVersion, RiskVersion.risk_id == Risk.id)
+        .where(
+            Risk.id == risk_id,
+            Risk.organisation_id == organisation_id,
+        )
+        .order_by(RiskVersion.version.desc())
+        .limit(1)
+    ).first()
+    if not risk_row:
+        raise HTTPException(status_code=404, detail="Risk not found")
+    risk, risk_version = risk_row
+
+    latest_versions_subq = (
+        select(
+            ControlVersion.control_id,
+            func.max(ControlVersion.version).label("max_version"),
+        )
+        .where(ControlVersion.organisation_id == organisation_id)
+        .group_by(ControlVersion.control_id)
+        .subquery()
+    )
+    control_rows = db.execute(
+        select(Control, ControlVersion)
+        .join(
+            RiskControlLink,
+            RiskControlLink.control_id == Control.id,
+        )
+        .join(
+            latest_versions_subq,
+            latest_versions_subq.c.control_id == Control.id,
+        )
+        .join(
+            ControlVersion,
+            (ControlVersion.control_id == latest_versions_subq.c.control_id)
+            & (ControlVersion.version == latest_versions_subq.c.max_version),
+        )
+        .where(
+            RiskControlLink.organisation_id == organisation_id,
+            RiskControlLink.risk_id == risk_id,
+        )
+        .order_by(RiskControlLink.created_at, Control.id)
+    ).all()
+
+    evidence_by_control: dict[UUID, list[EvidenceItem]] = {
+        control.id: [] for control, _ in control_rows
+    }
+    if evidence_by_control:
+        evidence_rows = db.execute(
+            select(ControlEvidenceLink.control_id, EvidenceItem)
+            .join(
+                ControlEvidenceLink,
+                ControlEvidenceLink.evidence_item_id == EvidenceItem.id,
+            )
+            .where(
+                ControlEvidenceLink.organisation_id == organisation_id,
+                ControlEvidenceLink.control_id.in_(list(evidence_by_control)),
+            )
+            .order_by(
+                ControlEvidenceLink.created_at.desc(),
+                EvidenceItem.created_at.desc(),
+            )
+        ).all()
+        for control_id, evidence_item in evidence_rows:
+            evidence_by_control[control_id].append(evidence_item)
+
+    controls = [
+        RiskCoverageControlOut(
+            **_control_out_from_latest(control, version).model_dump(),
+            evidence=[
+                EvidenceOut.model_validate(evidence_item)
+                for evidence_item in evidence_by_control[control.id]
+            ],
+        )
+        for control, version in control_rows
+    ]
+    evidence_count = sum(len(control.evidence) for control in controls)
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="risk.coverage.viewed",
+        entity_type="risk",
+        entity_id=risk.id,
+        metadata={
+            "risk_id": str(risk.id),
+            "control_count": len(controls),
+            "evidence_count": evidence_count,
+        },
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+    return RiskCoverageOut(
+        **_risk_out_from_latest(risk, risk_version).model_dump(),
+        controls=controls,
+    )
+
+
 @router.post(
     "/organisations/{organisation_id}/risks/{risk_id}/controls",
     response_model=RiskControlLinkOut,
@@ -442,6 +832,7 @@ def link_risk_control(
             "control_id": str(control.id),
         },
     )
+    record_organisation_change(db, organisation_id, "risk", risk.id)
 
     try:
         db.commit()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import html
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import (
+    TSVECTOR,
+    ts_headline,
+    websearch_to_tsquery,
+)
+from sqlalchemy.orm import Session, aliased
+
+from app.core.authorization import ORG_READ, require_permission
+from app.core.tenant import assert_path_matches_tenant, require_tenant_context
+from app.db.models import (
+    ControlVersion,
+    EvidenceItem,
+    Incident,
+    IncidentVersion,
+    RiskVersion,
+    UserAccount,
+)
+from app.db.session import get_db
+from app.schemas.search import SearchEntityType, SearchResultOut, SearchResultsOut
+
+router = APIRouter(tags=["search"])
+
+_SEARCH_CONFIG = "english"
+# Control characters never appear in stored text, so they can mark
+# highlights safely before the snippet is HTML-escaped.
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_STOP = "\x03"
+_HEADLINE_OPTIONS = (
+    f'StartSel="{_HIGHLIGHT_START}", StopSel="{_HIGHLIGHT_STOP}", '
+    "MaxFragments=2, MaxWords=24, MinWords=8, FragmentDelimiter=\" … \""
+)
+_ALL_ENTITY_TYPES: tuple[SearchEntityType, ...] = (
+    "risk",
+    "control",
+    "incident",
+    "evidence",
+)
+
+
+def _render_snippet(raw_snippet: str | None) -> str:
+    escaped = html.escape(raw_snippet or "")
+    return escaped.replace(_HIGHLIGHT_START, "<mark>").replace(
+        _HIGHLIGHT_STOP, "</mark>"
+    )
+
+
+def _risk_hits(organisation_id: UUID, ts_query):
+    newer = aliased(RiskVersion)
+    latest_version = (
+        select(func.max(newer.version))
+        .where(newer.risk_id == RiskVersion.risk_id)
+        .scalar_subquery()
+    )
+    return select(
+        literal("risk").label("entity_type"),
+        RiskVersion.risk_id.label("entity_id"),
+        RiskVersion.title.label("title"),
+        func.concat_ws(" ", RiskVersion.title, RiskVersion.description).label(
+            "body"
+        ),
+        func.ts_rank(RiskVersion.search_vector, ts_query).label("rank"),
+        RiskVersion.created_at.label("updated_at"),
+    ).where(
+        RiskVersion.organisation_id == organisation_id,
+        RiskVersion.search_vector.bool_op("@@")(ts_query),
+        RiskVersion.version == latest_version,
+    )
+
+
+def _control_hits(organisation_id: UUID, ts_query):
+    newer = aliased(ControlVersion)
+    latest_version = (
+        select(func.max(newer.version))
+        .where(newer.control_id == ControlVersion.control_id)
+        .scalar_subquery()
+    )
+    return select(
+        literal("control").label("entity_type"),
+        ControlVersion.control_id.label("entity_id"),
+        func.concat_ws(" ", ControlVersion.control_code, ControlVersion.title).label(
+            "title"
+        ),
+        func.concat_ws(
+            " ", ControlVersion.title, ControlVersion.description
+        ).label("body"),
+        func.ts_rank(ControlVersion.search_vector, ts_query).label("rank"),
+        ControlVersion.created_at.label("updated_at"),
+    ).where(
+        ControlVersion.organisation_id == organisation_id,
+        ControlVersion.search_vector.bool_op("@@")(ts_query),
+        ControlVersion.version == latest_version,
+    )
+
+
+def _incident_hits(organisation_id: UUID, ts_query):
+    return (
+        select(
+            literal("incident").label("entity_type"),
+            IncidentVersion.incident_id.label("entity_id"),
+            IncidentVersion.title.label("title"),
+            func.concat_ws(
+                " ", IncidentVersion.title, IncidentVersion.description
+            ).label("body"),
+            func.ts_rank(IncidentVersion.search_vector, ts_query).label("rank"),
+            Incident.updated_at.label("updated_at"),
+        )
+        .join(
+            Incident,
+            (Incident.id == IncidentVersion.incident_id)
+            & (Incident.latest_version == IncidentVersion.version),
+        )
+        .where(
+            IncidentVersion.organisation_id == organisation_id,
+            IncidentVersion.search_vector.bool_op("@@")(ts_query),
+        )
+    )
+
+
+def _evidence_hits(organisation_id: UUID, ts_query):
+    # Extracted file text sits in its own column (weight D) so metadata
+    # matches still outrank matches deep inside a document.
+    document_vector = EvidenceItem.search_vector.op("||")(
+        func.coalesce(EvidenceItem.content_vector, cast("", TSVECTOR))
+    )
+    return select(
+        literal("evidence").label("entity_type"),
+        EvidenceItem.id.label("entity_id"),
+        EvidenceItem.title.label("title"),
+        func.concat_ws(" ", EvidenceItem.title, EvidenceItem.description).label(
+            "body"
+        ),
+        func.ts_rank(document_vector, ts_query).label("rank"),
+        EvidenceItem.created_at.label("updated_at"),
+    ).where(
+        EvidenceItem.organisation_id == organisation_id,
+        or_(
+            EvidenceItem.search_vector.bool_op("@@")(ts_query),
+            EvidenceItem.content_vector.bool_op("@@")(ts_query),
+        ),
+    )
+
+
+_HIT_BUILDERS = {
+    "risk": _risk_hits,
+    "control": _control_hits,
+    "incident": _incident_hits,
+    "evidence": _evidence_hits,
+}
+
+
+@router.get(
+    "/organisations/{organisation_id}/search",
+    response_model=SearchResultsOut,
+)
+def search_organisation(
+    organisation_id: UUID,
+    q: str = Query(..., min_length=1, max_length=256),
+    types: list[SearchEntityType] | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10_000),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_READ)),
+) -> SearchResultsOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    entity_types = [
+        entity_type
+        for entity_type in _ALL_ENTITY_TYPES
+        if not types or entity_type in types
+    ]
+    ts_query = websearch_to_tsquery(_SEARCH_CONFIG, q)
+    hits = union_all(
+        *[
+            _HIT_BUILDERS[entity_type](organisation_id, ts_query)
+            for entity_type in entity_types
+        ]
+    ).subquery("hits")
+
+    # Rank and paginate first so ts_headline only runs for the returned page.
+    page = (
+        select(hits)
+        .order_by(
+            hits.c.rank.desc(),
+            hits.c.updated_at.desc(),
+            hits.c.entity_id,
+        )
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery("page")
+    )
+    rows = db.execute(
+        select(
+            page.c.entity_type,
+            page.c.entity_id,
+            page.c.title,
+            ts_headline(
+                _SEARCH_CONFIG,
+                page.c.body,
+                websearch_to_tsquery(_SEARCH_CONFIG, q),
+                _HEADLINE_OPTIONS,
+            ).label("snippet"),
+            page.c.rank,
+            page.c.updated_at,
+        ).order_by(
+            page.c.rank.desc(),
+            page.c.updated_at.desc(),
+            page.c.entity_id,
+        )
+    ).all()
+
+    results = [
+        SearchResultOut(
+            entity_type=row.entity_type,
+            entity_id=row.entity_id,
+            title=row.title,
+            snippet=_render_snippet(row.snippet),
+            rank=row.rank,
+            updated_at=row.updated_at,
+        )
+        for row in rows[:limit]
+    ]
+    return SearchResultsOut(
+        query=q,
+        results=results,
+        limit=limit,
+        offset=offset,
+        has_more=len(rows) > limit,
+    )
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import secrets
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_actor
+from app.core.authorization import ORG_MANAGE_WEBHOOKS, require_permission
+from app.core.tenant import assert_path_matches_tenant, require_tenant_context
+from app.db.models import Organisation, UserAccount, WebhookDelivery, WebhookEndpoint
+from app.db.session import get_db
+from app.schemas.webhook import (
+    WebhookDeliveryOut,
+    WebhookEndpointCreate,
+    WebhookEndpointCreatedOut,
+    WebhookEndpointOut,
+    WebhookEndpointUpdate,
+)
+from app.services.audit import emit_audit_event
+from app.services.webhooks import (
+    DELIVERY_DEAD_LETTER,
+    DELIVERY_PENDING,
+    WEBHOOK_EVENT_TYPES,
+    WebhookTargetError,
+    check_webhook_url,
+)
+
+router = APIRouter(tags=["webhooks"])
+
+
+def _require_endpoint_for_org(
+    db: Session, organisation_id: UUID, webhook_id: UUID
+) -> WebhookEndpoint:
+    endpoint = db.get(WebhookEndpoint, webhook_id)
+    if not endpoint or endpoint.organisation_id != organisation_id:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return endpoint
+
+
+def _validate_event_types(event_types: list[str]) -> list[str]:
+    unknown_event_types = set(event_types) - WEBHOOK_EVENT_TYPES
+    if not event_types or unknown_event_types:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Event types must be one or more of: "
+                + ", ".join(sorted(WEBHOOK_EVENT_TYPES))
+            ),
+        )
+    return sorted(set(event_types))
+
+
+@router.post(
+    "/organisations/{organisation_id}/webhooks",
+    response_model=WebhookEndpointCreatedOut,
+)
+def create_webhook(
+    organisation_id: UUID,
+    payload: WebhookEndpointCreate,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_WEBHOOKS)),
+) -> WebhookEndpointCreatedOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    organisation = db.get(Organisation, organisation_id)
+    if not organisation:
+        raise HTTPException(status_code=404, detail="Organisation not found")
+
+    event_types = _validate_event_types(payload.event_types)
+    try:
+        # Rejects loopback, private, link-local and reserved targets so the
+        # worker cannot be pointed at internal services.
+        check_webhook_url(payload.url)
+    except WebhookTargetError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    endpoint = WebhookEndpoint(
+        organisation_id=organisation_id,
+        url=payload.url,
+        secret=secrets.token_hex(32),
+        event_types=event_types,
+        is_active=True,
+        created_by_user_id=actor_user.id,
+    )
+    db.add(endpoint)
+    db.flush()
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="webhook.created",
+        entity_type="webhook_endpoint",
+        entity_id=endpoint.id,
+        metadata={"url": endpoint.url, "event_types": endpoint.event_types},
+    )
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    db.refresh(endpoint)
+    return WebhookEndpointCreatedOut.model_validate(endpoint)
+
+
+@router.get(
+    "/organisations/{organisation_id}/webhooks",
+    response_model=list[WebhookEndpointOut],
+)
+def list_webhooks(
+    organisation_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_WEBHOOKS)),
+) -> list[WebhookEndpointOut]:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+
+    endpoints = (
+        db.execute(
+            select(WebhookEndpoint)
+            .where(WebhookEndpoint.organisation_id == organisation_id)
+            .order_by(WebhookEndpoint.created_at, WebhookEndpoint.id)
+        )
+        .scalars()
+        .all()
+    )
+    return [WebhookEndpointOut.model_validate(endpoint) for endpoint in endpoints]
+
+
+@router.patch(
+    "/organisations/{organisation_id}/webhooks/{webhook_id}",
+    response_model=WebhookEndpointOut,
+)
+def update_webhook(
+    organisation_id: UUID,
+    webhook_id: UUID,
+    payload: WebhookEndpointUpdate,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_WEBHOOKS)),
+) -> WebhookEndpointOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+    endpoint = _require_endpoint_for_org(db, organisation_id, webhook_id)
+
+    changes: dict[str, object] = {}
+    if payload.event_types is not None:
+        endpoint.event_types = _validate_event_types(payload.event_types)
+        changes["event_types"] = endpoint.event_types
+    if payload.is_active is not None:
+        # Inactive endpoints get no new deliveries, and pending ones wait
+        # until the endpoint is re-enabled.
+        endpoint.is_active = payload.is_active
+        changes["is_active"] = endpoint.is_active
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="webhook.updated",
+        entity_type="webhook_endpoint",
+        entity_id=endpoint.id,
+        metadata=changes,
+    )
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    db.refresh(endpoint)
+    return WebhookEndpointOut.model_validate(endpoint)
+
+
+@router.get(
+    "/organisations/{organisation_id}/webhooks/{webhook_id}/deliveries",
+    response_model=list[WebhookDeliveryOut],
+)
+def list_webhook_deliveries(
+    organisation_id: UUID,
+    webhook_id: UUID,
+    status: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_WEBHOOKS)),
+) -> list[WebhookDeliveryOut]:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+    _require_endpoint_for_org(db, organisation_id, webhook_id)
+
+    statement = select(WebhookDelivery).where(
+        WebhookDelivery.endpoint_id == webhook_id
+    )
+    if status is not None:
+        statement = statement.where(WebhookDelivery.status == status)
+    deliveries = (
+        db.execute(
+            statement.order_by(
+                WebhookDelivery.created_at.desc(), WebhookDelivery.id
+            ).limit(limit)
+        )
+        .scalars()
+        .all()
+    )
+    return [WebhookDeliveryOut.model_validate(delivery) for delivery in deliveries]
+
+
+@router.post(
+    "/organisations/{organisation_id}/webhooks/{webhook_id}/deliveries/{delivery_id}/retry",
+    response_model=WebhookDeliveryOut,
+)
+def retry_webhook_delivery(
+    organisation_id: UUID,
+    webhook_id: UUID,
+    delivery_id: UUID,
+    tenant_org_id: UUID = Depends(require_tenant_context),
+    db: Session = Depends(get_db),
+    actor: dict[str, UUID | str | None] = Depends(get_actor),
+    actor_user: UserAccount = Depends(require_permission(ORG_MANAGE_WEBHOOKS)),
+) -> WebhookDeliveryOut:
+    assert_path_matches_tenant(organisation_id, tenant_org_id)
+    _require_endpoint_for_org(db, organisation_id, webhook_id)
+
+    delivery = (
+        db.execute(
+            select(WebhookDelivery)
+            .where(
+                WebhookDelivery.id == delivery_id,
+                WebhookDelivery.endpoint_id == webhook_id,
+            )
+            .with_for_update()
+        )
+        .scalars()
+        .first()
+    )
+    if not delivery:
+        raise HTTPException(status_code=404, detail="Delivery not found")
+    if delivery.status != DELIVERY_DEAD_LETTER:
+        raise HTTPException(
+            status_code=400, detail="Only dead-lettered deliveries can be retried"
+        )
+
+    delivery.status = DELIVERY_PENDING
+    delivery.attempts = 0
+    delivery.next_attempt_at = datetime.now(timezone.utc)
+
+    emit_audit_event(
+        db,
+        organisation_id=organisation_id,
+        actor_user_id=actor_user.id,
+        actor_email=actor.get("actor_email"),
+        action="webhook.delivery_retried",
+        entity_type="webhook_delivery",
+        entity_id=delivery.id,
+        metadata={"endpoint_id": str(webhook_id)},
+    )
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Write failed")
+
+    db.refresh(delivery)
+    return WebhookDeliveryOut.model_validate(delivery)
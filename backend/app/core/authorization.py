@@ -16,6 +16,7 @@ ORG_MANAGE_CONTROLS = "org.manage_controls"
 ORG_MANAGE_EVIDENCE = "org.manage_evidence"
 ORG_MANAGE_RISKS = "org.manage_risks"
 ORG_MANAGE_INCIDENTS = "org.manage_incidents"
+ORG_MANAGE_WEBHOOKS = "org.manage_webhooks"
 
 _ROLE_PERMISSIONS: dict[str, set[str]] = {
     "org_admin": {
@@ -25,6 +26,7 @@ _ROLE_PERMISSIONS: dict[str, set[str]] = {
         ORG_MANAGE_EVIDENCE,
         ORG_MANAGE_RISKS,
         ORG_MANAGE_INCIDENTS,
+        ORG_MANAGE_WEBHOOKS,
     },
     "org_member": {
         ORG_READ,
@@ -19,6 +19,16 @@ def get_database_url() -> str:
     return f"postgresql+psycopg://{safe_user}:{safe_password}@{host}:{port}/{database}"
 
 
+def get_db_prepare_threshold() -> int | None:
+    # psycopg prepares a statement server-side once it has run this many
+    # times on a connection; "none" disables it (e.g. behind PgBouncer in
+    # transaction pooling mode).
+    value = os.getenv("DB_PREPARE_THRESHOLD", "5")
+    if value.lower() in {"none", "off", "disabled"}:
+        return None
+    return int(value)
+
+
 def get_evidence_storage_backend() -> str:
     return os.getenv("EVIDENCE_STORAGE_BACKEND", "local").lower()
 
@@ -27,15 +37,97 @@ def get_gcs_bucket_name() -> str | None:
     return os.getenv("GCS_BUCKET_NAME")
 
 
+def get_gcs_max_pool_connections() -> int:
+    value = os.getenv("GCS_MAX_POOL_CONNECTIONS", "32")
+    return int(value)
+
+
 def get_gcs_signed_url_ttl_seconds() -> int:
     value = os.getenv("GCS_SIGNED_URL_TTL_SECONDS", "300")
     return int(value)
 
 
+def get_s3_bucket_name() -> str | None:
+    return os.getenv("S3_BUCKET_NAME")
+
+
+def get_s3_endpoint_url() -> str | None:
+    # Set for MinIO and other S3-compatible services; unset means AWS.
+    return os.getenv("S3_ENDPOINT_URL") or None
+
+
+def get_s3_region() -> str | None:
+    return os.getenv("S3_REGION") or None
+
+
+def get_s3_signed_url_ttl_seconds() -> int:
+    value = os.getenv("S3_SIGNED_URL_TTL_SECONDS", "300")
+    return int(value)
+
+
+def get_s3_multipart_threshold_bytes() -> int:
+    value = os.getenv("S3_MULTIPART_THRESHOLD_BYTES", str(16 * 1024 * 1024))
+    return int(value)
+
+
+def get_s3_multipart_part_bytes() -> int:
+    # S3 rejects parts under 5 MiB other than the last one.
+    value = os.getenv("S3_MULTIPART_PART_BYTES", str(8 * 1024 * 1024))
+    return max(int(value), 5 * 1024 * 1024)
+
+
+def get_s3_upload_concurrency() -> int:
+    value = os.getenv("S3_UPLOAD_CONCURRENCY", "8")
+    return int(value)
+
+
+def get_s3_max_pool_connections() -> int:
+    value = os.getenv("S3_MAX_POOL_CONNECTIONS", "32")
+    return int(value)
+
+
 def get_gcp_project_id() -> str | None:
     return os.getenv("GCP_PROJECT_ID")
 
 
+def get_org_summary_cache_seconds() -> int:
+    value = os.getenv("ORG_SUMMARY_CACHE_SECONDS", "30")
+    return int(value)
+
+
+def get_version_diff_cache_size() -> int:
+    value = os.getenv("VERSION_DIFF_CACHE_SIZE", "4096")
+    return int(value)
+
+
+def get_entity_cache_backend() -> str:
+    return os.getenv("ENTITY_CACHE_BACKEND", "memory").lower()
+
+
+def get_entity_cache_size() -> int:
+    value = os.getenv("ENTITY_CACHE_SIZE", "4096")
+    return int(value)
+
+
+def get_entity_cache_ttl_seconds() -> int:
+    value = os.getenv("ENTITY_CACHE_TTL_SECONDS", "300")
+    return int(value)
+
+
+def get_redis_url() -> str | None:
+    return os.getenv("REDIS_URL")
+
+
+def get_cache_bus_enabled() -> bool:
+    value = os.getenv("CACHE_BUS_ENABLED", "true")
+    return value.lower() in {"1", "true", "yes", "on"}
+
+
+def get_change_feed_heartbeat_seconds() -> int:
+    value = os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15")
+    return int(value)
+
+
 def get_auth_mode() -> str:
     return os.getenv("AUTH_MODE", "dev").lower()
 
@@ -80,3 +172,102 @@ def get_oidc_clock_skew_seconds() -> int:
 def get_oidc_http_timeout_seconds() -> int:
     value = os.getenv("OIDC_HTTP_TIMEOUT_SECONDS", "5")
     return int(value)
+
+
+def get_webhook_batch_size() -> int:
+    value = os.getenv("WEBHOOK_BATCH_SIZE", "50")
+    return int(value)
+
+
+def get_webhook_max_attempts() -> int:
+    value = os.getenv("WEBHOOK_MAX_ATTEMPTS", "8")
+    return int(value)
+
+
+def get_webhook_timeout_seconds() -> float:
+    value = os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10")
+    return float(value)
+
+
+def get_webhook_poll_seconds() -> float:
+    value = os.getenv("WEBHOOK_POLL_SECONDS", "2")
+    return float(value)
+
+
+def get_job_worker_threads() -> int:
+    value = os.getenv("JOB_WORKER_THREADS", "4")
+    return int(value)
+
+
+def get_job_worker_processes() -> int:
+    value = os.getenv("JOB_WORKER_PROCESSES", "2")
+    return int(value)
+
+
+def get_job_poll_seconds() -> float:
+    value = os.getenv("JOB_POLL_SECONDS", "1")
+    return float(value)
+
+
+def get_job_lease_seconds() -> int:
+    value = os.getenv("JOB_LEASE_SECONDS", "300")
+    return int(value)
+
+
+def get_evidence_verify_concurrency() -> int:
+    value = os.getenv("EVIDENCE_VERIFY_CONCURRENCY", "4")
+    return int(value)
+
+
+def get_evidence_verify_max_bytes_per_second() -> int:
+    # 0 disables the throttle.
+    value = os.getenv("EVIDENCE_VERIFY_MAX_BYTES_PER_SECOND", str(50 * 1024 * 1024))
+    return int(value)
+
+
+def get_evidence_verify_interval_days() -> int:
+    value = os.getenv("EVIDENCE_VERIFY_INTERVAL_DAYS", "30")
+    return int(value)
+
+
+def get_evidence_verify_retry_minutes() -> int:
+    # How long an object that could not be read waits before another try.
+    value = os.getenv("EVIDENCE_VERIFY_RETRY_MINUTES", "60")
+    return int(value)
+
+
+def get_evidence_verify_batch_size() -> int:
+    value = os.getenv("EVIDENCE_VERIFY_BATCH_SIZE", "100")
+    return int(value)
+
+
+def get_evidence_local_durability() -> str:
+    # "strict" fsyncs each upload and its directory entries before returning;
+    # "group" shares one flush between uploads landing in the same window.
+    return os.getenv("EVIDENCE_LOCAL_DURABILITY", "strict").lower()
+
+
+def get_evidence_group_commit_window_ms() -> int:
+    # Uploads arriving during a flush are already batched into the next one;
+    # a few milliseconds here only pays off on disks with slow cache flushes.
+    value = os.getenv("EVIDENCE_GROUP_COMMIT_WINDOW_MS", "0")
+    return int(value)
+
+
+def get_evidence_compression() -> str:
+    # "none" stores uploads as received; "zstd" compresses text-like uploads
+    # at rest. Needs the zstandard package. Local storage only: GCS and S3
+    # objects are fetched through signed URLs, which cannot decode zstd.
+    return os.getenv("EVIDENCE_COMPRESSION", "none").lower()
+
+
+def get_evidence_compression_min_bytes() -> int:
+    # Below this a zstd frame saves too little to be worth the extra step
+    # on every read.
+    value = os.getenv("EVIDENCE_COMPRESSION_MIN_BYTES", "4096")
+    return int(value)
+
+
+def get_evidence_compression_level() -> int:
+    value = os.getenv("EVIDENCE_COMPRESSION_LEVEL", "3")
+    return int(value)
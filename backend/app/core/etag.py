@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.responses import wants_ndjson
+
+
+def build_etag(request: Request, seq: int) -> str:
+    representation = "ndjson" if wants_ndjson(request) else "json"
+    variant = f"{request.url.path}?{request.url.query}|{representation}".encode()
+    digest = hashlib.blake2b(variant, digest_size=8).hexdigest()
+    return f'W/"{seq}-{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        _opaque_tag(candidate) == _opaque_tag(etag)
+        for candidate in header.split(",")
+    )
+
+
+def apply_etag(request: Request, response: Response, seq: int) -> Response | None:
+    etag = build_etag(request, seq)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
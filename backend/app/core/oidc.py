@@ -73,6 +73,10 @@ def fetch_jwks() -> dict[str, Any]:
     return jwks
 
 
+def clear_jwks_cache() -> None:
+    _JWKS_CACHE.clear()
+
+
 def verify_bearer_token(auth_header: str | None) -> str:
     if not auth_header:
         raise _invalid_token("Invalid bearer token")
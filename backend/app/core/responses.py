@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Select
+
+from app.db.session import SessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_BATCH_SIZE = 500
+
+
+class OrjsonResponse(JSONResponse):
+    # OPT_UTC_Z keeps timestamps in the same "Z" form pydantic emits.
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _carried_headers(response: Response) -> dict[str, str]:
+    # Headers already set on the injected response (ETag, Cache-Control) are
+    # not merged into a returned Response, so carry them over explicitly.
+    return {
+        name: value
+        for name, value in response.headers.items()
+        if name not in ("content-length", "content-type")
+    }
+
+
+def orjson_list_response(
+    adapter: TypeAdapter[Any], rows: list[dict[str, Any]], response: Response
+) -> OrjsonResponse:
+    return OrjsonResponse(
+        adapter.validate_python(rows), headers=_carried_headers(response)
+    )
+
+
+def _iter_ndjson(adapter: TypeAdapter[Any], statement: Select) -> Iterator[bytes]:
+    # The request session can be released before the body is sent, so the
+    # stream owns its session and reads through a server-side cursor.
+    with SessionLocal() as db:
+        result = db.execute(
+            statement.execution_options(yield_per=NDJSON_BATCH_SIZE)
+        ).mappings()
+        for partition in result.partitions():
+            rows = adapter.validate_python([dict(row) for row in partition])
+            yield b"".join(
+                orjson.dumps(row, option=orjson.OPT_UTC_Z) + b"\n" for row in rows
+            )
+
+
+def ndjson_stream_response(
+    adapter: TypeAdapter[Any], statement: Select, response: Response
+) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_ndjson(adapter, statement),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=_carried_headers(response),
+    )
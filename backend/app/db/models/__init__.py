@@ -5,11 +5,18 @@ from app.db.models.control_version import ControlVersion
 from app.db.models.evidence_item import EvidenceItem
 from app.db.models.incident import Incident
 from app.db.models.incident_version import IncidentVersion
+from app.db.models.job import Job
+from app.db.models.org_change import OrgChange
+from app.db.models.org_change_counter import OrgChangeCounter
+from app.db.models.org_metric import OrgMetric
 from app.db.models.organisation import Organisation
 from app.db.models.risk import Risk
 from app.db.models.risk_control_link import RiskControlLink
+from app.db.models.risk_heatmap_cell import RiskHeatmapCell
 from app.db.models.risk_version import RiskVersion
 from app.db.models.user_account import UserAccount
+from app.db.models.webhook_delivery import WebhookDelivery
+from app.db.models.webhook_endpoint import WebhookEndpoint
 
 __all__ = [
     "AuditEvent",
@@ -19,9 +26,16 @@ __all__ = [
     "EvidenceItem",
     "Incident",
     "IncidentVersion",
+    "Job",
+    "OrgChange",
+    "OrgChangeCounter",
+    "OrgMetric",
     "Organisation",
     "Risk",
     "RiskControlLink",
+    "RiskHeatmapCell",
     "RiskVersion",
     "UserAccount",
+    "WebhookDelivery",
+    "WebhookEndpoint",
 ]
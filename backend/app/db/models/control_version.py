@@ -1,8 +1,8 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, desc, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, desc, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -26,6 +26,29 @@ class ControlVersion(Base):
             "control_id",
             desc("version"),
         ),
+        Index(
+            "ix_control_version_control_id_version_desc_created_at",
+            "control_id",
+            desc("version"),
+            "created_at",
+        ),
+        Index(
+            "ix_control_version_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_control_version_control_code_trgm",
+            "control_code",
+            postgresql_using="gin",
+            postgresql_ops={"control_code": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_control_version_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -54,3 +77,14 @@ class ControlVersion(Base):
         server_default=text("now()"),
         nullable=False,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(control_code, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(framework, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
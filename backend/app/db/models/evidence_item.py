@@ -1,8 +1,8 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Computed, DateTime, ForeignKey, Index, String, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -17,6 +17,27 @@ class EvidenceItem(Base):
             "created_at",
         ),
         Index("ix_evidence_item_sha256", "sha256"),
+        Index(
+            "ix_evidence_item_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_evidence_item_content_vector",
+            "content_vector",
+            postgresql_using="gin",
+        ),
+        # Integrity passes walk items least recently verified first, either
+        # across every organisation or within one.
+        Index(
+            "ix_evidence_item_last_verified_at",
+            text("last_verified_at NULLS FIRST"),
+        ),
+        Index(
+            "ix_evidence_item_organisation_id_last_verified_at",
+            "organisation_id",
+            text("last_verified_at NULLS FIRST"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -35,6 +56,9 @@ class EvidenceItem(Base):
     original_filename: Mapped[str | None] = mapped_column(String, nullable=True)
     sha256: Mapped[str | None] = mapped_column(String, nullable=True)
     content_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    # How the stored object is encoded at rest; NULL for raw bytes. sha256
+    # and size_bytes always describe the original upload.
+    content_encoding: Mapped[str | None] = mapped_column(String, nullable=True)
     size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     uploaded_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -48,3 +72,29 @@ class EvidenceItem(Base):
         nullable=False,
         index=True,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Filled in by the evidence.extract_text job once the uploaded file has
+    # been parsed; NULL until then or for formats we cannot read.
+    content_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
+    content_indexed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_verified_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    integrity_status: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Set on every verification attempt, including ones that could not read
+    # the object; last_verified_at only moves when a verdict was reached.
+    verification_attempted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -1,8 +1,8 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, desc, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -18,6 +18,17 @@ class IncidentVersion(Base):
         ),
         Index("ix_incident_version_organisation_id", "organisation_id"),
         Index("ix_incident_version_incident_id", "incident_id"),
+        Index(
+            "ix_incident_version_incident_id_version_desc_created_at",
+            "incident_id",
+            desc("version"),
+            "created_at",
+        ),
+        Index(
+            "ix_incident_version_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -46,3 +57,13 @@ class IncidentVersion(Base):
         server_default=text("now()"),
         nullable=False,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(category, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
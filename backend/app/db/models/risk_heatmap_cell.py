@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import CheckConstraint, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RiskHeatmapCell(Base):
+    __tablename__ = "risk_heatmap_cell"
+    __table_args__ = (
+        UniqueConstraint(
+            "organisation_id",
+            "likelihood",
+            "impact",
+            "status",
+            "category",
+            name="uq_risk_heatmap_cell_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+        CheckConstraint(
+            "risk_count >= 0", name="ck_risk_heatmap_cell_risk_count"
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    organisation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organisation.id"), nullable=False
+    )
+    likelihood: Mapped[int] = mapped_column(Integer, nullable=False)
+    impact: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    category: Mapped[str | None] = mapped_column(String, nullable=True)
+    risk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,8 +1,8 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, desc, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, Computed, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, desc, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -28,6 +28,17 @@ class RiskVersion(Base):
             "risk_id",
             desc("version"),
         ),
+        Index(
+            "ix_risk_version_risk_id_version_desc_created_at",
+            "risk_id",
+            desc("version"),
+            "created_at",
+        ),
+        Index(
+            "ix_risk_version_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -61,3 +72,13 @@ class RiskVersion(Base):
         server_default=text("now()"),
         nullable=False,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(category, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
@@ -3,9 +3,13 @@ from collections.abc import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import get_database_url
+from app.core.config import get_database_url, get_db_prepare_threshold
 
-engine = create_engine(get_database_url(), pool_pre_ping=True)
+engine = create_engine(
+    get_database_url(),
+    pool_pre_ping=True,
+    connect_args={"prepare_threshold": get_db_prepare_threshold()},
+)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -0,0 +1,48 @@
+# Hot-path statements are built once and take their values through named
+# bind parameters. Reusing the same construct skips cache-key generation in
+# SQLAlchemy's compiled cache, and the identical SQL text lets psycopg
+# prepare it server-side once prepare_threshold is reached.
+
+from sqlalchemy import bindparam, select
+
+from app.db.models import (
+    Control,
+    ControlVersion,
+    Incident,
+    OrgChangeCounter,
+    Risk,
+    RiskVersion,
+)
+
+RISK_FOR_ORG = select(Risk).where(
+    Risk.id == bindparam("risk_id"),
+    Risk.organisation_id == bindparam("organisation_id"),
+)
+
+CONTROL_FOR_ORG = select(Control).where(
+    Control.id == bindparam("control_id"),
+    Control.organisation_id == bindparam("organisation_id"),
+)
+
+INCIDENT_FOR_ORG = select(Incident).where(
+    Incident.id == bindparam("incident_id"),
+    Incident.organisation_id == bindparam("organisation_id"),
+)
+
+LATEST_RISK_VERSION = (
+    select(RiskVersion)
+    .where(RiskVersion.risk_id == bindparam("risk_id"))
+    .order_by(RiskVersion.version.desc())
+    .limit(1)
+)
+
+LATEST_CONTROL_VERSION = (
+    select(ControlVersion)
+    .where(ControlVersion.control_id == bindparam("control_id"))
+    .order_by(ControlVersion.version.desc())
+    .limit(1)
+)
+
+ORGANISATION_CHANGE_SEQ = select(OrgChangeCounter.seq).where(
+    OrgChangeCounter.organisation_id == bindparam("organisation_id")
+)
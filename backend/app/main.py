@@ -1,4 +1,5 @@
 from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,15 +7,29 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.api import api_router
-from app.core.config import get_auth_mode, get_cors_allow_origins
+from app.core.config import (
+    get_auth_mode,
+    get_cache_bus_enabled,
+    get_cors_allow_origins,
+)
 from app.core.oidc import validate_oidc_settings
 from app.db.session import get_db
+from app.services.cache_bus import CacheInvalidationListener
+from app.services.entity_cache import get_entity_cache_stats
+from app.services.evidence_storage import clear_evidence_storages
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     if get_auth_mode() == "oidc":
         validate_oidc_settings()
+    listener = None
+    if get_cache_bus_enabled():
+        listener = CacheInvalidationListener()
+        listener.start()
     yield
+    if listener is not None:
+        listener.stop()
+    clear_evidence_storages()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -42,3 +57,8 @@ def health_db(db: Session = Depends(get_db)) -> dict[str, str]:
         ) from exc
 
     return {"status": "ok"}
+
+
+@app.get("/health/cache")
+def health_cache() -> dict[str, Any]:
+    return {"status": "ok", "entity_cache": get_entity_cache_stats()}
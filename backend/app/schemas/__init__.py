@@ -1,8 +1,16 @@
-from app.schemas.organisation import OrganisationCreate, OrganisationOut
+from app.schemas.organisation import (
+    OrganisationCreate,
+    OrganisationMetricsOut,
+    OrganisationOut,
+    OrganisationSummaryOut,
+)
 from app.schemas.bootstrap import BootstrapCreate, BootstrapOut
+from app.schemas.changes import ChangeOut, ChangesOut
 from app.schemas.risk import (
     RiskControlLinkCreate,
     RiskControlLinkOut,
+    RiskControlMatrixOut,
+    RiskCoverageOut,
     RiskCreate,
     RiskOut,
     RiskVersionCreate,
@@ -15,23 +23,43 @@ from app.schemas.control import (
     ControlOut,
     ControlVersionCreate,
 )
-from app.schemas.evidence import EvidenceCreate, EvidenceOut
+from app.schemas.evidence import (
+    EvidenceCreate,
+    EvidenceIntegrityItemOut,
+    EvidenceIntegrityOut,
+    EvidenceOut,
+)
 from app.schemas.incident import (
     IncidentCreate,
     IncidentOut,
     IncidentVersionCreate,
     IncidentVersionOut,
 )
+from app.schemas.job import JobOut
+from app.schemas.search import SearchResultOut, SearchResultsOut
 from app.schemas.user_account import UserAccountCreate, UserAccountOut
+from app.schemas.version_diff import VersionChangelogOut, VersionDiffOut
+from app.schemas.webhook import (
+    WebhookDeliveryOut,
+    WebhookEndpointCreate,
+    WebhookEndpointCreatedOut,
+    WebhookEndpointOut,
+)
 
 __all__ = [
     "OrganisationCreate",
+    "OrganisationMetricsOut",
     "OrganisationOut",
+    "OrganisationSummaryOut",
     "BootstrapCreate",
     "BootstrapOut",
+    "ChangeOut",
+    "ChangesOut",
+    "RiskCoverageOut",
     "RiskCreate",
     "RiskControlLinkCreate",
     "RiskControlLinkOut",
+    "RiskControlMatrixOut",
     "RiskOut",
     "RiskVersionCreate",
     "RiskVersionOut",
@@ -41,11 +69,22 @@ __all__ = [
     "ControlOut",
     "ControlVersionCreate",
     "EvidenceCreate",
+    "EvidenceIntegrityItemOut",
+    "EvidenceIntegrityOut",
     "EvidenceOut",
     "IncidentCreate",
     "IncidentOut",
     "IncidentVersionCreate",
     "IncidentVersionOut",
+    "JobOut",
+    "SearchResultOut",
+    "SearchResultsOut",
     "UserAccountCreate",
     "UserAccountOut",
+    "VersionChangelogOut",
+    "VersionDiffOut",
+    "WebhookDeliveryOut",
+    "WebhookEndpointCreate",
+    "WebhookEndpointCreatedOut",
+    "WebhookEndpointOut",
 ]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.control import ControlOut
+from app.schemas.evidence import EvidenceOut
+from app.schemas.incident import IncidentOut
+from app.schemas.risk import RiskOut
+
+
+class ChangeOut(BaseModel):
+    seq: int
+    entity_type: str
+    entity_id: UUID
+    changed_at: datetime
+
+
+class ChangesOut(BaseModel):
+    changes: list[ChangeOut]
+    risks: list[RiskOut]
+    controls: list[ControlOut]
+    incidents: list[IncidentOut]
+    evidence: list[EvidenceOut]
+    next_cursor: int
+    has_more: bool
@@ -1,7 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class ControlCreate(BaseModel):
@@ -39,6 +40,35 @@ class ControlOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ControlRow(TypedDict):
+    control_id: UUID
+    organisation_id: UUID
+    latest_version: int
+    framework: str | None
+    control_code: str
+    title: str
+    description: str | None
+    status: str
+    owner_user_id: UUID | None
+    score: int | None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Validates a whole list of ControlOut-shaped dicts in one pass for the
+# orjson and NDJSON list responses.
+CONTROL_ROWS_ADAPTER = TypeAdapter(list[ControlRow])
+
+
+class ControlLookupOut(BaseModel):
+    control_id: UUID
+    control_code: str
+    title: str
+    framework: str | None
+    status: str
+    similarity: float
+
+
 class ControlVersionOut(BaseModel):
     id: UUID
     organisation_id: UUID
@@ -1,7 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class EvidenceCreate(BaseModel):
@@ -36,6 +37,67 @@ class EvidenceOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EvidenceRow(TypedDict):
+    id: UUID
+    organisation_id: UUID
+    title: str
+    description: str | None
+    evidence_type: str
+    source: str | None
+    external_uri: str | None
+    storage_backend: str | None
+    object_key: str | None
+    original_filename: str | None
+    sha256: str | None
+    content_type: str | None
+    size_bytes: int | None
+    uploaded_at: datetime | None
+    created_by_user_id: UUID | None
+    created_at: datetime
+
+
+# Validates a batch of EvidenceOut-shaped dicts for the NDJSON list stream.
+EVIDENCE_ROWS_ADAPTER = TypeAdapter(list[EvidenceRow])
+
+
 class EvidenceDownloadUrlOut(BaseModel):
     url: str
     expires_in: int
+
+
+class EvidenceUploadUrlCreate(BaseModel):
+    filename: str
+    sha256: str
+    size_bytes: int
+    content_type: str | None = None
+    evidence_type: str
+    title: str | None = None
+    description: str | None = None
+    source: str | None = None
+    external_uri: str | None = None
+
+
+class EvidenceUploadUrlOut(BaseModel):
+    evidence_id: UUID
+    url: str
+    expires_in: int
+    # Sent with the PUT exactly as given; the signature covers them.
+    headers: dict[str, str]
+
+
+class EvidenceIntegrityItemOut(BaseModel):
+    id: UUID
+    title: str
+    sha256: str | None
+    integrity_status: str | None
+    last_verified_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EvidenceIntegrityOut(BaseModel):
+    stored_count: int
+    verified_count: int
+    unverified_count: int
+    oldest_verified_at: datetime | None
+    failures: list[EvidenceIntegrityItemOut]
@@ -1,7 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class IncidentCreate(BaseModel):
@@ -38,6 +39,25 @@ class IncidentOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class IncidentRow(TypedDict):
+    incident_id: UUID
+    organisation_id: UUID
+    latest_version: int
+    title: str
+    description: str | None
+    severity: str
+    status: str
+    category: str | None
+    owner_user_id: UUID | None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Validates a whole list of IncidentOut-shaped dicts in one pass for the
+# orjson and NDJSON list responses.
+INCIDENT_ROWS_ADAPTER = TypeAdapter(list[IncidentRow])
+
+
 class IncidentVersionOut(BaseModel):
     id: UUID
     organisation_id: UUID
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobOut(BaseModel):
+    id: UUID
+    organisation_id: UUID | None
+    kind: str
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: str | None
+    result: dict[str, Any] | None
+    created_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
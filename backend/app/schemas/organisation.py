@@ -14,3 +14,45 @@ class OrganisationOut(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class StatusCountsOut(BaseModel):
+    total: int
+    by_status: dict[str, int]
+
+
+class EvidenceCountsOut(BaseModel):
+    total: int
+    by_type: dict[str, int]
+
+
+class OrganisationSummaryOut(BaseModel):
+    organisation_id: UUID
+    risks: StatusCountsOut
+    controls: StatusCountsOut
+    incidents: StatusCountsOut
+    evidence: EvidenceCountsOut
+
+
+class RiskMetricsOut(BaseModel):
+    count: int
+    average_score: float | None = None
+    by_status: dict[str, int]
+
+
+class ControlMetricsOut(BaseModel):
+    count: int
+    by_status: dict[str, int]
+
+
+class IncidentMetricsOut(BaseModel):
+    count: int
+    by_status: dict[str, int]
+    open_by_severity: dict[str, int]
+
+
+class OrganisationMetricsOut(BaseModel):
+    organisation_id: UUID
+    risks: RiskMetricsOut
+    controls: ControlMetricsOut
+    incidents: IncidentMetricsOut
@@ -1,7 +1,11 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.schemas.control import ControlOut
+from app.schemas.evidence import EvidenceOut
 
 
 class RiskCreate(BaseModel):
@@ -42,6 +46,35 @@ class RiskOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RiskRow(TypedDict):
+    risk_id: UUID
+    organisation_id: UUID
+    latest_version: int
+    title: str
+    description: str | None
+    category: str | None
+    likelihood: int
+    impact: int
+    score: int
+    status: str
+    owner_user_id: UUID | None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Validates a whole list of RiskOut-shaped dicts in one pass for the
+# orjson and NDJSON list responses.
+RISK_ROWS_ADAPTER = TypeAdapter(list[RiskRow])
+
+
+class RiskCoverageControlOut(ControlOut):
+    evidence: list[EvidenceOut]
+
+
+class RiskCoverageOut(RiskOut):
+    controls: list[RiskCoverageControlOut]
+
+
 class RiskVersionOut(BaseModel):
     id: UUID
     organisation_id: UUID
@@ -60,6 +93,40 @@ class RiskVersionOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RiskHeatmapCellOut(BaseModel):
+    likelihood: int
+    impact: int
+    status: str | None = None
+    category: str | None = None
+    count: int
+
+
+class RiskHeatmapOut(BaseModel):
+    cells: list[RiskHeatmapCellOut]
+    total: int
+
+
+class RiskControlMatrixRiskOut(BaseModel):
+    risk_id: UUID
+    title: str
+    status: str
+    score: int
+
+
+class RiskControlMatrixControlOut(BaseModel):
+    control_id: UUID
+    control_code: str
+    title: str
+    status: str
+
+
+class RiskControlMatrixOut(BaseModel):
+    risks: list[RiskControlMatrixRiskOut]
+    controls: list[RiskControlMatrixControlOut]
+    risk_index: list[int]
+    control_index: list[int]
+
+
 class RiskControlLinkCreate(BaseModel):
     control_id: UUID
 
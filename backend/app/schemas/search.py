@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+SearchEntityType = Literal["risk", "control", "incident", "evidence"]
+
+
+class SearchResultOut(BaseModel):
+    entity_type: SearchEntityType
+    entity_id: UUID
+    title: str
+    snippet: str
+    rank: float
+    updated_at: datetime
+
+
+class SearchResultsOut(BaseModel):
+    query: str
+    results: list[SearchResultOut]
+    limit: int
+    offset: int
+    has_more: bool
@@ -0,0 +1,23 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class FieldChangeOut(BaseModel):
+    field: str
+    old: int | UUID | str | None
+    new: int | UUID | str | None
+
+
+class VersionDiffOut(BaseModel):
+    from_version: int | None
+    to_version: int
+    created_at: datetime
+    created_by_user_id: UUID | None
+    changes: list[FieldChangeOut]
+
+
+class VersionChangelogOut(BaseModel):
+    entries: list[VersionDiffOut]
+    next_before: int | None
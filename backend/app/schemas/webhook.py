@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class WebhookEndpointCreate(BaseModel):
+    url: str
+    event_types: list[str]
+
+
+class WebhookEndpointUpdate(BaseModel):
+    event_types: list[str] | None = None
+    is_active: bool | None = None
+
+
+class WebhookEndpointOut(BaseModel):
+    id: UUID
+    organisation_id: UUID
+    url: str
+    event_types: list[str]
+    is_active: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookEndpointCreatedOut(WebhookEndpointOut):
+    # Returned once at registration; receivers verify signatures with it.
+    secret: str
+
+
+class WebhookDeliveryOut(BaseModel):
+    id: UUID
+    endpoint_id: UUID
+    event_type: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    last_error: str | None
+    delivered_at: datetime | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -6,6 +6,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.db.models import AuditEvent, UserAccount
+from app.services.webhooks import WEBHOOK_EVENT_TYPES, enqueue_webhook_event
 
 
 def emit_audit_event(
@@ -44,4 +45,17 @@ def emit_audit_event(
         metadata_=metadata,
     )
     db.add(event)
+
+    if action in WEBHOOK_EVENT_TYPES:
+        enqueue_webhook_event(
+            db,
+            organisation_id,
+            action,
+            {
+                "organisation_id": str(organisation_id),
+                "entity_type": entity_type,
+                "entity_id": str(entity_id) if entity_id else None,
+                "metadata": metadata,
+            },
+        )
     return event
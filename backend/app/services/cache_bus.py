@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import threading
+from typing import Any
+from uuid import UUID
+
+import psycopg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import get_database_url
+from app.core.oidc import clear_jwks_cache
+from app.services.change_feed import change_feed
+from app.services.entity_cache import clear_local_entity_cache, evict_local_entity
+from app.services.organisation_summary import (
+    clear_organisation_summary_cache,
+    invalidate_organisation_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "whisper_cache_invalidation"
+CACHED_ENTITY_TYPES = {"risk", "control", "incident"}
+LISTEN_POLL_SECONDS = 1.0
+RECONNECT_DELAY_SECONDS = 5.0
+
+
+def publish_invalidation(
+    db: Session,
+    entity_type: str,
+    organisation_id: UUID | None = None,
+    entity_id: UUID | None = None,
+    seq: int | None = None,
+) -> None:
+    # pg_notify is transactional: listeners receive the message only once the
+    # surrounding write commits, and never if it rolls back.
+    payload = json.dumps(
+        {
+            "entity_type": entity_type,
+            "organisation_id": str(organisation_id) if organisation_id else None,
+            "entity_id": str(entity_id) if entity_id else None,
+            "seq": seq,
+        }
+    )
+    db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def apply_invalidation(payload: str) -> dict[str, Any]:
+    message: dict[str, Any] = json.loads(payload)
+    entity_type = message.get("entity_type")
+    if entity_type == "jwks":
+        clear_jwks_cache()
+        return message
+
+    organisation_id = message.get("organisation_id")
+    if not organisation_id:
+        return message
+    invalidate_organisation_summary(UUID(organisation_id))
+    entity_id = message.get("entity_id")
+    if entity_type in CACHED_ENTITY_TYPES and entity_id:
+        evict_local_entity(entity_type, UUID(organisation_id), UUID(entity_id))
+    return message
+
+
+def clear_local_caches() -> None:
+    clear_jwks_cache()
+    clear_local_entity_cache()
+    clear_organisation_summary_cache()
+
+
+def _listener_conninfo() -> str:
+    url = make_url(get_database_url()).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class CacheInvalidationListener:
+    def __init__(self, conninfo: str | None = None) -> None:
+        self.conninfo = conninfo or _listener_conninfo()
+        self._stop = threading.Event()
+        self.listening = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {CHANNEL}")
+                    # Anything published while this worker was not listening
+                    # is lost, so start every connection from empty caches
+                    # and tell feed subscribers to refetch.
+                    clear_local_caches()
+                    change_feed.publish_resync()
+                    self.listening.set()
+                    while not self._stop.is_set():
+                        for notify in connection.notifies(
+                            timeout=LISTEN_POLL_SECONDS
+                        ):
+                            self._dispatch(notify.payload)
+            except Exception:
+                # Anything escaping here would end the thread for good and
+                # silently stop cross-worker invalidation, so every failure
+                # is treated as a disconnect.
+                self.listening.clear()
+                logger.warning(
+                    "Cache invalidation listener disconnected; retrying",
+                    exc_info=True,
+                )
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = apply_invalidation(payload)
+        except Exception:
+            logger.exception("Ignoring malformed cache invalidation message")
+            return
+        # The same notification drives the per-organisation change feed, so
+        # each worker holds one database listener however many clients
+        # subscribe.
+        if message.get("organisation_id"):
+            try:
+                change_feed.publish(
+                    UUID(message["organisation_id"]), {"type": "change", **message}
+                )
+            except Exception:
+                # A subscriber whose event loop has closed must not take the
+                # listener, and with it cache invalidation, down too.
+                logger.exception("Failed to publish change feed event")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.cache_bus",
+        description="Publish a cache invalidation to every API worker.",
+    )
+    parser.add_argument(
+        "entity_type", choices=["jwks", "organisation", *sorted(CACHED_ENTITY_TYPES)]
+    )
+    parser.add_argument("--organisation-id", type=UUID, default=None)
+    parser.add_argument("--entity-id", type=UUID, default=None)
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        publish_invalidation(
+            db, args.entity_type, args.organisation_id, args.entity_id
+        )
+        db.commit()
+    print(f"Published {args.entity_type} invalidation on {CHANNEL}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from app.core.config import get_change_feed_heartbeat_seconds
+
+SUBSCRIBER_QUEUE_SIZE = 100
+RESYNC_MESSAGE: dict[str, Any] = {"type": "resync"}
+
+
+class ChangeSubscription:
+    def __init__(self, organisation_id: UUID, loop: asyncio.AbstractEventLoop) -> None:
+        self.organisation_id = organisation_id
+        self.loop = loop
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=SUBSCRIBER_QUEUE_SIZE
+        )
+
+    def offer(self, message: dict[str, Any]) -> None:
+        # Runs on the subscriber's event loop. A client that falls this far
+        # behind is told to refetch everything instead of buffering without
+        # bound.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = RESYNC_MESSAGE
+        self.queue.put_nowait(message)
+
+
+class ChangeFeedBroker:
+    def __init__(self) -> None:
+        self._subscriptions: dict[UUID, set[ChangeSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, organisation_id: UUID) -> ChangeSubscription:
+        subscription = ChangeSubscription(organisation_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(organisation_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.organisation_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.organisation_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(
+                len(subscriptions) for subscriptions in self._subscriptions.values()
+            )
+
+    def publish(self, organisation_id: UUID, message: dict[str, Any]) -> None:
+        # Called from the database listener thread; each subscriber's queue is
+        # only touched on its own event loop.
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(organisation_id, ()))
+        self._offer(subscriptions, message)
+
+    def publish_resync(self) -> None:
+        with self._lock:
+            subscriptions = [
+                subscription
+                for subscriptions in self._subscriptions.values()
+                for subscription in subscriptions
+            ]
+        self._offer(subscriptions, RESYNC_MESSAGE)
+
+    def _offer(
+        self, subscriptions: list[ChangeSubscription], message: dict[str, Any]
+    ) -> None:
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # The subscriber's loop closed without unsubscribing; drop it
+                # rather than fail delivery to everyone after it.
+                self.unsubscribe(subscription)
+
+
+change_feed = ChangeFeedBroker()
+
+
+def format_sse(message: dict[str, Any]) -> str:
+    event = message.get("type", "change")
+    lines = []
+    if message.get("seq") is not None:
+        lines.append(f"id: {message['seq']}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(message, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def iter_change_events(
+    organisation_id: UUID, broker: ChangeFeedBroker = change_feed
+) -> AsyncIterator[str]:
+    subscription = broker.subscribe(organisation_id)
+    heartbeat_seconds = get_change_feed_heartbeat_seconds()
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(message)
+    finally:
+        broker.unsubscribe(subscription)
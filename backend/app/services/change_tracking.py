@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import OrgChange, OrgChangeCounter
+from app.db.statements import ORGANISATION_CHANGE_SEQ
+from app.services.cache_bus import publish_invalidation
+
+
+def record_organisation_change(
+    db: Session,
+    organisation_id: UUID,
+    entity_type: str | None = None,
+    entity_id: UUID | None = None,
+) -> int:
+    # The increment and the invalidation notice commit together with the
+    # write, so a reader never sees a sequence number ahead of the data it
+    # describes and other workers only evict once the data is visible.
+    statement = pg_insert(OrgChangeCounter).values(
+        organisation_id=organisation_id, seq=1
+    )
+    seq = db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[OrgChangeCounter.organisation_id],
+            set_={"seq": OrgChangeCounter.seq + 1, "updated_at": func.now()},
+        ).returning(OrgChangeCounter.seq)
+    ).scalar_one()
+    if entity_type is not None and entity_id is not None:
+        db.add(
+            OrgChange(
+                organisation_id=organisation_id,
+                seq=seq,
+                entity_type=entity_type,
+                entity_id=entity_id,
+            )
+        )
+    publish_invalidation(
+        db, entity_type or "organisation", organisation_id, entity_id, seq
+    )
+    return seq
+
+
+def get_organisation_change_seq(db: Session, organisation_id: UUID) -> int:
+    seq = db.execute(
+        ORGANISATION_CHANGE_SEQ, {"organisation_id": organisation_id}
+    ).scalar_one_or_none()
+    return seq or 0
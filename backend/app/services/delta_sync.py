@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Control,
+    ControlVersion,
+    EvidenceItem,
+    Incident,
+    IncidentVersion,
+    OrgChange,
+    Risk,
+    RiskVersion,
+)
+from app.schemas.changes import ChangeOut, ChangesOut
+from app.schemas.control import ControlOut
+from app.schemas.evidence import EvidenceOut
+from app.schemas.incident import IncidentOut
+from app.schemas.risk import RiskOut
+
+
+def _load_risks(
+    db: Session, organisation_id: UUID, risk_ids: set[UUID]
+) -> list[RiskOut]:
+    if not risk_ids:
+        return []
+    rows = db.execute(
+        select(Risk, RiskVersion)
+        .ext(distinct_on(RiskVersion.risk_id))
+        .join(RiskVersion, RiskVersion.risk_id == Risk.id)
+        .where(Risk.organisation_id == organisation_id, Risk.id.in_(risk_ids))
+        .order_by(RiskVersion.risk_id, RiskVersion.version.desc())
+    ).all()
+    return [
+        RiskOut(
+            risk_id=risk.id,
+            organisation_id=risk.organisation_id,
+            latest_version=version.version,
+            title=version.title,
+            description=version.description,
+            category=version.category,
+            likelihood=version.likelihood,
+            impact=version.impact,
+            score=version.likelihood * version.impact,
+            status=version.status,
+            owner_user_id=version.owner_user_id,
+            created_at=risk.created_at,
+            updated_at=version.created_at,
+        )
+        for risk, version in rows
+    ]
+
+
+def _load_controls(
+    db: Session, organisation_id: UUID, control_ids: set[UUID]
+) -> list[ControlOut]:
+    if not control_ids:
+        return []
+    rows = db.execute(
+        select(Control, ControlVersion)
+        .ext(distinct_on(ControlVersion.control_id))
+        .join(ControlVersion, ControlVersion.control_id == Control.id)
+        .where(
+            Control.organisation_id == organisation_id,
+            Control.id.in_(control_ids),
+        )
+        .order_by(ControlVersion.control_id, ControlVersion.version.desc())
+    ).all()
+    return [
+        ControlOut(
+            control_id=control.id,
+            organisation_id=control.organisation_id,
+            latest_version=version.version,
+            framework=version.framework,
+            control_code=version.control_code,
+            title=version.title,
+            description=version.description,
+            status=version.status,
+            owner_user_id=version.owner_user_id,
+            score=None,
+            created_at=control.created_at,
+            updated_at=version.created_at,
+        )
+        for control, version in rows
+    ]
+
+
+def _load_incidents(
+    db: Session, organisation_id: UUID, incident_ids: set[UUID]
+) -> list[IncidentOut]:
+    if not incident_ids:
+        return []
+    rows = db.execute(
+        select(Incident, IncidentVersion)
+        .join(
+            IncidentVersion,
+            (IncidentVersion.incident_id == Incident.id)
+            & (IncidentVersion.version == Incident.latest_version),
+        )
+        .where(
+            Incident.organisation_id == organisation_id,
+            Incident.id.in_(incident_ids),
+        )
+    ).all()
+    return [
+        IncidentOut(
+            incident_id=incident.id,
+            organisation_id=incident.organisation_id,
+            latest_version=incident.latest_version,
+            title=version.title,
+            description=version.description,
+            severity=version.severity,
+            status=version.status,
+            category=version.category,
+            owner_user_id=version.owner_user_id,
+            created_at=incident.created_at,
+            updated_at=incident.updated_at,
+        )
+        for incident, version in rows
+    ]
+
+
+def _load_evidence(
+    db: Session, organisation_id: UUID, evidence_ids: set[UUID]
+) -> list[EvidenceOut]:
+    if not evidence_ids:
+        return []
+    rows = db.execute(
+        select(EvidenceItem).where(
+            EvidenceItem.organisation_id == organisation_id,
+            EvidenceItem.id.in_(evidence_ids),
+        )
+    ).scalars()
+    return [EvidenceOut.model_validate(evidence) for evidence in rows]
+
+
+def load_changes_since(
+    db: Session, organisation_id: UUID, since: int, limit: int
+) -> ChangesOut:
+    # The (organisation_id, seq) primary key makes this a range scan over
+    # just the new log rows, however large the register is.
+    change_rows = (
+        db.execute(
+            select(OrgChange)
+            .where(
+                OrgChange.organisation_id == organisation_id,
+                OrgChange.seq > since,
+            )
+            .order_by(OrgChange.seq)
+            .limit(limit + 1)
+        )
+        .scalars()
+        .all()
+    )
+    has_more = len(change_rows) > limit
+    change_rows = change_rows[:limit]
+
+    changed_ids: dict[str, set[UUID]] = defaultdict(set)
+    for change in change_rows:
+        changed_ids[change.entity_type].add(change.entity_id)
+
+    # Entities are returned in their latest state, so one that changed
+    # several times in the batch appears once.
+    return ChangesOut(
+        changes=[
+            ChangeOut(
+                seq=change.seq,
+                entity_type=change.entity_type,
+                entity_id=change.entity_id,
+                changed_at=change.created_at,
+            )
+            for change in change_rows
+        ],
+        risks=_load_risks(db, organisation_id, changed_ids["risk"]),
+        controls=_load_controls(db, organisation_id, changed_ids["control"]),
+        incidents=_load_incidents(db, organisation_id, changed_ids["incident"]),
+        evidence=_load_evidence(db, organisation_id, changed_ids["evidence"]),
+        next_cursor=change_rows[-1].seq if change_rows else since,
+        has_more=has_more,
+    )
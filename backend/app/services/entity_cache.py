@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol, TypeVar
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+
+from app.core.config import (
+    get_entity_cache_backend,
+    get_entity_cache_size,
+    get_entity_cache_ttl_seconds,
+    get_redis_url,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class EntityCacheError(RuntimeError):
+    pass
+
+
+class EntityCacheBackend(Protocol):
+    name: str
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LocalEntityCache:
+    name = "memory"
+
+    def __init__(self, max_size: int, ttl_seconds: int) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisEntityCache:
+    name = "redis"
+
+    def __init__(
+        self, client: Any, ttl_seconds: int, prefix: str = "whisper:entity:"
+    ) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: int) -> RedisEntityCache:
+        import redis
+
+        return cls(redis.Redis.from_url(url), ttl_seconds)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, ex=self.ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class _CacheStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.lookup_seconds = 0.0
+
+    def record(self, hit: bool, elapsed: float) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.lookup_seconds += elapsed
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+
+_BACKEND: EntityCacheBackend | None = None
+_BACKEND_CONFIGURED = False
+_BACKEND_LOCK = threading.Lock()
+_STATS = _CacheStats()
+
+
+def _build_backend() -> EntityCacheBackend | None:
+    backend = get_entity_cache_backend()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return LocalEntityCache(
+            get_entity_cache_size(), get_entity_cache_ttl_seconds()
+        )
+    if backend == "redis":
+        redis_url = get_redis_url()
+        if not redis_url:
+            raise EntityCacheError("REDIS_URL is required")
+        return RedisEntityCache.from_url(redis_url, get_entity_cache_ttl_seconds())
+    raise EntityCacheError(f"Unsupported entity cache backend: {backend}")
+
+
+def get_entity_cache() -> EntityCacheBackend | None:
+    global _BACKEND, _BACKEND_CONFIGURED
+    if not _BACKEND_CONFIGURED:
+        with _BACKEND_LOCK:
+            if not _BACKEND_CONFIGURED:
+                _BACKEND = _build_backend()
+                _BACKEND_CONFIGURED = True
+    return _BACKEND
+
+
+def set_entity_cache(backend: EntityCacheBackend | None) -> None:
+    global _BACKEND, _BACKEND_CONFIGURED
+    with _BACKEND_LOCK:
+        _BACKEND = backend
+        _BACKEND_CONFIGURED = True
+    _STATS.reset()
+
+
+def _cache_key(entity_type: str, organisation_id: UUID, entity_id: UUID) -> str:
+    return f"{entity_type}:{organisation_id}:{entity_id}"
+
+
+def get_cached_entity(
+    entity_type: str,
+    organisation_id: UUID,
+    entity_id: UUID,
+    seq: int,
+    model: type[ModelT],
+) -> ModelT | None:
+    cache = get_entity_cache()
+    if cache is None:
+        return None
+    key = _cache_key(entity_type, organisation_id, entity_id)
+    started = time.perf_counter()
+    try:
+        raw = cache.get(key)
+    except Exception:
+        _STATS.record_error()
+        return None
+    # Entries are tagged with the organisation change sequence they were
+    # read under. A fill that raced a write carries an older sequence and is
+    # treated as a miss, so a cached read is never staler than the database.
+    try:
+        entry = orjson.loads(raw) if raw is not None else None
+        hit = entry is not None and entry["seq"] == seq
+        value = model.model_validate(entry["dto"]) if hit else None
+    except Exception:
+        # A corrupt entry, or one written by a deploy with a different DTO,
+        # is a miss; dropping it lets the next read refill it.
+        _STATS.record_error()
+        with contextlib.suppress(Exception):
+            cache.delete(key)
+        return None
+    _STATS.record(hit, time.perf_counter() - started)
+    return value
+
+
+def store_cached_entity(
+    entity_type: str,
+    organisation_id: UUID,
+    entity_id: UUID,
+    seq: int,
+    value: BaseModel,
+) -> None:
+    cache = get_entity_cache()
+    if cache is None:
+        return
+    payload = orjson.dumps({"seq": seq, "dto": value.model_dump(mode="json")})
+    try:
+        cache.set(_cache_key(entity_type, organisation_id, entity_id), payload)
+    except Exception:
+        _STATS.record_error()
+
+
+def invalidate_cached_entity(
+    entity_type: str, organisation_id: UUID, entity_id: UUID
+) -> None:
+    cache = get_entity_cache()
+    if cache is None:
+        return
+    try:
+        cache.delete(_cache_key(entity_type, organisation_id, entity_id))
+    except Exception:
+        _STATS.record_error()
+
+
+def evict_local_entity(
+    entity_type: str, organisation_id: UUID, entity_id: UUID
+) -> None:
+    # Shared backends are already coherent; only a per-process LRU needs
+    # evicting when another worker reports a write.
+    cache = get_entity_cache()
+    if isinstance(cache, LocalEntityCache):
+        cache.delete(_cache_key(entity_type, organisation_id, entity_id))
+
+
+def clear_local_entity_cache() -> None:
+    cache = get_entity_cache()
+    if isinstance(cache, LocalEntityCache):
+        cache.clear()
+
+
+def get_entity_cache_stats() -> dict[str, Any]:
+    cache = get_entity_cache()
+    lookups = _STATS.hits + _STATS.misses
+    return {
+        "backend": cache.name if cache is not None else "none",
+        "hits": _STATS.hits,
+        "misses": _STATS.misses,
+        "errors": _STATS.errors,
+        "hit_ratio": round(_STATS.hits / lookups, 4) if lookups else None,
+        "avg_lookup_ms": (
+            round(_STATS.lookup_seconds / lookups * 1000, 3) if lookups else None
+        ),
+    }
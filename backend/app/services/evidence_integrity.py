@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_evidence_verify_batch_size,
+    get_evidence_verify_concurrency,
+    get_evidence_verify_interval_days,
+    get_evidence_verify_max_bytes_per_second,
+    get_evidence_verify_retry_minutes,
+)
+from app.db.models import EvidenceItem, Job
+from app.services.audit import emit_audit_event
+from app.services.evidence_storage import (
+    get_evidence_storage,
+    open_decoded_file,
+)
+from app.services.jobs import (
+    EXECUTOR_THREAD,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    enqueue_job,
+    job_handler,
+)
+
+logger = logging.getLogger(__name__)
+
+VERIFY_INTEGRITY_JOB = "evidence.verify_integrity"
+# Below interactive work such as text extraction, so a long pass never
+# holds up jobs somebody is waiting on.
+VERIFY_INTEGRITY_PRIORITY = -10
+HASH_CHUNK_BYTES = 1024 * 1024
+
+INTEGRITY_OK = "ok"
+INTEGRITY_MISMATCH = "mismatch"
+INTEGRITY_MISSING = "missing"
+INTEGRITY_ERROR = "error"
+# Outcomes that settle an object's state; errors only mean it was unreadable.
+INTEGRITY_VERDICTS = (INTEGRITY_OK, INTEGRITY_MISMATCH, INTEGRITY_MISSING)
+
+
+class ByteRateLimiter:
+    def __init__(self, bytes_per_second: int) -> None:
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_free = time.monotonic()
+
+    def consume(self, byte_count: int) -> None:
+        # Shared by every hashing thread, so the cap holds for the whole
+        # pass rather than per object.
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + byte_count / self.bytes_per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+def hash_stream(handle: BinaryIO, limiter: ByteRateLimiter | None = None) -> str:
+    digest = hashlib.sha256()
+    while True:
+        chunk = handle.read(HASH_CHUNK_BYTES)
+        if not chunk:
+            return digest.hexdigest()
+        # hashlib drops the GIL for large buffers, so pool threads hash in
+        # parallel as well as overlapping their reads.
+        digest.update(chunk)
+        if limiter is not None:
+            limiter.consume(len(chunk))
+
+
+def _check_object(
+    limiter: ByteRateLimiter,
+    backend: str,
+    object_key: str,
+    content_encoding: str | None,
+    expected_sha256: str,
+) -> tuple[str, str | None, str | None]:
+    try:
+        # Objects are read from the backend recorded on each row, whatever
+        # the current upload backend is. sha256 is of the upload as
+        # received, so compressed objects are hashed after decoding.
+        storage = get_evidence_storage(backend)
+        with open_decoded_file(storage, object_key, content_encoding) as handle:
+            actual_sha256 = hash_stream(handle, limiter)
+    except FileNotFoundError:
+        return INTEGRITY_MISSING, None, None
+    except Exception as exc:
+        # Storage outages are not evidence of tampering; note them and let
+        # the next pass try again.
+        logger.warning("Could not read evidence object %s: %s", object_key, exc)
+        return INTEGRITY_ERROR, None, f"{type(exc).__name__}: {exc}"
+    if actual_sha256 != expected_sha256:
+        return INTEGRITY_MISMATCH, actual_sha256, None
+    return INTEGRITY_OK, actual_sha256, None
+
+
+def verify_evidence_batch(
+    session_factory: Callable[[], Session],
+    organisation_id: UUID | None = None,
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    max_bytes_per_second: int | None = None,
+    interval: timedelta | None = None,
+) -> dict[str, int | bool]:
+    batch_size = batch_size or get_evidence_verify_batch_size()
+    concurrency = concurrency or get_evidence_verify_concurrency()
+    if max_bytes_per_second is None:
+        max_bytes_per_second = get_evidence_verify_max_bytes_per_second()
+    interval = interval or timedelta(days=get_evidence_verify_interval_days())
+
+    now = datetime.now(timezone.utc)
+    verified_before = now - interval
+    attempted_before = now - timedelta(minutes=get_evidence_verify_retry_minutes())
+    statement = select(
+        EvidenceItem.id,
+        EvidenceItem.organisation_id,
+        EvidenceItem.storage_backend,
+        EvidenceItem.object_key,
+        EvidenceItem.content_encoding,
+        EvidenceItem.sha256,
+    ).where(
+        EvidenceItem.object_key.is_not(None),
+        EvidenceItem.sha256.is_not(None),
+        or_(
+            EvidenceItem.last_verified_at.is_(None),
+            EvidenceItem.last_verified_at < verified_before,
+        ),
+        # Objects that could not be read wait out the retry delay, so a
+        # chain of batches does not keep re-reading them during an outage.
+        or_(
+            EvidenceItem.verification_attempted_at.is_(None),
+            EvidenceItem.verification_attempted_at < attempted_before,
+        ),
+    )
+    if organisation_id is not None:
+        statement = statement.where(EvidenceItem.organisation_id == organisation_id)
+    statement = statement.order_by(
+        EvidenceItem.last_verified_at.asc().nulls_first(), EvidenceItem.id
+    ).limit(batch_size)
+
+    with session_factory() as db:
+        rows = db.execute(statement).all()
+    if not rows:
+        return {"checked": 0, "has_more": False}
+
+    # No connection is held while objects are read; a batch can take
+    # minutes under the byte-rate throttle.
+    limiter = ByteRateLimiter(max_bytes_per_second)
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="evidence-verify"
+    ) as pool:
+        outcomes = list(
+            pool.map(
+                lambda row: _check_object(
+                    limiter,
+                    row.storage_backend,
+                    row.object_key,
+                    row.content_encoding,
+                    row.sha256,
+                ),
+                rows,
+            )
+        )
+
+    checked_at = datetime.now(timezone.utc)
+    counts: Counter[str] = Counter()
+    with session_factory() as db:
+        evidence_by_id = {
+            evidence.id: evidence
+            for evidence in db.execute(
+                select(EvidenceItem).where(
+                    EvidenceItem.id.in_([row.id for row in rows])
+                )
+            ).scalars()
+        }
+        for row, (status, actual_sha256, error) in zip(rows, outcomes):
+            counts[status] += 1
+            evidence = evidence_by_id.get(row.id)
+            if evidence is None:
+                continue
+            evidence.verification_attempted_at = checked_at
+            if status == INTEGRITY_ERROR:
+                # Not a verdict: keep the previous one and try again later.
+                logger.info("Evidence %s left unverified: %s", row.id, error)
+                continue
+            evidence.last_verified_at = checked_at
+            evidence.integrity_status = status
+            if status in {INTEGRITY_MISMATCH, INTEGRITY_MISSING}:
+                emit_audit_event(
+                    db,
+                    organisation_id=row.organisation_id,
+                    actor_user_id=None,
+                    actor_email=None,
+                    action="evidence_item.integrity_failed",
+                    entity_type="evidence_item",
+                    entity_id=row.id,
+                    metadata={
+                        "reason": status,
+                        "expected_sha256": row.sha256,
+                        "actual_sha256": actual_sha256,
+                        "object_key": row.object_key,
+                        "backend": row.storage_backend,
+                    },
+                )
+        db.commit()
+
+    return {
+        "checked": len(rows),
+        **counts,
+        "has_more": len(rows) == batch_size,
+    }
+
+
+def enqueue_evidence_verification(
+    db: Session,
+    organisation_id: UUID | None = None,
+    run_at: datetime | None = None,
+) -> Job:
+    # One pass per scope at a time: a second request joins the pass that is
+    # already queued or running instead of re-reading the same objects.
+    existing = (
+        db.execute(
+            select(Job).where(
+                Job.kind == VERIFY_INTEGRITY_JOB,
+                Job.status.in_([JOB_QUEUED, JOB_RUNNING]),
+                Job.organisation_id.is_(None)
+                if organisation_id is None
+                else Job.organisation_id == organisation_id,
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if existing is not None:
+        return existing
+    return enqueue_job(
+        db,
+        VERIFY_INTEGRITY_JOB,
+        organisation_id=organisation_id,
+        priority=VERIFY_INTEGRITY_PRIORITY,
+        run_at=run_at,
+    )
+
+
+@job_handler(VERIFY_INTEGRITY_JOB, executor=EXECUTOR_THREAD)
+def verify_evidence_integrity_job(
+    organisation_id: UUID | None, payload: dict
+) -> dict[str, int | bool]:
+    from app.db.session import SessionLocal
+
+    result = verify_evidence_batch(SessionLocal, organisation_id)
+    if result["has_more"]:
+        # Chain batches as separate jobs so a multi-terabyte pass keeps
+        # yielding to higher-priority work between batches.
+        with SessionLocal() as db:
+            enqueue_job(
+                db,
+                VERIFY_INTEGRITY_JOB,
+                organisation_id=organisation_id,
+                priority=VERIFY_INTEGRITY_PRIORITY,
+            )
+            db.commit()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.evidence_integrity",
+        description="Schedule an evidence integrity verification pass.",
+    )
+    parser.add_argument("--organisation-id", type=UUID, default=None)
+    parser.add_argument(
+        "--delay-seconds",
+        type=int,
+        default=0,
+        help="Start the pass this many seconds from now, e.g. off-peak.",
+    )
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    run_at = None
+    if args.delay_seconds:
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=args.delay_seconds)
+    with SessionLocal() as db:
+        job = enqueue_evidence_verification(db, args.organisation_id, run_at)
+        db.commit()
+        print(f"Verification pass scheduled as job {job.id}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,80 @@
 from __future__ import annotations
 
+import base64
+import contextlib
+import ctypes
 import hashlib
+import logging
 import os
 import re
+import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
 from app.core.config import (
+    get_evidence_compression,
+    get_evidence_compression_level,
+    get_evidence_compression_min_bytes,
+    get_evidence_group_commit_window_ms,
+    get_evidence_local_durability,
     get_evidence_storage_backend,
     get_gcs_bucket_name,
+    get_gcs_max_pool_connections,
     get_gcp_project_id,
+    get_s3_bucket_name,
+    get_s3_endpoint_url,
+    get_s3_max_pool_connections,
+    get_s3_multipart_part_bytes,
+    get_s3_multipart_threshold_bytes,
+    get_s3_region,
+    get_s3_upload_concurrency,
+)
+
+logger = logging.getLogger(__name__)
+
+GCS_READ_CHUNK_BYTES = 8 * 1024 * 1024
+DURABILITY_STRICT = "strict"
+DURABILITY_GROUP = "group"
+COMPRESSION_NONE = "none"
+CONTENT_ENCODING_ZSTD = "zstd"
+DECOMPRESS_READ_BYTES = 1024 * 1024
+
+# Text-like evidence routinely shrinks 5-10x. PDFs, office documents, images
+# and archives are compressed already and are always stored as received.
+COMPRESSIBLE_CONTENT_TYPES = frozenset(
+    {
+        "application/csv",
+        "application/json",
+        "application/x-ndjson",
+        "application/xml",
+        "application/yaml",
+        "application/x-yaml",
+        "application/javascript",
+        "application/sql",
+    }
+)
+# Browsers often send logs and exports as application/octet-stream.
+COMPRESSIBLE_SUFFIXES = frozenset(
+    {
+        ".csv",
+        ".tsv",
+        ".json",
+        ".ndjson",
+        ".jsonl",
+        ".log",
+        ".txt",
+        ".md",
+        ".xml",
+        ".yaml",
+        ".yml",
+        ".sql",
+    }
 )
 
 
@@ -22,11 +86,192 @@ class EvidenceStorageCollision(EvidenceStorageError):
     pass
 
 
+def _load_zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise EvidenceStorageError(
+            "zstandard is required for zstd-compressed evidence"
+        ) from exc
+    return zstandard
+
+
+def _validate_compression(compression: str) -> str:
+    if compression not in {COMPRESSION_NONE, CONTENT_ENCODING_ZSTD}:
+        raise EvidenceStorageError(
+            f"Unsupported evidence compression: {compression}"
+        )
+    return compression
+
+
+def is_compressible(filename: str | None, content_type: str | None) -> bool:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type.startswith("text/") or media_type in COMPRESSIBLE_CONTENT_TYPES:
+        return True
+    return Path(filename or "").suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def encode_for_storage(
+    compression: str,
+    filename: str,
+    file_bytes: bytes,
+    content_type: str | None = None,
+) -> tuple[bytes, str | None]:
+    # Returns the bytes to store and their Content-Encoding, or None when
+    # they are stored as received.
+    if (
+        compression == COMPRESSION_NONE
+        or len(file_bytes) < get_evidence_compression_min_bytes()
+        or not is_compressible(filename, content_type)
+    ):
+        return file_bytes, None
+    zstandard = _load_zstandard()
+    # The frame records the original size, so readers can size buffers.
+    compressed = zstandard.ZstdCompressor(
+        level=get_evidence_compression_level()
+    ).compress(file_bytes)
+    if len(compressed) >= len(file_bytes):
+        return file_bytes, None
+    return compressed, CONTENT_ENCODING_ZSTD
+
+
+def open_decoded_file(
+    storage: EvidenceStorage,
+    object_key: str,
+    content_encoding: str | None,
+) -> BinaryIO:
+    # Opens an object as the bytes originally uploaded, decompressing as it
+    # is read so large objects are never held in memory.
+    handle = storage.open_file(object_key)
+    if content_encoding is None:
+        return handle
+    try:
+        if content_encoding != CONTENT_ENCODING_ZSTD:
+            raise EvidenceStorageError(
+                f"Unsupported evidence content encoding: {content_encoding}"
+            )
+        zstandard = _load_zstandard()
+    except EvidenceStorageError:
+        handle.close()
+        raise
+    return zstandard.ZstdDecompressor().stream_reader(
+        handle, read_size=DECOMPRESS_READ_BYTES, closefd=True
+    )
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _load_syncfs():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+    except (AttributeError, OSError):
+        return None
+    syncfs.argtypes = [ctypes.c_int]
+    syncfs.restype = ctypes.c_int
+    return syncfs
+
+
+_syncfs = _load_syncfs()
+
+
+class _SyncRequest:
+    def __init__(self, paths: list[Path]) -> None:
+        self.paths = paths
+        self.done = False
+        self.error: OSError | None = None
+
+
+class GroupCommitFsync:
+    # Callers that arrive while a flush is running queue up; when it ends,
+    # one of them flushes for the whole queue. Under load each flush covers
+    # many uploads, and an idle writer never waits for company. A non-zero
+    # window makes the flushing caller wait that long for more to join.
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self._condition = threading.Condition()
+        self._pending: list[_SyncRequest] = []
+        self._flushing = False
+
+    def sync(self, paths: list[Path]) -> None:
+        request = _SyncRequest(paths)
+        with self._condition:
+            self._pending.append(request)
+            while self._flushing and not request.done:
+                self._condition.wait()
+            if not request.done:
+                self._flushing = True
+
+        if not request.done:
+            if self.window_seconds:
+                time.sleep(self.window_seconds)
+            with self._condition:
+                batch, self._pending = self._pending, []
+            error = None
+            try:
+                self._flush([path for queued in batch for path in queued.paths])
+            except OSError as exc:
+                error = exc
+            with self._condition:
+                for queued in batch:
+                    queued.done = True
+                    queued.error = error
+                self._flushing = False
+                self._condition.notify_all()
+
+        if request.error is not None:
+            raise request.error
+
+    @staticmethod
+    def _flush(paths: list[Path]) -> None:
+        unique_paths = list(dict.fromkeys(paths))
+        if _syncfs is not None and unique_paths:
+            # One syncfs covers every file and directory entry in the batch
+            # with a single journal commit and device cache flush.
+            fd = os.open(unique_paths[0], os.O_RDONLY)
+            try:
+                if _syncfs(fd) != 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno))
+            finally:
+                os.close(fd)
+            return
+        for path in unique_paths:
+            _fsync_path(path)
+
+
+@lru_cache(maxsize=None)
+def _get_group_commit(window_ms: int) -> GroupCommitFsync:
+    # Shared per process: storage objects are cheap and created per
+    # request, but batching only works if they all queue on one instance.
+    return GroupCommitFsync(window_ms / 1000)
+
+
 class LocalEvidenceStorage:
     backend = "local"
 
-    def __init__(self, root: str | None = None) -> None:
+    def __init__(
+        self,
+        root: str | None = None,
+        durability: str | None = None,
+        compression: str | None = None,
+    ) -> None:
         self.root = Path(root or os.getenv("EVIDENCE_LOCAL_ROOT", ".evidence_data"))
+        self.durability = durability or get_evidence_local_durability()
+        if self.durability not in {DURABILITY_STRICT, DURABILITY_GROUP}:
+            raise EvidenceStorageError(
+                f"Unsupported evidence durability policy: {self.durability}"
+            )
+        self.compression = _validate_compression(
+            compression or get_evidence_compression()
+        )
 
     def store_file(
         self,
@@ -42,17 +287,22 @@ class LocalEvidenceStorage:
             org_id, evidence_id, sha256, filename
         )
         target_path = self._resolve_path(object_key)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
+        changed_dirs = self._make_dirs(target_path.parent)
 
         if target_path.exists():
             raise EvidenceStorageCollision("Evidence object already exists")
 
+        stored_bytes, content_encoding = encode_for_storage(
+            self.compression, filename, file_bytes, content_type
+        )
+        strict = self.durability == DURABILITY_STRICT
         with tempfile.NamedTemporaryFile(
             dir=target_path.parent, delete=False
         ) as temp_file:
-            temp_file.write(file_bytes)
+            temp_file.write(stored_bytes)
             temp_file.flush()
-            os.fsync(temp_file.fileno())
+            if strict:
+                os.fsync(temp_file.fileno())
             temp_name = temp_file.name
 
         try:
@@ -64,17 +314,34 @@ class LocalEvidenceStorage:
                 os.remove(temp_name)
             raise
 
+        # The rename and any new directories only survive a crash once the
+        # directories holding their entries are synced too.
+        if strict:
+            for directory in changed_dirs:
+                _fsync_path(directory)
+        else:
+            # Group mode syncs data and entries together after the rename. A
+            # crash before the flush can only leave a torn object under an
+            # evidence id no committed row refers to.
+            _get_group_commit(get_evidence_group_commit_window_ms()).sync(
+                [target_path, *changed_dirs]
+            )
+
         return {
             "object_key": object_key,
             "sha256": sha256,
             "size_bytes": size_bytes,
             "content_type": content_type,
+            "content_encoding": content_encoding,
         }
 
     def open_file(self, object_key: str):
         target_path = self._resolve_path(object_key)
         return target_path.open("rb")
 
+    def close(self) -> None:
+        pass
+
     def generate_signed_download_url(
         self,
         object_key: str,
@@ -83,6 +350,19 @@ class LocalEvidenceStorage:
     ) -> str:
         raise NotImplementedError("Signed URLs are not available for local storage.")
 
+    @staticmethod
+    def _make_dirs(directory: Path) -> list[Path]:
+        # Returns every directory whose entries change: the target directory
+        # for the rename, plus the parent of each directory created here.
+        missing = []
+        current = directory
+        while not current.exists():
+            missing.append(current)
+            current = current.parent
+        for path in reversed(missing):
+            path.mkdir(exist_ok=True)
+        return list(dict.fromkeys([directory, *(path.parent for path in missing)]))
+
     def _resolve_path(self, object_key: str) -> Path:
         object_path = Path(object_key)
         if object_path.is_absolute() or ".." in object_path.parts:
@@ -109,11 +389,35 @@ def build_object_key(
 class GcsEvidenceStorage:
     backend = "gcs"
 
-    def __init__(self, bucket_name: str, project_id: str | None = None) -> None:
+    def __init__(
+        self,
+        bucket_name: str,
+        project_id: str | None = None,
+    ) -> None:
+        import google.auth
+        from google.auth.transport.requests import AuthorizedSession
         from google.cloud import storage
+        from requests.adapters import HTTPAdapter
 
         self.bucket_name = bucket_name
-        self.client = storage.Client(project=project_id)
+        credentials, default_project = google.auth.default(
+            scopes=storage.Client.SCOPE
+        )
+        # The client is shared by every request thread; the default pool of
+        # ten connections would otherwise be discarded and re-opened under
+        # concurrent uploads. _http is the constructor's documented hook
+        # for supplying the session.
+        pool_size = get_gcs_max_pool_connections()
+        session = AuthorizedSession(credentials)
+        session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size),
+        )
+        self.client = storage.Client(
+            project=project_id or default_project,
+            credentials=credentials,
+            _http=session,
+        )
 
     def store_file(
         self,
@@ -131,6 +435,8 @@ class GcsEvidenceStorage:
             org_id, evidence_id, sha256, filename
         )
 
+        # Stored uncompressed: signed-URL downloads bypass the API, and GCS
+        # cannot decode zstd for clients that do not support it.
         bucket = self.client.bucket(self.bucket_name)
         blob = bucket.blob(object_key)
         try:
@@ -153,6 +459,20 @@ class GcsEvidenceStorage:
             "content_type": content_type,
         }
 
+    def open_file(self, object_key: str):
+        # BlobReader fetches the object in chunk_size ranged reads, so large
+        # evidence is streamed rather than downloaded whole. Raw download
+        # returns bytes exactly as stored, as the local backend does.
+        blob = self.client.bucket(self.bucket_name).blob(object_key)
+        if not blob.exists():
+            raise FileNotFoundError(object_key)
+        return blob.open(
+            "rb", chunk_size=GCS_READ_CHUNK_BYTES, raw_download=True
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
     def generate_signed_download_url(
         self,
         object_key: str,
@@ -182,8 +502,257 @@ def generate_gcs_signed_url(
     )
 
 
-def get_evidence_storage() -> LocalEvidenceStorage | GcsEvidenceStorage:
-    backend = get_evidence_storage_backend()
+_S3_COLLISION_CODES = {"PreconditionFailed", "ConditionalRequestConflict"}
+_S3_MISSING_CODES = {"NoSuchKey", "NotFound", "404"}
+
+
+def _s3_error_code(exc) -> str | None:
+    return exc.response.get("Error", {}).get("Code")
+
+
+def _b64_sha256(data: bytes) -> str:
+    return base64.b64encode(hashlib.sha256(data).digest()).decode("ascii")
+
+
+class S3EvidenceStorage:
+    backend = "s3"
+
+    def __init__(
+        self,
+        bucket_name: str,
+        endpoint_url: str | None = None,
+        region_name: str | None = None,
+    ) -> None:
+        import boto3
+        from botocore.config import Config
+
+        self.bucket_name = bucket_name
+        self.part_bytes = get_s3_multipart_part_bytes()
+        self.multipart_threshold = max(
+            get_s3_multipart_threshold_bytes(), self.part_bytes
+        )
+        self.upload_concurrency = get_s3_upload_concurrency()
+        # boto3 clients are thread-safe, so request threads and part uploads
+        # share one client and its connection pool.
+        self.client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region_name,
+            config=Config(
+                max_pool_connections=max(
+                    get_s3_max_pool_connections(), self.upload_concurrency
+                ),
+                retries={"mode": "standard"},
+                signature_version="s3v4",
+                # MinIO and most on-prem services expect path-style URLs.
+                s3={"addressing_style": "path"} if endpoint_url else None,
+                # Only send the SHA-256 checksums set below; not every
+                # S3-compatible service accepts the default CRC trailers.
+                request_checksum_calculation="when_required",
+                response_checksum_validation="when_required",
+            ),
+        )
+
+    def store_file(
+        self,
+        org_id: UUID,
+        evidence_id: UUID,
+        filename: str,
+        file_bytes: bytes,
+        content_type: str | None = None,
+    ) -> dict[str, str | int | None]:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        digest = hashlib.sha256(file_bytes).digest()
+        sha256 = digest.hex()
+        size_bytes = len(file_bytes)
+        object_key = build_object_key(
+            org_id, evidence_id, sha256, filename
+        )
+
+        # Stored uncompressed: presigned downloads bypass the API, and S3
+        # cannot decode zstd for clients that do not support it.
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        try:
+            if size_bytes >= self.multipart_threshold:
+                self._upload_multipart(object_key, file_bytes, extra_args)
+            else:
+                # S3 checks the body against ChecksumSHA256, and If-None-Match
+                # makes the write fail instead of replacing an existing object.
+                self.client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    Body=file_bytes,
+                    ChecksumSHA256=base64.b64encode(digest).decode("ascii"),
+                    IfNoneMatch="*",
+                    **extra_args,
+                )
+        except ClientError as exc:
+            if _s3_error_code(exc) in _S3_COLLISION_CODES:
+                raise EvidenceStorageCollision(
+                    "Evidence object already exists"
+                ) from exc
+            raise EvidenceStorageError("Failed to store evidence in S3") from exc
+        except BotoCoreError as exc:
+            raise EvidenceStorageError("Failed to store evidence in S3") from exc
+
+        return {
+            "object_key": object_key,
+            "sha256": sha256,
+            "size_bytes": size_bytes,
+            "content_type": content_type,
+        }
+
+    def _upload_multipart(
+        self, object_key: str, body: bytes, extra_args: dict[str, str]
+    ) -> None:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            ChecksumAlgorithm="SHA256",
+            **extra_args,
+        )["UploadId"]
+        view = memoryview(body)
+        offsets = range(0, len(body), self.part_bytes)
+
+        def upload_part(part_number: int, offset: int) -> dict[str, str | int]:
+            # Each part is hashed on the thread that sends it, so checksums
+            # are computed in parallel with the other parts' transfers.
+            part = bytes(view[offset : offset + self.part_bytes])
+            checksum = _b64_sha256(part)
+            response = self.client.upload_part(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=part,
+                ChecksumSHA256=checksum,
+            )
+            return {
+                "PartNumber": part_number,
+                "ETag": response["ETag"],
+                "ChecksumSHA256": checksum,
+            }
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.upload_concurrency, len(offsets)),
+                thread_name_prefix="s3-upload",
+            ) as pool:
+                parts = list(
+                    pool.map(upload_part, range(1, len(offsets) + 1), offsets)
+                )
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+                IfNoneMatch="*",
+            )
+        except Exception:
+            # Parts of an abandoned upload are stored, and billed, until the
+            # upload is aborted.
+            with contextlib.suppress(BotoCoreError, ClientError):
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=object_key, UploadId=upload_id
+                )
+            raise
+
+    def open_file(self, object_key: str):
+        # The response body streams from the open connection; nothing is
+        # buffered beyond what the caller reads.
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket_name, Key=object_key
+            )
+        except ClientError as exc:
+            if _s3_error_code(exc) in _S3_MISSING_CODES:
+                raise FileNotFoundError(object_key) from exc
+            raise
+        return response["Body"]
+
+    def close(self) -> None:
+        self.client.close()
+
+    def generate_signed_download_url(
+        self,
+        object_key: str,
+        filename: str,
+        ttl_seconds: int,
+    ) -> str:
+        safe_filename = _sanitize_filename(filename)
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket_name,
+                "Key": object_key,
+                "ResponseContentDisposition": (
+                    f'attachment; filename="{safe_filename}"'
+                ),
+            },
+            ExpiresIn=ttl_seconds,
+        )
+
+    def stat_file(self, object_key: str) -> dict[str, str | int | None] | None:
+        # Size and SHA-256 as S3 recorded them, or None if nothing is stored
+        # under the key. A multipart upload has a composite checksum, which
+        # is reported as None rather than mistaken for the file digest.
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.head_object(
+                Bucket=self.bucket_name, Key=object_key, ChecksumMode="ENABLED"
+            )
+        except ClientError as exc:
+            if _s3_error_code(exc) in _S3_MISSING_CODES:
+                return None
+            raise
+        checksum = response.get("ChecksumSHA256")
+        sha256 = None
+        if checksum and "-" not in checksum:
+            sha256 = base64.b64decode(checksum).hex()
+        return {"size_bytes": response["ContentLength"], "sha256": sha256}
+
+    def generate_signed_upload_url(
+        self,
+        object_key: str,
+        ttl_seconds: int,
+        sha256: str,
+        content_type: str | None = None,
+    ) -> tuple[str, dict[str, str]]:
+        # The uploader must send the returned headers exactly as signed, so a
+        # presigned PUT can neither overwrite evidence nor store bytes that
+        # do not match the declared digest.
+        headers = {
+            "If-None-Match": "*",
+            "x-amz-checksum-sha256": base64.b64encode(
+                bytes.fromhex(sha256)
+            ).decode("ascii"),
+        }
+        params = {
+            "Bucket": self.bucket_name,
+            "Key": object_key,
+            "IfNoneMatch": headers["If-None-Match"],
+            "ChecksumSHA256": headers["x-amz-checksum-sha256"],
+        }
+        if content_type is not None:
+            params["ContentType"] = headers["Content-Type"] = content_type
+        url = self.client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=ttl_seconds
+        )
+        return url, headers
+
+
+EvidenceStorage = LocalEvidenceStorage | GcsEvidenceStorage | S3EvidenceStorage
+
+
+def build_evidence_storage(backend: str) -> EvidenceStorage:
     if backend == "gcs":
         bucket_name = get_gcs_bucket_name()
         if not bucket_name:
@@ -192,8 +761,64 @@ def get_evidence_storage() -> LocalEvidenceStorage | GcsEvidenceStorage:
             bucket_name=bucket_name,
             project_id=get_gcp_project_id(),
         )
+    if backend == "s3":
+        bucket_name = get_s3_bucket_name()
+        if not bucket_name:
+            raise EvidenceStorageError("S3_BUCKET_NAME is required")
+        return S3EvidenceStorage(
+            bucket_name=bucket_name,
+            endpoint_url=get_s3_endpoint_url(),
+            region_name=get_s3_region(),
+        )
     if backend != "local":
         raise EvidenceStorageError(
             f"Unsupported evidence storage backend: {backend}"
         )
     return LocalEvidenceStorage()
+
+
+_STORAGES: dict[tuple, EvidenceStorage] = {}
+_STORAGES_LOCK = threading.Lock()
+
+
+def _storage_settings(backend: str) -> tuple:
+    # Everything that decides which bucket, endpoint or directory an instance
+    # talks to. A change gives a new instance instead of a stale cached one.
+    if backend == "gcs":
+        return (backend, get_gcs_bucket_name(), get_gcp_project_id())
+    if backend == "s3":
+        return (backend, get_s3_bucket_name(), get_s3_endpoint_url(), get_s3_region())
+    return (
+        backend,
+        os.getenv("EVIDENCE_LOCAL_ROOT", ".evidence_data"),
+        get_evidence_local_durability(),
+        get_evidence_compression(),
+    )
+
+
+def get_evidence_storage(backend: str | None = None) -> EvidenceStorage:
+    # Storage objects hold authenticated clients and connection pools, so
+    # they are built once per process and shared by every thread. They are
+    # closed by clear_evidence_storages() on shutdown.
+    settings = _storage_settings(backend or get_evidence_storage_backend())
+    storage = _STORAGES.get(settings)
+    if storage is None:
+        with _STORAGES_LOCK:
+            storage = _STORAGES.get(settings)
+            if storage is None:
+                storage = build_evidence_storage(settings[0])
+                _STORAGES[settings] = storage
+    return storage
+
+
+def clear_evidence_storages(close: bool = True) -> None:
+    with _STORAGES_LOCK:
+        storages = list(_STORAGES.values())
+        _STORAGES.clear()
+    if not close:
+        return
+    for storage in storages:
+        try:
+            storage.close()
+        except Exception:
+            logger.warning("Failed to close %s evidence storage", storage.backend)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import argparse
+import codecs
+import csv
+import io
+import sys
+import zipfile
+from pathlib import PurePath
+from typing import BinaryIO
+from uuid import UUID
+from xml.etree import ElementTree
+
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import to_tsvector
+from sqlalchemy.orm import Session
+
+from app.db.models import EvidenceItem, Job
+from app.services.evidence_storage import (
+    LocalEvidenceStorage,
+    get_evidence_storage,
+    open_decoded_file,
+)
+from app.services.jobs import EXECUTOR_PROCESS, JobError, enqueue_job, job_handler
+
+EXTRACT_TEXT_JOB = "evidence.extract_text"
+# to_tsvector rejects documents whose lexemes and positions exceed 1MB;
+# half a million characters keeps well clear of that for prose and logs.
+EVIDENCE_TEXT_MAX_CHARS = 500_000
+READ_CHUNK_BYTES = 64 * 1024
+
+_FORMATS_BY_SUFFIX = {
+    ".txt": "text",
+    ".log": "text",
+    ".md": "text",
+    ".csv": "csv",
+    ".docx": "docx",
+    ".pdf": "pdf",
+}
+_FORMATS_BY_CONTENT_TYPE = {
+    "text/plain": "text",
+    "text/csv": "csv",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (
+        "docx"
+    ),
+}
+_DOCX_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class EvidenceTextError(RuntimeError):
+    pass
+
+
+class _TextBuffer:
+    def __init__(self, max_chars: int) -> None:
+        self.parts: list[str] = []
+        self.remaining = max_chars
+
+    @property
+    def full(self) -> bool:
+        return self.remaining <= 0
+
+    def add(self, text: str) -> None:
+        if self.full or not text:
+            return
+        text = text[: self.remaining]
+        self.parts.append(text)
+        self.remaining -= len(text)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def detect_text_format(
+    filename: str | None, content_type: str | None
+) -> str | None:
+    suffix = PurePath(filename or "").suffix.lower()
+    if suffix in _FORMATS_BY_SUFFIX:
+        return _FORMATS_BY_SUFFIX[suffix]
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return _FORMATS_BY_CONTENT_TYPE.get(media_type)
+
+
+def _extract_plain_text(handle: BinaryIO, buffer: _TextBuffer) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while not buffer.full:
+        chunk = handle.read(READ_CHUNK_BYTES)
+        if not chunk:
+            buffer.add(decoder.decode(b"", final=True))
+            return
+        buffer.add(decoder.decode(chunk))
+
+
+def _extract_csv_text(handle: BinaryIO, buffer: _TextBuffer) -> None:
+    text_stream = io.TextIOWrapper(
+        handle, encoding="utf-8", errors="replace", newline=""
+    )
+    try:
+        for row in csv.reader(text_stream):
+            buffer.add(" ".join(cell for cell in row if cell) + "\n")
+            if buffer.full:
+                return
+    finally:
+        # Leave the underlying file for the caller to close.
+        text_stream.detach()
+
+
+def _extract_docx_text(handle: BinaryIO, buffer: _TextBuffer) -> None:
+    try:
+        archive = zipfile.ZipFile(handle)
+        document = archive.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as exc:
+        raise EvidenceTextError("Not a readable DOCX document") from exc
+
+    # iterparse streams the XML so large documents are never held as a tree.
+    with archive, document:
+        try:
+            for _, element in ElementTree.iterparse(document, events=("end",)):
+                if element.tag == f"{_DOCX_NAMESPACE}t":
+                    buffer.add(element.text or "")
+                elif element.tag == f"{_DOCX_NAMESPACE}p":
+                    buffer.add("\n")
+                    element.clear()
+                if buffer.full:
+                    return
+        except ElementTree.ParseError as exc:
+            raise EvidenceTextError("Not a readable DOCX document") from exc
+
+
+def _extract_pdf_text(handle: BinaryIO, buffer: _TextBuffer) -> None:
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError as exc:
+        # A deployment problem rather than a bad file: fail the job so it
+        # shows up instead of quietly marking the item as unreadable.
+        raise JobError("pypdf is required to extract PDF text") from exc
+
+    try:
+        reader = PdfReader(handle)
+        for page in reader.pages:
+            buffer.add((page.extract_text() or "") + "\n")
+            if buffer.full:
+                return
+    except PdfReadError as exc:
+        raise EvidenceTextError("Not a readable PDF document") from exc
+
+
+_EXTRACTORS = {
+    "text": _extract_plain_text,
+    "csv": _extract_csv_text,
+    "docx": _extract_docx_text,
+    "pdf": _extract_pdf_text,
+}
+
+
+def extract_text(
+    handle: BinaryIO, text_format: str, max_chars: int = EVIDENCE_TEXT_MAX_CHARS
+) -> str:
+    buffer = _TextBuffer(max_chars)
+    _EXTRACTORS[text_format](handle, buffer)
+    # NUL bytes are not allowed in Postgres text values.
+    return buffer.text().replace("\x00", "")
+
+
+def enqueue_evidence_text_extraction(
+    db: Session, evidence: EvidenceItem
+) -> Job | None:
+    if evidence.storage_backend != LocalEvidenceStorage.backend:
+        return None
+    if detect_text_format(evidence.original_filename, evidence.content_type) is None:
+        return None
+    return enqueue_job(
+        db,
+        EXTRACT_TEXT_JOB,
+        {"evidence_id": str(evidence.id)},
+        organisation_id=evidence.organisation_id,
+    )
+
+
+@job_handler(EXTRACT_TEXT_JOB, executor=EXECUTOR_PROCESS)
+def extract_evidence_text_job(
+    organisation_id: UUID | None, payload: dict
+) -> dict[str, int | bool | str]:
+    from app.db.session import SessionLocal
+
+    evidence_id = UUID(payload["evidence_id"])
+    with SessionLocal() as db:
+        evidence = db.get(EvidenceItem, evidence_id)
+        if evidence is None or evidence.organisation_id != organisation_id:
+            raise JobError("Evidence item not found")
+        object_key = evidence.object_key
+        content_encoding = evidence.content_encoding
+        storage_backend = evidence.storage_backend
+        text_format = detect_text_format(
+            evidence.original_filename, evidence.content_type
+        )
+    if (
+        not object_key
+        or storage_backend != LocalEvidenceStorage.backend
+        or text_format is None
+    ):
+        return {"indexed": False}
+
+    # Parse with no database connection checked out; large PDFs can take a
+    # while and the pool is shared with the rest of the worker.
+    try:
+        with open_decoded_file(
+            get_evidence_storage(LocalEvidenceStorage.backend),
+            object_key,
+            content_encoding,
+        ) as handle:
+            text = extract_text(handle, text_format)
+    except EvidenceTextError as exc:
+        # Retrying will not make a corrupt file readable; record that it was
+        # looked at so the backfill command skips it.
+        content_vector = None
+        result = {"indexed": False, "error": str(exc)}
+    else:
+        content_vector = func.setweight(
+            to_tsvector("english", text), literal_column("'D'")
+        )
+        result = {"indexed": True, "characters": len(text)}
+
+    with SessionLocal() as db:
+        db.execute(
+            update(EvidenceItem)
+            .where(EvidenceItem.id == evidence_id)
+            .values(content_vector=content_vector, content_indexed_at=func.now())
+        )
+        db.commit()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.evidence_text",
+        description="Queue text extraction for evidence that has not been indexed.",
+    )
+    parser.add_argument("--organisation-id", type=UUID, default=None)
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        statement = select(EvidenceItem).where(
+            EvidenceItem.content_indexed_at.is_(None),
+            EvidenceItem.object_key.is_not(None),
+        )
+        if args.organisation_id is not None:
+            statement = statement.where(
+                EvidenceItem.organisation_id == args.organisation_id
+            )
+        queued = 0
+        for evidence in db.execute(statement).scalars():
+            if enqueue_evidence_text_extraction(db, evidence) is not None:
+                queued += 1
+        db.commit()
+    print(f"Queued text extraction for {queued} evidence items.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
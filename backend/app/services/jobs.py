@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Job
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 3600.0
+MAX_ERROR_LENGTH = 2000
+
+# Modules that register handlers with @job_handler. Process-pool workers
+# import these on first use, so handlers must be module-level functions.
+JOB_HANDLER_MODULES = (
+    "app.services.evidence_integrity",
+    "app.services.evidence_text",
+    "app.services.org_metrics",
+    "app.services.risk_heatmap",
+)
+
+JobHandler = Callable[[UUID | None, dict[str, Any]], dict[str, Any] | None]
+
+
+@dataclass(frozen=True)
+class RegisteredJob:
+    handler: JobHandler
+    executor: str
+
+
+_handlers: dict[str, RegisteredJob] = {}
+_handler_modules_loaded = False
+
+
+class JobError(RuntimeError):
+    pass
+
+
+def job_handler(
+    kind: str, executor: str = EXECUTOR_THREAD
+) -> Callable[[JobHandler], JobHandler]:
+    # Thread executors suit I/O- and database-bound work; CPU-bound work
+    # (hashing, parsing) should use the process pool to sidestep the GIL.
+    if executor not in {EXECUTOR_THREAD, EXECUTOR_PROCESS}:
+        raise ValueError(f"Unknown job executor: {executor}")
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = RegisteredJob(handler, executor)
+        return handler
+
+    return register
+
+
+def load_job_handlers() -> dict[str, RegisteredJob]:
+    global _handler_modules_loaded
+    if not _handler_modules_loaded:
+        for module_name in JOB_HANDLER_MODULES:
+            importlib.import_module(module_name)
+        _handler_modules_loaded = True
+    return _handlers
+
+
+def get_job_handler(kind: str) -> RegisteredJob:
+    registered = load_job_handlers().get(kind)
+    if registered is None:
+        raise JobError(f"No handler registered for job kind: {kind}")
+    return registered
+
+
+def execute_job(
+    kind: str, organisation_id: UUID | None, payload: dict[str, Any]
+) -> dict[str, Any] | None:
+    # Entry point for both executors; it is what gets pickled for the
+    # process pool, so it looks the handler up again on the far side.
+    return get_job_handler(kind).handler(organisation_id, payload)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    organisation_id: UUID | None = None,
+    priority: int = 0,
+    run_at: datetime | None = None,
+    max_attempts: int = 3,
+) -> Job:
+    # Added to the caller's transaction: the job only becomes visible to
+    # workers if the surrounding write commits.
+    job = Job(
+        organisation_id=organisation_id,
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts,
+    )
+    if run_at is not None:
+        job.run_at = run_at
+    db.add(job)
+    return job
+
+
+def claim_jobs(
+    db: Session,
+    kinds: list[str],
+    limit: int,
+    worker_id: str,
+    lease_seconds: int,
+) -> list[Job]:
+    if not kinds or limit <= 0:
+        return []
+    now = datetime.now(timezone.utc)
+    jobs = (
+        db.execute(
+            select(Job)
+            .where(
+                Job.status == JOB_QUEUED,
+                Job.run_at <= now,
+                Job.kind.in_(kinds),
+            )
+            .order_by(Job.priority.desc(), Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    for job in jobs:
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_until = now + timedelta(seconds=lease_seconds)
+    db.commit()
+    return list(jobs)
+
+
+def extend_job_leases(
+    db: Session, job_ids: list[UUID], worker_id: str, lease_seconds: int
+) -> None:
+    if not job_ids:
+        return
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.locked_by == worker_id)
+        .values(
+            locked_until=datetime.now(timezone.utc)
+            + timedelta(seconds=lease_seconds)
+        )
+    )
+    db.commit()
+
+
+def _retry_delay_seconds(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _release_failed_job(job: Job, error: str, now: datetime) -> None:
+    job.last_error = error[:MAX_ERROR_LENGTH]
+    job.locked_by = None
+    job.locked_until = None
+    if job.attempts >= job.max_attempts:
+        job.status = JOB_FAILED
+        job.finished_at = now
+    else:
+        job.status = JOB_QUEUED
+        job.run_at = now + timedelta(seconds=_retry_delay_seconds(job.attempts))
+
+
+def _lock_owned_job(db: Session, job_id: UUID, worker_id: str) -> Job | None:
+    # A worker whose lease expired may finish after the job was requeued and
+    # claimed again; only the current holder may record the outcome.
+    return (
+        db.execute(
+            select(Job)
+            .where(
+                Job.id == job_id,
+                Job.status == JOB_RUNNING,
+                Job.locked_by == worker_id,
+            )
+            .with_for_update()
+        )
+        .scalars()
+        .first()
+    )
+
+
+def complete_job(
+    db: Session, job_id: UUID, worker_id: str, result: dict[str, Any] | None
+) -> bool:
+    job = _lock_owned_job(db, job_id, worker_id)
+    if job is None:
+        return False
+    job.status = JOB_SUCCEEDED
+    job.result = result
+    job.last_error = None
+    job.locked_by = None
+    job.locked_until = None
+    job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return True
+
+
+def fail_job(db: Session, job_id: UUID, worker_id: str, error: str) -> bool:
+    job = _lock_owned_job(db, job_id, worker_id)
+    if job is None:
+        return False
+    _release_failed_job(job, error, datetime.now(timezone.utc))
+    db.commit()
+    return True
+
+
+def requeue_expired_jobs(db: Session) -> int:
+    # A job whose lease ran out belongs to a worker that died or hung; the
+    # attempt it used still counts towards max_attempts.
+    now = datetime.now(timezone.utc)
+    jobs = (
+        db.execute(
+            select(Job)
+            .where(Job.status == JOB_RUNNING, Job.locked_until < now)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    for job in jobs:
+        _release_failed_job(job, "Job lease expired", now)
+    db.commit()
+    return len(jobs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.jobs",
+        description="Enqueue a background job for app.worker.",
+    )
+    parser.add_argument("kind")
+    parser.add_argument("--organisation-id", type=UUID, default=None)
+    parser.add_argument("--priority", type=int, default=0)
+    parser.add_argument(
+        "--delay-seconds",
+        type=int,
+        default=0,
+        help="Schedule the job this many seconds from now.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.kind not in load_job_handlers():
+        parser.error(f"no handler registered for job kind: {args.kind}")
+
+    from app.db.session import SessionLocal
+
+    run_at = None
+    if args.delay_seconds:
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=args.delay_seconds)
+    with SessionLocal() as db:
+        job = enqueue_job(
+            db,
+            args.kind,
+            organisation_id=args.organisation_id,
+            priority=args.priority,
+            run_at=run_at,
+        )
+        db.commit()
+        print(f"Enqueued {args.kind} job {job.id}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
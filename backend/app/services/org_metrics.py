@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import uuid
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    ControlVersion,
+    Incident,
+    IncidentVersion,
+    OrgMetric,
+    RiskVersion,
+)
+from app.schemas.organisation import (
+    ControlMetricsOut,
+    IncidentMetricsOut,
+    OrganisationMetricsOut,
+    RiskMetricsOut,
+)
+from app.services.jobs import job_handler
+
+RISK_COUNT = "risk.count"
+RISK_SCORE_TOTAL = "risk.score_total"
+RISK_BY_STATUS = "risk.by_status"
+CONTROL_COUNT = "control.count"
+CONTROL_BY_STATUS = "control.by_status"
+INCIDENT_COUNT = "incident.count"
+INCIDENT_BY_STATUS = "incident.by_status"
+INCIDENT_OPEN_BY_SEVERITY = "incident.open_by_severity"
+
+CLOSED_INCIDENT_STATUSES = {"closed", "resolved"}
+
+MetricKey = tuple[str, str]
+OrgMetricKey = tuple[UUID, str, str]
+
+
+def _risk_contribution(version: RiskVersion) -> Counter[MetricKey]:
+    return Counter(
+        {
+            (RISK_COUNT, ""): 1,
+            (RISK_SCORE_TOTAL, ""): version.likelihood * version.impact,
+            (RISK_BY_STATUS, version.status): 1,
+        }
+    )
+
+
+def _control_contribution(version: ControlVersion) -> Counter[MetricKey]:
+    return Counter(
+        {
+            (CONTROL_COUNT, ""): 1,
+            (CONTROL_BY_STATUS, version.status): 1,
+        }
+    )
+
+
+def _incident_contribution(version: IncidentVersion) -> Counter[MetricKey]:
+    contribution = Counter(
+        {
+            (INCIDENT_COUNT, ""): 1,
+            (INCIDENT_BY_STATUS, version.status): 1,
+        }
+    )
+    if version.status.lower() not in CLOSED_INCIDENT_STATUSES:
+        contribution[(INCIDENT_OPEN_BY_SEVERITY, version.severity)] += 1
+    return contribution
+
+
+def _apply_deltas(
+    db: Session, organisation_id: UUID, deltas: Counter[MetricKey]
+) -> None:
+    # Upsert in a stable order so concurrent writers cannot deadlock.
+    for metric, dimension in sorted(key for key, delta in deltas.items() if delta):
+        delta = deltas[(metric, dimension)]
+        statement = pg_insert(OrgMetric).values(
+            id=uuid.uuid4(),
+            organisation_id=organisation_id,
+            metric=metric,
+            dimension=dimension,
+            value=max(delta, 0),
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_org_metric_organisation_id_metric_dimension",
+                set_={
+                    "value": func.greatest(OrgMetric.value + delta, 0),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+def _transition(previous: Counter[MetricKey], current: Counter[MetricKey]):
+    deltas = Counter(current)
+    deltas.subtract(previous)
+    return deltas
+
+
+def apply_risk_metrics_change(
+    db: Session,
+    organisation_id: UUID,
+    previous: RiskVersion | None,
+    current: RiskVersion,
+) -> None:
+    previous_contribution = (
+        _risk_contribution(previous) if previous is not None else Counter()
+    )
+    _apply_deltas(
+        db,
+        organisation_id,
+        _transition(previous_contribution, _risk_contribution(current)),
+    )
+
+
+def apply_control_metrics_change(
+    db: Session,
+    organisation_id: UUID,
+    previous: ControlVersion | None,
+    current: ControlVersion,
+) -> None:
+    previous_contribution = (
+        _control_contribution(previous) if previous is not None else Counter()
+    )
+    _apply_deltas(
+        db,
+        organisation_id,
+        _transition(previous_contribution, _control_contribution(current)),
+    )
+
+
+def apply_incident_metrics_change(
+    db: Session,
+    organisation_id: UUID,
+    previous: IncidentVersion | None,
+    current: IncidentVersion,
+) -> None:
+    previous_contribution = (
+        _incident_contribution(previous) if previous is not None else Counter()
+    )
+    _apply_deltas(
+        db,
+        organisation_id,
+        _transition(previous_contribution, _incident_contribution(current)),
+    )
+
+
+def get_organisation_metrics(
+    db: Session, organisation_id: UUID
+) -> OrganisationMetricsOut:
+    rows = db.execute(
+        select(OrgMetric.metric, OrgMetric.dimension, OrgMetric.value).where(
+            OrgMetric.organisation_id == organisation_id
+        )
+    ).all()
+    values: dict[str, dict[str, int]] = {}
+    for metric, dimension, value in rows:
+        if value:
+            values.setdefault(metric, {})[dimension] = int(value)
+
+    risk_count = values.get(RISK_COUNT, {}).get("", 0)
+    risk_score_total = values.get(RISK_SCORE_TOTAL, {}).get("", 0)
+    return OrganisationMetricsOut(
+        organisation_id=organisation_id,
+        risks=RiskMetricsOut(
+            count=risk_count,
+            average_score=(
+                round(risk_score_total / risk_count, 2) if risk_count else None
+            ),
+            by_status=values.get(RISK_BY_STATUS, {}),
+        ),
+        controls=ControlMetricsOut(
+            count=values.get(CONTROL_COUNT, {}).get("", 0),
+            by_status=values.get(CONTROL_BY_STATUS, {}),
+        ),
+        incidents=IncidentMetricsOut(
+            count=values.get(INCIDENT_COUNT, {}).get("", 0),
+            by_status=values.get(INCIDENT_BY_STATUS, {}),
+            open_by_severity=values.get(INCIDENT_OPEN_BY_SEVERITY, {}),
+        ),
+    )
+
+
+def compute_org_metrics(
+    db: Session, organisation_id: UUID | None = None
+) -> Counter[OrgMetricKey]:
+    expected: Counter[OrgMetricKey] = Counter()
+
+    latest_risks = (
+        select(
+            RiskVersion.risk_id,
+            func.max(RiskVersion.version).label("max_version"),
+        )
+        .group_by(RiskVersion.risk_id)
+        .subquery()
+    )
+    risk_query = (
+        select(
+            RiskVersion.organisation_id,
+            RiskVersion.status,
+            func.count(),
+            func.sum(RiskVersion.likelihood * RiskVersion.impact),
+        )
+        .join(
+            latest_risks,
+            (RiskVersion.risk_id == latest_risks.c.risk_id)
+            & (RiskVersion.version == latest_risks.c.max_version),
+        )
+        .group_by(RiskVersion.organisation_id, RiskVersion.status)
+    )
+    latest_controls = (
+        select(
+            ControlVersion.control_id,
+            func.max(ControlVersion.version).label("max_version"),
+        )
+        .group_by(ControlVersion.control_id)
+        .subquery()
+    )
+    control_query = (
+        select(ControlVersion.organisation_id, ControlVersion.status, func.count())
+        .join(
+            latest_controls,
+            (ControlVersion.control_id == latest_controls.c.control_id)
+            & (ControlVersion.version == latest_controls.c.max_version),
+        )
+        .group_by(ControlVersion.organisation_id, ControlVersion.status)
+    )
+    incident_query = (
+        select(
+            IncidentVersion.organisation_id,
+            IncidentVersion.status,
+            IncidentVersion.severity,
+            func.count(),
+        )
+        .join(
+            Incident,
+            (Incident.id == IncidentVersion.incident_id)
+            & (Incident.latest_version == IncidentVersion.version),
+        )
+        .group_by(
+            IncidentVersion.organisation_id,
+            IncidentVersion.status,
+            IncidentVersion.severity,
+        )
+    )
+    if organisation_id is not None:
+        risk_query = risk_query.where(RiskVersion.organisation_id == organisation_id)
+        control_query = control_query.where(
+            ControlVersion.organisation_id == organisation_id
+        )
+        incident_query = incident_query.where(
+            IncidentVersion.organisation_id == organisation_id
+        )
+
+    for org_id, status, count, score_total in db.execute(risk_query):
+        expected[(org_id, RISK_COUNT, "")] += count
+        expected[(org_id, RISK_SCORE_TOTAL, "")] += score_total
+        expected[(org_id, RISK_BY_STATUS, status)] += count
+    for org_id, status, count in db.execute(control_query):
+        expected[(org_id, CONTROL_COUNT, "")] += count
+        expected[(org_id, CONTROL_BY_STATUS, status)] += count
+    for org_id, status, severity, count in db.execute(incident_query):
+        expected[(org_id, INCIDENT_COUNT, "")] += count
+        expected[(org_id, INCIDENT_BY_STATUS, status)] += count
+        if status.lower() not in CLOSED_INCIDENT_STATUSES:
+            expected[(org_id, INCIDENT_OPEN_BY_SEVERITY, severity)] += count
+
+    return expected
+
+
+def verify_org_metrics(
+    db: Session, organisation_id: UUID | None = None
+) -> dict[OrgMetricKey, tuple[int, int]]:
+    expected = compute_org_metrics(db, organisation_id)
+    stored_query = select(
+        OrgMetric.organisation_id,
+        OrgMetric.metric,
+        OrgMetric.dimension,
+        OrgMetric.value,
+    )
+    if organisation_id is not None:
+        stored_query = stored_query.where(
+            OrgMetric.organisation_id == organisation_id
+        )
+    stored: Counter[OrgMetricKey] = Counter()
+    for org_id, metric, dimension, value in db.execute(stored_query):
+        stored[(org_id, metric, dimension)] = value
+
+    return {
+        key: (stored[key], expected[key])
+        for key in set(stored) | set(expected)
+        if stored[key] != expected[key]
+    }
+
+
+def rebuild_org_metrics(
+    db: Session, organisation_id: UUID | None = None
+) -> int:
+    # Writers upsert under ROW EXCLUSIVE; holding EXCLUSIVE makes them wait
+    # until the rebuilt rows are committed, so no delta is lost.
+    db.execute(text("LOCK TABLE org_metric IN EXCLUSIVE MODE"))
+    expected = compute_org_metrics(db, organisation_id)
+
+    delete_statement = delete(OrgMetric)
+    if organisation_id is not None:
+        delete_statement = delete_statement.where(
+            OrgMetric.organisation_id == organisation_id
+        )
+    db.execute(delete_statement)
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "organisation_id": org_id,
+            "metric": metric,
+            "dimension": dimension,
+            "value": value,
+        }
+        for (org_id, metric, dimension), value in expected.items()
+        if value
+    ]
+    if rows:
+        db.execute(insert(OrgMetric), rows)
+    return len(rows)
+
+
+@job_handler("org_metrics.rebuild")
+def rebuild_org_metrics_job(
+    organisation_id: UUID | None, payload: dict
+) -> dict[str, int]:
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        row_count = rebuild_org_metrics(db, organisation_id)
+        db.commit()
+    return {"row_count": row_count}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.org_metrics",
+        description="Verify or rebuild the org_metric rollup table.",
+    )
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--organisation-id", type=UUID, default=None)
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            row_count = rebuild_org_metrics(db, args.organisation_id)
+            db.commit()
+            print(f"Rebuilt org_metric with {row_count} rows.")
+            return 0
+
+        mismatches = verify_org_metrics(db, args.organisation_id)
+        for (org_id, metric, dimension), (stored, expected) in sorted(
+            mismatches.items(), key=lambda item: tuple(map(str, item[0]))
+        ):
+            print(
+                f"{org_id} {metric}[{dimension}]: "
+                f"stored={stored} expected={expected}"
+            )
+        if mismatches:
+            print(f"{len(mismatches)} org_metric rows differ.")
+            return 1
+        print("org_metric is consistent.")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
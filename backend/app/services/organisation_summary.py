@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import get_org_summary_cache_seconds
+from app.db.models import (
+    ControlVersion,
+    EvidenceItem,
+    Incident,
+    IncidentVersion,
+    RiskHeatmapCell,
+)
+from app.schemas.organisation import (
+    EvidenceCountsOut,
+    OrganisationSummaryOut,
+    StatusCountsOut,
+)
+
+_SUMMARY_CACHE: dict[UUID, dict[str, Any]] = {}
+
+
+def get_organisation_summary(
+    db: Session, organisation_id: UUID
+) -> OrganisationSummaryOut:
+    now = time.monotonic()
+    cache_entry = _SUMMARY_CACHE.get(organisation_id)
+    if cache_entry and cache_entry["expires_at"] > now:
+        return cache_entry["summary"]
+
+    summary = _load_organisation_summary(db, organisation_id)
+    cache_seconds = get_org_summary_cache_seconds()
+    if cache_seconds > 0:
+        _SUMMARY_CACHE[organisation_id] = {
+            "expires_at": now + cache_seconds,
+            "summary": summary,
+        }
+    return summary
+
+
+def invalidate_organisation_summary(organisation_id: UUID) -> None:
+    _SUMMARY_CACHE.pop(organisation_id, None)
+
+
+def clear_organisation_summary_cache() -> None:
+    _SUMMARY_CACHE.clear()
+
+
+def _load_organisation_summary(
+    db: Session, organisation_id: UUID
+) -> OrganisationSummaryOut:
+    latest_control_versions = (
+        select(
+            ControlVersion.control_id,
+            func.max(ControlVersion.version).label("max_version"),
+        )
+        .where(ControlVersion.organisation_id == organisation_id)
+        .group_by(ControlVersion.control_id)
+        .subquery()
+    )
+
+    # Risk counts come from the maintained heatmap cells rather than a
+    # scan of risk_version.
+    risk_counts = (
+        select(
+            literal("risk").label("entity"),
+            RiskHeatmapCell.status.label("bucket"),
+            func.sum(RiskHeatmapCell.risk_count).label("count"),
+        )
+        .where(RiskHeatmapCell.organisation_id == organisation_id)
+        .group_by(RiskHeatmapCell.status)
+    )
+    control_counts = (
+        select(
+            literal("control").label("entity"),
+            ControlVersion.status.label("bucket"),
+            func.count().label("count"),
+        )
+        .join(
+            latest_control_versions,
+            (ControlVersion.control_id == latest_control_versions.c.control_id)
+            & (ControlVersion.version == latest_control_versions.c.max_version),
+        )
+        .group_by(ControlVersion.status)
+    )
+    incident_counts = (
+        select(
+            literal("incident").label("entity"),
+            IncidentVersion.status.label("bucket"),
+            func.count().label("count"),
+        )
+        .join(
+            Incident,
+            (Incident.id == IncidentVersion.incident_id)
+            & (Incident.latest_version == IncidentVersion.version),
+        )
+        .where(Incident.organisation_id == organisation_id)
+        .group_by(IncidentVersion.status)
+    )
+    evidence_counts = (
+        select(
+            literal("evidence").label("entity"),
+            EvidenceItem.evidence_type.label("bucket"),
+            func.count().label("count"),
+        )
+        .where(EvidenceItem.organisation_id == organisation_id)
+        .group_by(EvidenceItem.evidence_type)
+    )
+
+    buckets: dict[str, dict[str, int]] = {
+        "risk": {},
+        "control": {},
+        "incident": {},
+        "evidence": {},
+    }
+    rows = db.execute(
+        union_all(risk_counts, control_counts, incident_counts, evidence_counts)
+    ).all()
+    for entity, bucket, count in rows:
+        if count:
+            buckets[entity][bucket] = int(count)
+
+    return OrganisationSummaryOut(
+        organisation_id=organisation_id,
+        risks=_status_counts(buckets["risk"]),
+        controls=_status_counts(buckets["control"]),
+        incidents=_status_counts(buckets["incident"]),
+        evidence=EvidenceCountsOut(
+            total=sum(buckets["evidence"].values()),
+            by_type=buckets["evidence"],
+        ),
+    )
+
+
+def _status_counts(counts: dict[str, int]) -> StatusCountsOut:
+    return StatusCountsOut(total=sum(counts.values()), by_status=counts)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+from collections.abc import Iterator
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import ControlVersion, RiskControlLink, RiskVersion
+from app.schemas.risk import (
+    RiskControlMatrixControlOut,
+    RiskControlMatrixOut,
+    RiskControlMatrixRiskOut,
+)
+
+EXPORT_COLUMNS = [
+    "risk_id",
+    "risk_title",
+    "risk_status",
+    "risk_score",
+    "control_id",
+    "control_code",
+    "control_title",
+    "control_status",
+]
+CSV_ROWS_PER_CHUNK = 500
+XLSX_CHUNK_BYTES = 64 * 1024
+# Spreadsheet applications evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def load_risk_control_matrix(
+    db: Session, organisation_id: UUID
+) -> RiskControlMatrixOut:
+    latest_risks = (
+        select(
+            RiskVersion.risk_id,
+            func.max(RiskVersion.version).label("max_version"),
+        )
+        .where(RiskVersion.organisation_id == organisation_id)
+        .group_by(RiskVersion.risk_id)
+        .subquery()
+    )
+    risk_positions = (
+        select(
+            RiskVersion.risk_id,
+            RiskVersion.title,
+            RiskVersion.status,
+            (RiskVersion.likelihood * RiskVersion.impact).label("score"),
+            (
+                func.row_number().over(
+                    order_by=(RiskVersion.title, RiskVersion.risk_id)
+                )
+                - 1
+            ).label("position"),
+        )
+        .join(
+            latest_risks,
+            (RiskVersion.risk_id == latest_risks.c.risk_id)
+            & (RiskVersion.version == latest_risks.c.max_version),
+        )
+        .subquery()
+    )
+
+    latest_controls = (
+        select(
+            ControlVersion.control_id,
+            func.max(ControlVersion.version).label("max_version"),
+        )
+        .where(ControlVersion.organisation_id == organisation_id)
+        .group_by(ControlVersion.control_id)
+        .subquery()
+    )
+    control_positions = (
+        select(
+            ControlVersion.control_id,
+            ControlVersion.control_code,
+            ControlVersion.title,
+            ControlVersion.status,
+            (
+                func.row_number().over(
+                    order_by=(ControlVersion.control_code, ControlVersion.control_id)
+                )
+                - 1
+            ).label("position"),
+        )
+        .join(
+            latest_controls,
+            (ControlVersion.control_id == latest_controls.c.control_id)
+            & (ControlVersion.version == latest_controls.c.max_version),
+        )
+        .subquery()
+    )
+
+    risk_rows = db.execute(
+        select(
+            risk_positions.c.risk_id,
+            risk_positions.c.title,
+            risk_positions.c.status,
+            risk_positions.c.score,
+        ).order_by(risk_positions.c.position)
+    ).all()
+    control_rows = db.execute(
+        select(
+            control_positions.c.control_id,
+            control_positions.c.control_code,
+            control_positions.c.title,
+            control_positions.c.status,
+        ).order_by(control_positions.c.position)
+    ).all()
+    # Positions are resolved in the database so the link scan returns
+    # integer pairs rather than ids that need mapping in Python.
+    link_rows = db.execute(
+        select(risk_positions.c.position, control_positions.c.position)
+        .select_from(RiskControlLink)
+        .join(
+            risk_positions,
+            risk_positions.c.risk_id == RiskControlLink.risk_id,
+        )
+        .join(
+            control_positions,
+            control_positions.c.control_id == RiskControlLink.control_id,
+        )
+        .where(RiskControlLink.organisation_id == organisation_id)
+        .order_by(risk_positions.c.position, control_positions.c.position)
+    ).all()
+
+    return RiskControlMatrixOut(
+        risks=[
+            RiskControlMatrixRiskOut(
+                risk_id=risk_id, title=title, status=status, score=score
+            )
+            for risk_id, title, status, score in risk_rows
+        ],
+        controls=[
+            RiskControlMatrixControlOut(
+                control_id=control_id,
+                control_code=control_code,
+                title=title,
+                status=status,
+            )
+            for control_id, control_code, title, status in control_rows
+        ],
+        risk_index=[risk_position for risk_position, _ in link_rows],
+        control_index=[control_position for _, control_position in link_rows],
+    )
+
+
+def _neutralise_formula(value: str) -> str:
+    # Titles and codes are user input; a leading quote makes spreadsheets
+    # show them as text instead of running them in the auditor's session.
+    if value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _export_rows(matrix: RiskControlMatrixOut) -> Iterator[list[object]]:
+    for risk_position, control_position in zip(
+        matrix.risk_index, matrix.control_index
+    ):
+        risk = matrix.risks[risk_position]
+        control = matrix.controls[control_position]
+        yield [
+            str(risk.risk_id),
+            _neutralise_formula(risk.title),
+            _neutralise_formula(risk.status),
+            risk.score,
+            str(control.control_id),
+            _neutralise_formula(control.control_code),
+            _neutralise_formula(control.title),
+            _neutralise_formula(control.status),
+        ]
+
+
+def iter_risk_control_matrix_csv(matrix: RiskControlMatrixOut) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row_number, row in enumerate(_export_rows(matrix), start=1):
+        writer.writerow(row)
+        if row_number % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def iter_risk_control_matrix_xlsx(
+    matrix: RiskControlMatrixOut,
+) -> Iterator[bytes]:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Coverage")
+    sheet.append(EXPORT_COLUMNS)
+    for row in _export_rows(matrix):
+        cells = []
+        for value in row:
+            cell = WriteOnlyCell(sheet, value=value)
+            if isinstance(value, str):
+                # openpyxl stores any string starting with "=" as a formula.
+                cell.data_type = "s"
+            cells.append(cell)
+        sheet.append(cells)
+    return _iter_workbook_bytes(workbook)
+
+
+def _iter_workbook_bytes(workbook) -> Iterator[bytes]:
+    with tempfile.TemporaryFile() as handle:
+        workbook.save(handle)
+        handle.seek(0)
+        while chunk := handle.read(XLSX_CHUNK_BYTES):
+            yield chunk
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import RiskHeatmapCell, RiskVersion
+from app.services.jobs import JobError, job_handler
+
+HeatmapKey = tuple[int, int, str, str | None]
+
+
+def _cell_key(version: RiskVersion) -> HeatmapKey:
+    return (version.likelihood, version.impact, version.status, version.category)
+
+
+def apply_risk_heatmap_change(
+    db: Session,
+    organisation_id: UUID,
+    previous: RiskVersion | None,
+    current: RiskVersion,
+) -> None:
+    deltas: Counter[HeatmapKey] = Counter()
+    if previous is not None:
+        deltas[_cell_key(previous)] -= 1
+    deltas[_cell_key(current)] += 1
+
+    # Lock cells in a stable order so concurrent writers cannot deadlock.
+    for key in sorted(
+        (key for key, delta in deltas.items() if delta),
+        key=lambda key: (key[0], key[1], key[2], key[3] or ""),
+    ):
+        likelihood, impact, status, category = key
+        delta = deltas[key]
+        statement = pg_insert(RiskHeatmapCell).values(
+            id=uuid.uuid4(),
+            organisation_id=organisation_id,
+            likelihood=likelihood,
+            impact=impact,
+            status=status,
+            category=category,
+            risk_count=max(delta, 0),
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_risk_heatmap_cell_key",
+                set_={
+                    "risk_count": func.greatest(
+                        RiskHeatmapCell.risk_count + delta, 0
+                    )
+                },
+            )
+        )
+
+
+def rebuild_risk_heatmap(db: Session, organisation_id: UUID) -> None:
+    latest_versions_subq = (
+        select(
+            RiskVersion.risk_id,
+            func.max(RiskVersion.version).label("max_version"),
+        )
+        .where(RiskVersion.organisation_id == organisation_id)
+        .group_by(RiskVersion.risk_id)
+        .subquery()
+    )
+    latest = (
+        select(
+            RiskVersion.likelihood,
+            RiskVersion.impact,
+            RiskVersion.status,
+            RiskVersion.category,
+        )
+        .join(
+            latest_versions_subq,
+            (RiskVersion.risk_id == latest_versions_subq.c.risk_id)
+            & (RiskVersion.version == latest_versions_subq.c.max_version),
+        )
+        .subquery()
+    )
+    db.execute(
+        delete(RiskHeatmapCell).where(
+            RiskHeatmapCell.organisation_id == organisation_id
+        )
+    )
+    db.execute(
+        insert(RiskHeatmapCell).from_select(
+            [
+                "id",
+                "organisation_id",
+                "likelihood",
+                "impact",
+                "status",
+                "category",
+                "risk_count",
+            ],
+            select(
+                func.gen_random_uuid(),
+                literal(organisation_id, RiskHeatmapCell.organisation_id.type),
+                latest.c.likelihood,
+                latest.c.impact,
+                latest.c.status,
+                latest.c.category,
+                func.count(),
+            ).group_by(
+                latest.c.likelihood,
+                latest.c.impact,
+                latest.c.status,
+                latest.c.category,
+            ),
+        )
+    )
+
+
+@job_handler("risk_heatmap.rebuild")
+def rebuild_risk_heatmap_job(organisation_id: UUID | None, payload: dict) -> None:
+    if organisation_id is None:
+        raise JobError("risk_heatmap.rebuild needs an organisation")
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        rebuild_risk_heatmap(db, organisation_id)
+        db.commit()
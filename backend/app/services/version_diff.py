@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_version_diff_cache_size
+from app.db.models import ControlVersion, IncidentVersion, RiskVersion
+from app.schemas.version_diff import FieldChangeOut, VersionDiffOut
+
+VersionedEntityType = Literal["risk", "control", "incident"]
+
+_VERSION_MODELS: dict[str, tuple[Any, Any]] = {
+    "risk": (RiskVersion, RiskVersion.risk_id),
+    "control": (ControlVersion, ControlVersion.control_id),
+    "incident": (IncidentVersion, IncidentVersion.incident_id),
+}
+
+DIFF_FIELDS: dict[str, tuple[str, ...]] = {
+    "risk": (
+        "title",
+        "description",
+        "category",
+        "likelihood",
+        "impact",
+        "status",
+        "owner_user_id",
+    ),
+    "control": (
+        "framework",
+        "control_code",
+        "title",
+        "description",
+        "status",
+        "owner_user_id",
+    ),
+    "incident": (
+        "title",
+        "description",
+        "severity",
+        "status",
+        "category",
+        "owner_user_id",
+    ),
+}
+
+# (entity_id, version) names a version row that is never updated, so a diff
+# between two of them can be cached indefinitely.
+DiffKey = tuple[str, UUID, int, int]
+
+_DIFF_CACHE: OrderedDict[DiffKey, VersionDiffOut] = OrderedDict()
+_DIFF_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: DiffKey) -> VersionDiffOut | None:
+    with _DIFF_CACHE_LOCK:
+        diff = _DIFF_CACHE.get(key)
+        if diff is not None:
+            _DIFF_CACHE.move_to_end(key)
+        return diff
+
+
+def _cache_put(key: DiffKey, diff: VersionDiffOut) -> None:
+    max_size = get_version_diff_cache_size()
+    if max_size <= 0:
+        return
+    with _DIFF_CACHE_LOCK:
+        _DIFF_CACHE[key] = diff
+        _DIFF_CACHE.move_to_end(key)
+        while len(_DIFF_CACHE) > max_size:
+            _DIFF_CACHE.popitem(last=False)
+
+
+def clear_version_diff_cache() -> None:
+    with _DIFF_CACHE_LOCK:
+        _DIFF_CACHE.clear()
+
+
+def _compute_diff(
+    entity_type: VersionedEntityType, older: Any | None, newer: Any
+) -> VersionDiffOut:
+    changes = []
+    for field in DIFF_FIELDS[entity_type]:
+        old_value = getattr(older, field) if older is not None else None
+        new_value = getattr(newer, field)
+        if old_value != new_value:
+            changes.append(FieldChangeOut(field=field, old=old_value, new=new_value))
+    return VersionDiffOut(
+        from_version=older.version if older is not None else None,
+        to_version=newer.version,
+        created_at=newer.created_at,
+        created_by_user_id=newer.created_by_user_id,
+        changes=changes,
+    )
+
+
+def _load_versions(
+    db: Session,
+    entity_type: VersionedEntityType,
+    entity_id: UUID,
+    versions: set[int],
+) -> dict[int, Any]:
+    model, entity_column = _VERSION_MODELS[entity_type]
+    rows = (
+        db.execute(
+            select(model).where(
+                entity_column == entity_id,
+                model.version.in_(sorted(versions)),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    return {row.version: row for row in rows}
+
+
+def get_version_diff(
+    db: Session,
+    entity_type: VersionedEntityType,
+    entity_id: UUID,
+    from_version: int,
+    to_version: int,
+) -> VersionDiffOut | None:
+    key = (entity_type, entity_id, from_version, to_version)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    rows = _load_versions(db, entity_type, entity_id, {from_version, to_version})
+    if from_version not in rows or to_version not in rows:
+        return None
+
+    diff = _compute_diff(entity_type, rows[from_version], rows[to_version])
+    _cache_put(key, diff)
+    return diff
+
+
+def get_version_changelog(
+    db: Session,
+    entity_type: VersionedEntityType,
+    entity_id: UUID,
+    before: int | None,
+    limit: int,
+) -> tuple[list[VersionDiffOut], int | None]:
+    model, entity_column = _VERSION_MODELS[entity_type]
+    latest_version = db.execute(
+        select(func.max(model.version)).where(entity_column == entity_id)
+    ).scalar_one_or_none()
+    if latest_version is None:
+        return [], None
+
+    # Version numbers are assigned contiguously from 1, so the page can be
+    # planned before anything is loaded.
+    top = latest_version if before is None else min(before - 1, latest_version)
+    page = list(range(top, max(top - limit, 0), -1))
+
+    entries: dict[int, VersionDiffOut] = {}
+    missing: list[int] = []
+    for version in page:
+        cached = _cache_get((entity_type, entity_id, version - 1, version))
+        if cached is not None:
+            entries[version] = cached
+        else:
+            missing.append(version)
+
+    if missing:
+        needed = set(missing) | {version - 1 for version in missing if version > 1}
+        rows = _load_versions(db, entity_type, entity_id, needed)
+        for version in missing:
+            if version not in rows:
+                continue
+            diff = _compute_diff(entity_type, rows.get(version - 1), rows[version])
+            _cache_put((entity_type, entity_id, version - 1, version), diff)
+            entries[version] = diff
+
+    next_before = page[-1] if page and page[-1] > 1 else None
+    return [entries[version] for version in page if version in entries], next_before
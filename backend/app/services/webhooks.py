@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import logging
+import random
+import socket
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import httpx
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_webhook_batch_size,
+    get_webhook_max_attempts,
+    get_webhook_poll_seconds,
+    get_webhook_timeout_seconds,
+)
+from app.db.models import WebhookDelivery, WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_EVENT_TYPES = frozenset({"incident.created", "incident.version_created"})
+DELIVERY_PENDING = "pending"
+DELIVERY_DELIVERED = "delivered"
+DELIVERY_DEAD_LETTER = "dead_letter"
+BACKOFF_BASE_SECONDS = 30.0
+BACKOFF_MAX_SECONDS = 3600.0
+CLAIM_BATCHES = 10
+MAX_ERROR_LENGTH = 500
+SIGNATURE_HEADER = "X-Whisper-Signature"
+TIMESTAMP_HEADER = "X-Whisper-Timestamp"
+
+
+def enqueue_webhook_event(
+    db: Session,
+    organisation_id: UUID,
+    event_type: str,
+    payload: dict[str, Any],
+) -> int:
+    # Rows land in the caller's transaction, so a delivery exists if and only
+    # if the change that caused it committed.
+    endpoint_ids = (
+        db.execute(
+            select(WebhookEndpoint.id).where(
+                WebhookEndpoint.organisation_id == organisation_id,
+                WebhookEndpoint.is_active.is_(True),
+                WebhookEndpoint.event_types.contains([event_type]),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    for endpoint_id in endpoint_ids:
+        db.add(
+            WebhookDelivery(
+                organisation_id=organisation_id,
+                endpoint_id=endpoint_id,
+                event_type=event_type,
+                payload=payload,
+            )
+        )
+    return len(endpoint_ids)
+
+
+def sign_webhook_body(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(
+        secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookTargetError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class WebhookTarget:
+    # The URL to connect to, with the host replaced by the address that was
+    # checked, and the original host for the Host header and TLS SNI.
+    url: httpx.URL
+    host: str
+    host_header: str
+
+
+def _resolve_host(host: str, port: int) -> list[str]:
+    return sorted(
+        {
+            info[4][0]
+            for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        }
+    )
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    # is_global excludes loopback, private, link-local (including cloud
+    # metadata at 169.254.169.254), shared and reserved ranges.
+    return ip.is_global and not ip.is_multicast
+
+
+def check_webhook_url(url: str) -> WebhookTarget:
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL as exc:
+        raise WebhookTargetError("Webhook URL must be http(s)") from exc
+    if parsed.scheme not in {"http", "https"} or not parsed.host:
+        raise WebhookTargetError("Webhook URL must be http(s)")
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        ipaddress.ip_address(parsed.host)
+    except ValueError:
+        try:
+            addresses = _resolve_host(parsed.host, port)
+        except (OSError, UnicodeError) as exc:
+            raise WebhookTargetError("Webhook host could not be resolved") from exc
+    else:
+        addresses = [parsed.host]
+    # Every address must be public, or a host with one public and one
+    # internal record could be steered at the internal one.
+    if not addresses or not all(_is_public_address(a) for a in addresses):
+        raise WebhookTargetError("Webhook URL must resolve to a public address")
+    return WebhookTarget(
+        url=parsed.copy_with(host=addresses[0]),
+        host=parsed.host,
+        host_header=parsed.netloc.decode("ascii"),
+    )
+
+
+def webhook_backoff_seconds(attempts: int) -> float:
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    # Jitter keeps retries for a recovering endpoint from arriving in lockstep.
+    return delay * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class _EndpointBatch:
+    endpoint_id: UUID
+    url: str
+    secret: str
+    deliveries: list[tuple[UUID, str, dict, datetime]] = field(default_factory=list)
+
+
+def _claim_due_deliveries(
+    session_factory: Callable[[], Session],
+    limit: int,
+    lease_seconds: float,
+    now: datetime,
+) -> list[_EndpointBatch]:
+    with session_factory() as db:
+        rows = db.execute(
+            select(
+                WebhookDelivery.id,
+                WebhookDelivery.endpoint_id,
+                WebhookDelivery.event_type,
+                WebhookDelivery.payload,
+                WebhookDelivery.created_at,
+                WebhookEndpoint.url,
+                WebhookEndpoint.secret,
+            )
+            .join(WebhookEndpoint, WebhookEndpoint.id == WebhookDelivery.endpoint_id)
+            .where(
+                WebhookDelivery.status == DELIVERY_PENDING,
+                WebhookDelivery.next_attempt_at <= now,
+                # Deliveries for a disabled endpoint wait until it is
+                # re-enabled rather than burning through their attempts.
+                WebhookEndpoint.is_active.is_(True),
+            )
+            .order_by(WebhookDelivery.next_attempt_at)
+            .limit(limit)
+            .with_for_update(of=WebhookDelivery, skip_locked=True)
+        ).all()
+        if not rows:
+            return []
+
+        # Push the claimed rows out of every worker's due window for the
+        # length of one attempt; if this worker dies they come back on their
+        # own once the lease runs out.
+        leased = db.execute(
+            select(WebhookDelivery).where(
+                WebhookDelivery.id.in_([row.id for row in rows])
+            )
+        ).scalars()
+        lease_until = now + timedelta(seconds=lease_seconds)
+        for delivery in leased:
+            delivery.next_attempt_at = lease_until
+        db.commit()
+
+    batches: dict[UUID, _EndpointBatch] = {}
+    for row in rows:
+        batch = batches.get(row.endpoint_id)
+        if batch is None:
+            batch = batches[row.endpoint_id] = _EndpointBatch(
+                row.endpoint_id, row.url, row.secret
+            )
+        batch.deliveries.append((row.id, row.event_type, row.payload, row.created_at))
+    return list(batches.values())
+
+
+async def _post_batch(
+    client: httpx.AsyncClient,
+    batch: _EndpointBatch,
+    deliveries: list[tuple[UUID, str, dict, datetime]],
+) -> str | None:
+    body = orjson.dumps(
+        {
+            "deliveries": [
+                {
+                    "id": delivery_id,
+                    "event": event_type,
+                    "created_at": created_at,
+                    "data": payload,
+                }
+                for delivery_id, event_type, payload, created_at in deliveries
+            ]
+        },
+        option=orjson.OPT_UTC_Z,
+    )
+    # Checked again on every attempt, since DNS can change after
+    # registration. The request then connects to the checked address so a
+    # second lookup cannot swap in an internal one.
+    try:
+        target = await asyncio.to_thread(check_webhook_url, batch.url)
+    except WebhookTargetError as exc:
+        return str(exc)
+    timestamp = str(int(datetime.now(timezone.utc).timestamp()))
+    try:
+        response = await client.post(
+            target.url,
+            content=body,
+            headers={
+                "Host": target.host_header,
+                "Content-Type": "application/json",
+                TIMESTAMP_HEADER: timestamp,
+                SIGNATURE_HEADER: sign_webhook_body(batch.secret, timestamp, body),
+            },
+            extensions={"sni_hostname": target.host},
+        )
+    except httpx.HTTPError as exc:
+        return f"{type(exc).__name__}: {exc}"[:MAX_ERROR_LENGTH]
+    if response.is_success:
+        return None
+    return f"HTTP {response.status_code}"
+
+
+def _record_results(
+    session_factory: Callable[[], Session],
+    results: list[tuple[list[UUID], str | None]],
+    max_attempts: int,
+    now: datetime,
+) -> None:
+    errors = {
+        delivery_id: error
+        for delivery_ids, error in results
+        for delivery_id in delivery_ids
+    }
+    with session_factory() as db:
+        deliveries = db.execute(
+            select(WebhookDelivery).where(WebhookDelivery.id.in_(errors))
+        ).scalars()
+        for delivery in deliveries:
+            error = errors[delivery.id]
+            delivery.attempts += 1
+            delivery.last_error = error
+            if error is None:
+                delivery.status = DELIVERY_DELIVERED
+                delivery.delivered_at = now
+            elif delivery.attempts >= max_attempts:
+                delivery.status = DELIVERY_DEAD_LETTER
+            else:
+                delivery.next_attempt_at = now + timedelta(
+                    seconds=webhook_backoff_seconds(delivery.attempts)
+                )
+        db.commit()
+
+
+async def deliver_due_webhooks(
+    session_factory: Callable[[], Session],
+    client: httpx.AsyncClient,
+    batch_size: int | None = None,
+    max_attempts: int | None = None,
+) -> int:
+    batch_size = batch_size or get_webhook_batch_size()
+    max_attempts = max_attempts or get_webhook_max_attempts()
+    lease_seconds = get_webhook_timeout_seconds() * 3
+
+    batches = _claim_due_deliveries(
+        session_factory,
+        batch_size * CLAIM_BATCHES,
+        lease_seconds,
+        datetime.now(timezone.utc),
+    )
+    if not batches:
+        return 0
+
+    # One POST per endpoint and chunk, all in flight at once over the
+    # client's pooled connections.
+    chunks = [
+        (batch, batch.deliveries[start : start + batch_size])
+        for batch in batches
+        for start in range(0, len(batch.deliveries), batch_size)
+    ]
+    errors = await asyncio.gather(
+        *(_post_batch(client, batch, chunk) for batch, chunk in chunks)
+    )
+    results = [
+        ([delivery[0] for delivery in chunk], error)
+        for (_, chunk), error in zip(chunks, errors)
+    ]
+    _record_results(
+        session_factory, results, max_attempts, datetime.now(timezone.utc)
+    )
+    return sum(len(delivery_ids) for delivery_ids, _ in results)
+
+
+def create_webhook_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=get_webhook_timeout_seconds(),
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        transport=transport,
+    )
+
+
+async def run_webhook_worker(
+    session_factory: Callable[[], Session],
+    stop: asyncio.Event,
+    once: bool = False,
+) -> None:
+    poll_seconds = get_webhook_poll_seconds()
+    async with create_webhook_client() as client:
+        while not stop.is_set():
+            try:
+                processed = await deliver_due_webhooks(session_factory, client)
+            except Exception:
+                logger.exception("Webhook delivery pass failed")
+                processed = 0
+            if once:
+                return
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.webhooks",
+        description="Deliver queued webhook events to registered endpoints.",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single delivery pass and exit."
+    )
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run_webhook_worker(SessionLocal, asyncio.Event(), args.once))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
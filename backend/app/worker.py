@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    get_job_lease_seconds,
+    get_job_poll_seconds,
+    get_job_worker_processes,
+    get_job_worker_threads,
+)
+from app.services.evidence_storage import clear_evidence_storages
+from app.services.jobs import (
+    EXECUTOR_PROCESS,
+    EXECUTOR_THREAD,
+    claim_jobs,
+    complete_job,
+    execute_job,
+    extend_job_leases,
+    fail_job,
+    load_job_handlers,
+    requeue_expired_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _init_process_worker() -> None:
+    from app.db.session import engine
+
+    # Pooled connections inherited through fork belong to the parent.
+    engine.dispose(close=False)
+    clear_evidence_storages(close=False)
+
+
+class JobWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        threads: int | None = None,
+        processes: int | None = None,
+        lease_seconds: int | None = None,
+        poll_seconds: float | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.capacity = {
+            EXECUTOR_THREAD: get_job_worker_threads() if threads is None else threads,
+            EXECUTOR_PROCESS: (
+                get_job_worker_processes() if processes is None else processes
+            ),
+        }
+        self.lease_seconds = lease_seconds or get_job_lease_seconds()
+        self.poll_seconds = poll_seconds or get_job_poll_seconds()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._executors: dict[str, Executor] = {}
+        self._running: dict[Future, tuple[UUID, str]] = {}
+
+    def _executor(self, name: str) -> Executor:
+        executor = self._executors.get(name)
+        if executor is None:
+            if name == EXECUTOR_PROCESS:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.capacity[name],
+                    initializer=_init_process_worker,
+                )
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.capacity[name],
+                    thread_name_prefix="job-worker",
+                )
+            self._executors[name] = executor
+        return executor
+
+    def _maintain(self) -> None:
+        with self.session_factory() as db:
+            requeued = requeue_expired_jobs(db)
+            extend_job_leases(
+                db,
+                [job_id for job_id, _ in self._running.values()],
+                self.worker_id,
+                self.lease_seconds,
+            )
+        if requeued:
+            logger.warning("Requeued %s jobs with expired leases", requeued)
+
+    def _fill(self) -> int:
+        handlers = load_job_handlers()
+        claimed = 0
+        for name, capacity in self.capacity.items():
+            busy = sum(1 for _, running in self._running.values() if running == name)
+            kinds = [
+                kind for kind, registered in handlers.items()
+                if registered.executor == name
+            ]
+            with self.session_factory() as db:
+                jobs = claim_jobs(
+                    db, kinds, capacity - busy, self.worker_id, self.lease_seconds
+                )
+            for job in jobs:
+                future = self._executor(name).submit(
+                    execute_job, job.kind, job.organisation_id, job.payload
+                )
+                self._running[future] = (job.id, name)
+            claimed += len(jobs)
+        return claimed
+
+    def _collect(self, timeout: float | None) -> None:
+        if not self._running:
+            return
+        done, _ = wait(self._running, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            job_id, _ = self._running[future]
+            with self.session_factory() as db:
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.exception("Job %s failed", job_id)
+                    recorded = fail_job(
+                        db, job_id, self.worker_id, f"{type(exc).__name__}: {exc}"
+                    )
+                else:
+                    recorded = complete_job(db, job_id, self.worker_id, result)
+            # Only dropped once written, so an outcome that could not be
+            # saved is tried again on the next pass.
+            del self._running[future]
+            if not recorded:
+                logger.warning(
+                    "Discarded outcome of job %s: its lease passed to another run",
+                    job_id,
+                )
+
+    def run(self, stop: threading.Event, once: bool = False) -> None:
+        maintain_every = self.lease_seconds / 3
+        last_maintained = float("-inf")
+        try:
+            while not stop.is_set():
+                try:
+                    if time.monotonic() - last_maintained >= maintain_every:
+                        self._maintain()
+                        last_maintained = time.monotonic()
+                    claimed = self._fill()
+                    if once:
+                        break
+                    if self._running:
+                        self._collect(self.poll_seconds)
+                    elif not claimed:
+                        stop.wait(self.poll_seconds)
+                except Exception:
+                    # A database blip must not take the worker down; running
+                    # jobs keep going and the next pass picks up from here.
+                    logger.exception("Job worker pass failed")
+                    if once:
+                        break
+                    stop.wait(self.poll_seconds)
+        finally:
+            # Let in-flight jobs finish and record their outcome rather than
+            # leaving them to time out on their lease.
+            while self._running:
+                try:
+                    self._collect(None)
+                except Exception:
+                    logger.exception(
+                        "Could not record finished jobs; their leases will expire"
+                    )
+                    break
+            for executor in self._executors.values():
+                executor.shutdown()
+            self._executors.clear()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.worker",
+        description="Run background jobs from the job table.",
+    )
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Claim one round of due jobs, wait for them and exit.",
+    )
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    worker = JobWorker(SessionLocal, threads=args.threads, processes=args.processes)
+    logger.info("Job worker %s started", worker.worker_id)
+    try:
+        worker.run(stop, once=args.once)
+    except KeyboardInterrupt:
+        stop.set()
+    finally:
+        clear_evidence_storages()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
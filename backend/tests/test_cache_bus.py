@@ -0,0 +1,113 @@
+import os
+import time
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core import oidc
+from app.db.session import engine
+from app.services import cache_bus
+from app.services.cache_bus import (
+    CacheInvalidationListener,
+    apply_invalidation,
+    publish_invalidation,
+)
+from app.services.entity_cache import (
+    LocalEntityCache,
+    get_entity_cache,
+    set_entity_cache,
+)
+
+ORG_ID = UUID("11111111-1111-1111-1111-111111111111")
+RISK_ID = UUID("22222222-2222-2222-2222-222222222222")
+RISK_KEY = f"risk:{ORG_ID}:{RISK_ID}"
+
+
+@pytest.fixture
+def local_cache():
+    previous = get_entity_cache()
+    cache = LocalEntityCache(max_size=16, ttl_seconds=60)
+    set_entity_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_entity_cache(previous)
+
+
+def test_apply_invalidation_evicts_local_entity(local_cache) -> None:
+    local_cache.set(RISK_KEY, b"{}")
+    apply_invalidation(
+        '{"entity_type": "risk", "organisation_id": "%s", "entity_id": "%s"}'
+        % (ORG_ID, RISK_ID)
+    )
+    assert local_cache.get(RISK_KEY) is None
+
+
+def test_apply_invalidation_clears_jwks_cache() -> None:
+    oidc._JWKS_CACHE["https://issuer.example/jwks"] = {"expires_at": 0, "jwks": {}}
+    apply_invalidation('{"entity_type": "jwks"}')
+    assert oidc._JWKS_CACHE == {}
+
+
+def test_dispatch_survives_change_feed_failures(local_cache, monkeypatch) -> None:
+    def closed_loop(*args):
+        raise RuntimeError("Event loop is closed")
+
+    monkeypatch.setattr(cache_bus.change_feed, "publish", closed_loop)
+    local_cache.set(RISK_KEY, b"{}")
+    listener = CacheInvalidationListener(conninfo="postgresql://unused")
+
+    listener._dispatch(
+        '{"entity_type": "risk", "organisation_id": "%s", "entity_id": "%s"}'
+        % (ORG_ID, RISK_ID)
+    )
+    assert local_cache.get(RISK_KEY) is None
+
+
+def test_listener_keeps_retrying_after_unexpected_errors(monkeypatch) -> None:
+    attempts = []
+
+    def broken_connect(*args, **kwargs):
+        attempts.append(args)
+        raise TypeError("notifies() got an unexpected keyword argument")
+
+    monkeypatch.setattr(cache_bus.psycopg, "connect", broken_connect)
+    monkeypatch.setattr(cache_bus, "RECONNECT_DELAY_SECONDS", 0.01)
+    listener = CacheInvalidationListener(conninfo="postgresql://unused")
+    listener.start()
+    try:
+        deadline = time.monotonic() + 2
+        while len(attempts) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(attempts) >= 3
+        assert listener._thread.is_alive()
+    finally:
+        listener.stop()
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_listener_evicts_entries_after_commit(local_cache) -> None:
+    listener = CacheInvalidationListener()
+    listener.start()
+    try:
+        if not listener.listening.wait(5):
+            pytest.skip("Database is unavailable.")
+        local_cache.set(RISK_KEY, b"{}")
+
+        # The request fixture holds an uncommitted transaction, so publish
+        # from a separate session that really commits.
+        with Session(engine) as db:
+            publish_invalidation(db, "risk", ORG_ID, RISK_ID)
+            time.sleep(0.2)
+            assert local_cache.get(RISK_KEY) == b"{}"
+            db.commit()
+
+        deadline = time.monotonic() + 5
+        while local_cache.get(RISK_KEY) is not None:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        listener.stop()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+from uuid import UUID
+
+from app.services.change_feed import (
+    SUBSCRIBER_QUEUE_SIZE,
+    ChangeFeedBroker,
+    format_sse,
+    iter_change_events,
+)
+
+ORG_ID = UUID("11111111-1111-1111-1111-111111111111")
+OTHER_ORG_ID = UUID("33333333-3333-3333-3333-333333333333")
+
+
+def test_format_sse_uses_sequence_as_event_id() -> None:
+    message = {"type": "change", "entity_type": "risk", "seq": 7}
+    event = format_sse(message)
+
+    assert event.startswith("id: 7\nevent: change\ndata: ")
+    assert event.endswith("\n\n")
+    assert json.loads(event.splitlines()[2].removeprefix("data: ")) == message
+
+
+def test_broker_fans_out_to_the_subscribed_organisation_only() -> None:
+    async def scenario() -> None:
+        broker = ChangeFeedBroker()
+        events = iter_change_events(ORG_ID, broker)
+        assert await events.__anext__() == "retry: 5000\n\n"
+        other = broker.subscribe(OTHER_ORG_ID)
+        assert broker.subscriber_count() == 2
+
+        broker.publish(ORG_ID, {"type": "change", "entity_type": "risk", "seq": 3})
+        event = await asyncio.wait_for(events.__anext__(), 1)
+        assert event.startswith("id: 3\nevent: change\n")
+        assert other.queue.empty()
+
+        await events.aclose()
+        assert broker.subscriber_count() == 1
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_told_to_resync() -> None:
+    async def scenario() -> None:
+        broker = ChangeFeedBroker()
+        subscription = broker.subscribe(ORG_ID)
+        for seq in range(SUBSCRIBER_QUEUE_SIZE + 1):
+            broker.publish(ORG_ID, {"type": "change", "seq": seq})
+        await asyncio.sleep(0)
+
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait() == {"type": "resync"}
+
+    asyncio.run(scenario())
+
+
+def test_subscriber_on_a_closed_loop_is_dropped() -> None:
+    broker = ChangeFeedBroker()
+
+    async def subscribe_and_leave() -> None:
+        broker.subscribe(ORG_ID)
+
+    asyncio.run(subscribe_and_leave())
+
+    async def scenario() -> None:
+        live = broker.subscribe(ORG_ID)
+        broker.publish(ORG_ID, {"type": "change", "seq": 1})
+        broker.publish_resync()
+        await asyncio.sleep(0)
+
+        assert broker.subscriber_count() == 1
+        assert live.queue.get_nowait() == {"type": "change", "seq": 1}
+        assert live.queue.get_nowait() == {"type": "resync"}
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.models import Organisation, UserAccount
+from app.db.session import SessionLocal
+from app.main import app
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_changes_since_cursor_returns_only_new_entities_in_batches() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Delta Sync Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="delta-sync@example.com",
+                display_name="Delta Sync",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    base_url = f"/api/organisations/{organisation_id}"
+    risk_response = client.post(
+        f"{base_url}/risks",
+        json={"title": "Synced", "likelihood": 2, "impact": 2, "status": "open"},
+        headers=headers,
+    )
+    if risk_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert risk_response.status_code == 200
+    risk_id = risk_response.json()["risk_id"]
+
+    initial = client.get(f"{base_url}/changes", headers=headers)
+    assert initial.status_code == 200
+    cursor = initial.json()["next_cursor"]
+    assert [risk["risk_id"] for risk in initial.json()["risks"]] == [risk_id]
+
+    control_response = client.post(
+        f"{base_url}/controls",
+        json={"control_code": "DS-1", "title": "Synced control", "status": "Draft"},
+        headers=headers,
+    )
+    assert control_response.status_code == 200
+    for title in ("Synced v2", "Synced v3"):
+        version_response = client.post(
+            f"{base_url}/risks/{risk_id}/versions",
+            json={"title": title, "likelihood": 3, "impact": 2, "status": "open"},
+            headers=headers,
+        )
+        assert version_response.status_code == 200
+
+    first_batch = client.get(
+        f"{base_url}/changes", params={"since": cursor, "limit": 2}, headers=headers
+    ).json()
+    assert [change["entity_type"] for change in first_batch["changes"]] == [
+        "control",
+        "risk",
+    ]
+    assert first_batch["has_more"] is True
+    assert [control["control_code"] for control in first_batch["controls"]] == [
+        "DS-1"
+    ]
+    assert first_batch["risks"][0]["latest_version"] == 3
+
+    second_batch = client.get(
+        f"{base_url}/changes",
+        params={"since": first_batch["next_cursor"], "limit": 2},
+        headers=headers,
+    ).json()
+    assert len(second_batch["changes"]) == 1
+    assert second_batch["has_more"] is False
+    assert second_batch["risks"][0]["title"] == "Synced v3"
+
+    caught_up = client.get(
+        f"{base_url}/changes",
+        params={"since": second_batch["next_cursor"]},
+        headers=headers,
+    ).json()
+    assert caught_up["changes"] == []
+    assert caught_up["next_cursor"] == second_batch["next_cursor"]
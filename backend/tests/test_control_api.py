@@ -1,3 +1,4 @@
+import json
 import os
 from uuid import UUID
 
@@ -91,3 +92,151 @@ def test_list_control_versions_returns_versions() -> None:
     assert {entry["organisation_id"] for entry in payload} == {
         str(organisation_id)
     }
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_lookup_controls_matches_code_prefix_and_fuzzy_title() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Control Lookup Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="control-lookup@example.com",
+                display_name="Control Lookup",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    created_ids = {}
+    for control_code, title in [
+        ("A.8.1", "User endpoint devices"),
+        ("A.5.15", "Access control"),
+        ("CC6.1", "Logical access security"),
+    ]:
+        response = client.post(
+            f"/api/organisations/{organisation_id}/controls",
+            json={
+                "framework": "ISO27001",
+                "control_code": control_code,
+                "title": title,
+                "status": "implemented",
+            },
+            headers=headers,
+        )
+        if response.status_code == 500:
+            pytest.skip("Database is unavailable.")
+        assert response.status_code == 200
+        created_ids[control_code] = response.json()["control_id"]
+
+    code_response = client.get(
+        f"/api/organisations/{organisation_id}/controls/lookup",
+        params={"q": "A.8.1"},
+        headers=headers,
+    )
+    assert code_response.status_code == 200
+    code_payload = code_response.json()
+    assert code_payload[0]["control_id"] == created_ids["A.8.1"]
+
+    fuzzy_response = client.get(
+        f"/api/organisations/{organisation_id}/controls/lookup",
+        params={"q": "acess control", "limit": 1},
+        headers=headers,
+    )
+    assert fuzzy_response.status_code == 200
+    fuzzy_payload = fuzzy_response.json()
+    assert len(fuzzy_payload) == 1
+    assert fuzzy_payload[0]["control_id"] == created_ids["A.5.15"]
+    assert 0 < fuzzy_payload[0]["similarity"] <= 1
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_list_controls_streams_ndjson_when_requested() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Control NDJSON Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="control-ndjson@example.com",
+                display_name="Control NDJSON",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+
+            for index in range(3):
+                control = Control(organisation_id=organisation_id)
+                session.add(control)
+                session.flush()
+                session.add(
+                    ControlVersion(
+                        organisation_id=organisation_id,
+                        control_id=control.id,
+                        version=1,
+                        control_code=f"ND{index}",
+                        title=f"Streamed Control {index}",
+                        description=None,
+                        framework=None,
+                        status="Implemented",
+                        owner_user_id=None,
+                        created_by_user_id=actor_user_id,
+                    )
+                )
+            session.commit()
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    url = f"/api/organisations/{organisation_id}/controls"
+    json_response = client.get(url, headers=headers)
+
+    if json_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+
+    ndjson_response = client.get(
+        url, headers={**headers, "Accept": "application/x-ndjson"}
+    )
+
+    assert ndjson_response.status_code == 200
+    assert ndjson_response.headers["content-type"].startswith(
+        "application/x-ndjson"
+    )
+    assert ndjson_response.headers["etag"] != json_response.headers["etag"]
+    lines = ndjson_response.text.splitlines()
+    streamed = sorted(
+        (json.loads(line) for line in lines), key=lambda entry: entry["control_code"]
+    )
+    listed = sorted(json_response.json(), key=lambda entry: entry["control_code"])
+    assert len(lines) == 3
+    assert streamed == listed
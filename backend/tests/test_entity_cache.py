@@ -0,0 +1,114 @@
+from uuid import UUID
+
+from app.schemas.risk import RiskOut
+from app.services.entity_cache import (
+    LocalEntityCache,
+    RedisEntityCache,
+    get_cached_entity,
+    get_entity_cache,
+    get_entity_cache_stats,
+    invalidate_cached_entity,
+    set_entity_cache,
+    store_cached_entity,
+)
+
+ORG_ID = UUID("11111111-1111-1111-1111-111111111111")
+RISK_ID = UUID("22222222-2222-2222-2222-222222222222")
+
+
+# Stands in for a Redis client with just the commands the cache issues.
+class _DictRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.values[key] = value
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+    def scan_iter(self, match: str):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.values) if key.startswith(prefix)]
+
+
+def _risk_out() -> RiskOut:
+    return RiskOut(
+        risk_id=RISK_ID,
+        organisation_id=ORG_ID,
+        latest_version=2,
+        title="Cached risk",
+        description=None,
+        category=None,
+        likelihood=2,
+        impact=3,
+        score=6,
+        status="open",
+        owner_user_id=None,
+        created_at="2025-01-01T00:00:00Z",
+        updated_at="2025-01-02T00:00:00Z",
+    )
+
+
+def test_local_entity_cache_evicts_least_recently_used() -> None:
+    cache = LocalEntityCache(max_size=2, ttl_seconds=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+
+
+def test_local_entity_cache_expires_entries() -> None:
+    cache = LocalEntityCache(max_size=2, ttl_seconds=0)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+
+
+def test_cached_entity_round_trips_through_redis_backend() -> None:
+    client = _DictRedis()
+    previous = get_entity_cache()
+    set_entity_cache(RedisEntityCache(client, ttl_seconds=60))
+    try:
+        risk_out = _risk_out()
+        assert get_cached_entity("risk", ORG_ID, RISK_ID, 5, RiskOut) is None
+        store_cached_entity("risk", ORG_ID, RISK_ID, 5, risk_out)
+
+        assert get_cached_entity("risk", ORG_ID, RISK_ID, 5, RiskOut) == risk_out
+        # A later change sequence means the entry may predate a write.
+        assert get_cached_entity("risk", ORG_ID, RISK_ID, 6, RiskOut) is None
+
+        invalidate_cached_entity("risk", ORG_ID, RISK_ID)
+        assert client.values == {}
+
+        stats = get_entity_cache_stats()
+        assert stats["backend"] == "redis"
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert stats["hit_ratio"] == round(1 / 3, 4)
+    finally:
+        set_entity_cache(previous)
+
+
+def test_unreadable_cache_entries_are_misses_and_dropped() -> None:
+    client = _DictRedis()
+    previous = get_entity_cache()
+    set_entity_cache(RedisEntityCache(client, ttl_seconds=60))
+    try:
+        key = f"whisper:entity:risk:{ORG_ID}:{RISK_ID}"
+        client.values[key] = b"not json"
+        assert get_cached_entity("risk", ORG_ID, RISK_ID, 5, RiskOut) is None
+        assert key not in client.values
+
+        # Written by a deploy whose DTO lacked fields RiskOut now requires.
+        client.values[key] = b'{"seq": 5, "dto": {"title": "Old shape"}}'
+        assert get_cached_entity("risk", ORG_ID, RISK_ID, 5, RiskOut) is None
+        assert key not in client.values
+        assert get_entity_cache_stats()["errors"] == 2
+    finally:
+        set_entity_cache(previous)
@@ -0,0 +1,35 @@
+from starlette.requests import Request
+
+from app.core.etag import build_etag, etag_matches
+
+
+def _request(query: str = "", if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/organisations/1/risks",
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+    )
+
+
+def test_build_etag_varies_by_sequence_and_query() -> None:
+    request = _request()
+    assert build_etag(request, 1) != build_etag(request, 2)
+    assert build_etag(request, 1) != build_etag(_request("as_of=2025-03-31"), 1)
+
+
+def test_etag_matches_handles_lists_weak_tags_and_wildcard() -> None:
+    etag = build_etag(_request(), 7)
+    strong = etag.removeprefix("W/")
+
+    assert etag_matches(_request(if_none_match=f'"other", {etag}'), etag)
+    assert etag_matches(_request(if_none_match=strong), etag)
+    assert etag_matches(_request(if_none_match="*"), etag)
+    assert not etag_matches(_request(if_none_match='W/"0-0"'), etag)
+    assert not etag_matches(_request(), etag)
@@ -166,3 +166,47 @@ def test_evidence_download_rejects_gcs_backend() -> None:
 
     assert response.status_code == 409
     assert response.json()["detail"] == "Evidence stored in GCS; use /download-url."
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_evidence_download_url_uses_s3_presigned_url(monkeypatch) -> None:
+    client = TestClient(app)
+
+    try:
+        organisation_id, actor_user_id, evidence_id = _create_org_actor_and_evidence(
+            "s3"
+        )
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    class FakeS3Storage:
+        backend = "s3"
+
+        def generate_signed_download_url(
+            self, object_key: str, filename: str, ttl_seconds: int
+        ) -> str:
+            return f"https://s3.example.com/{object_key}?ttl={ttl_seconds}"
+
+    monkeypatch.setenv("S3_SIGNED_URL_TTL_SECONDS", "90")
+    monkeypatch.setattr(
+        "app.api.routes.evidence.get_evidence_storage", lambda: FakeS3Storage()
+    )
+
+    response = client.get(
+        f"/api/organisations/{organisation_id}/evidence/{evidence_id}/download-url",
+        headers={
+            "X-Organisation-Id": str(organisation_id),
+            "X-Actor-User-Id": str(actor_user_id),
+        },
+    )
+
+    if response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "url": "https://s3.example.com/evidence/key?ttl=90",
+        "expires_in": 90,
+    }
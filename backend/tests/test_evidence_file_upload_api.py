@@ -10,6 +10,9 @@ from sqlalchemy import select
 from app.db.models import AuditEvent, EvidenceItem, Organisation, UserAccount
 from app.db.session import SessionLocal
 from app.main import app
+from app.services.evidence_integrity import verify_evidence_batch
+from app.services.evidence_text import EXTRACT_TEXT_JOB
+from app.services.jobs import execute_job
 
 
 @pytest.mark.skipif(
@@ -102,3 +105,197 @@ def test_evidence_file_upload_and_download() -> None:
                 del os.environ["EVIDENCE_LOCAL_ROOT"]
             else:
                 os.environ["EVIDENCE_LOCAL_ROOT"] = previous_root
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_compressed_evidence_keeps_sha_and_decodes_on_download() -> None:
+    pytest.importorskip("zstandard")
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Compressed Evidence Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="evidence-compressor@example.com",
+                display_name="Evidence Compressor",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    file_bytes = b"host,port,status\n" + b"db-1,5432,open\n" * 5000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        previous = {
+            key: os.getenv(key)
+            for key in ("EVIDENCE_LOCAL_ROOT", "EVIDENCE_COMPRESSION")
+        }
+        os.environ["EVIDENCE_LOCAL_ROOT"] = temp_dir
+        os.environ["EVIDENCE_COMPRESSION"] = "zstd"
+        try:
+            response = client.post(
+                f"/api/organisations/{organisation_id}/evidence/upload",
+                data={"evidence_type": "scan", "title": "Port scan"},
+                files={"file": ("ports.csv", file_bytes, "text/csv")},
+                headers=headers,
+            )
+            if response.status_code == 500:
+                pytest.skip("Database is unavailable.")
+
+            assert response.status_code == 200
+            payload = response.json()
+            assert payload["sha256"] == hashlib.sha256(file_bytes).hexdigest()
+            assert payload["size_bytes"] == len(file_bytes)
+            stored_path = os.path.join(temp_dir, payload["object_key"])
+            assert os.path.getsize(stored_path) < len(file_bytes) // 5
+            with SessionLocal() as session:
+                evidence = session.get(EvidenceItem, UUID(payload["id"]))
+                assert evidence.content_encoding == "zstd"
+
+            download_url = (
+                f"/api/organisations/{organisation_id}/evidence/"
+                f"{payload['id']}/download"
+            )
+            decoded = client.get(
+                download_url, headers={**headers, "Accept-Encoding": "identity"}
+            )
+            assert decoded.status_code == 200
+            assert "content-encoding" not in decoded.headers
+            assert decoded.content == file_bytes
+
+            passed_through = client.get(
+                download_url, headers={**headers, "Accept-Encoding": "gzip, zstd"}
+            )
+            assert passed_through.status_code == 200
+            assert passed_through.headers["content-encoding"] == "zstd"
+            assert passed_through.content == file_bytes
+
+            # Background readers see the original bytes too.
+            verified = verify_evidence_batch(SessionLocal, organisation_id)
+            assert verified["ok"] == 1
+            extracted = execute_job(
+                EXTRACT_TEXT_JOB, organisation_id, {"evidence_id": payload["id"]}
+            )
+            assert extracted["indexed"] is True
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+class FakeDirectUploadStorage:
+    backend = "s3"
+
+    def __init__(self) -> None:
+        self.objects: dict[str, dict] = {}
+
+    def generate_signed_upload_url(
+        self, object_key, ttl_seconds, sha256, content_type=None
+    ):
+        return f"https://s3.example.com/{object_key}", {"If-None-Match": "*"}
+
+    def stat_file(self, object_key):
+        return self.objects.get(object_key)
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_direct_upload_is_only_attached_after_the_object_checks_out(
+    monkeypatch,
+) -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Direct Upload Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="direct-uploader@example.com",
+                display_name="Direct Uploader",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    storage = FakeDirectUploadStorage()
+    monkeypatch.setattr(
+        "app.api.routes.evidence.get_evidence_storage", lambda: storage
+    )
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    base_url = f"/api/organisations/{organisation_id}/evidence"
+    file_bytes = b"large scan"
+    sha256 = hashlib.sha256(file_bytes).hexdigest()
+
+    invalid = client.post(
+        f"{base_url}/upload-url",
+        json={
+            "filename": "scan.pdf",
+            "sha256": "not-a-digest",
+            "size_bytes": len(file_bytes),
+            "evidence_type": "scan",
+        },
+        headers=headers,
+    )
+    if invalid.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert invalid.status_code == 400
+
+    response = client.post(
+        f"{base_url}/upload-url",
+        json={
+            "filename": "scan.pdf",
+            "sha256": sha256,
+            "size_bytes": len(file_bytes),
+            "evidence_type": "scan",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    evidence_id = response.json()["evidence_id"]
+    object_key = response.json()["url"].removeprefix("https://s3.example.com/")
+    assert response.json()["headers"] == {"If-None-Match": "*"}
+    with SessionLocal() as session:
+        pending = session.get(EvidenceItem, UUID(evidence_id))
+        assert pending.object_key is None
+        assert pending.uploaded_at is None
+
+    complete_url = f"{base_url}/{evidence_id}/complete-upload"
+    assert client.post(complete_url, headers=headers).status_code == 409
+    storage.objects[object_key] = {"size_bytes": 3, "sha256": sha256}
+    assert client.post(complete_url, headers=headers).status_code == 409
+
+    storage.objects[object_key] = {"size_bytes": len(file_bytes), "sha256": sha256}
+    completed = client.post(complete_url, headers=headers)
+    assert completed.status_code == 200
+    assert completed.json()["object_key"] == object_key
+    assert completed.json()["uploaded_at"] is not None
+    assert client.post(complete_url, headers=headers).status_code == 409
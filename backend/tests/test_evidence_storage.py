@@ -1,11 +1,25 @@
+import base64
 import hashlib
+import threading
+import uuid
 from uuid import UUID
 
+import pytest
+
+from app.services import evidence_storage
 from app.services.evidence_storage import (
+    EvidenceStorageCollision,
+    EvidenceStorageError,
     GcsEvidenceStorage,
+    GroupCommitFsync,
     LocalEvidenceStorage,
+    S3EvidenceStorage,
+    _b64_sha256,
     _sanitize_filename,
     build_object_key,
+    clear_evidence_storages,
+    get_evidence_storage,
+    open_decoded_file,
 )
 
 
@@ -52,6 +66,149 @@ def test_local_storage_returns_sha_size_and_content_type(tmp_path) -> None:
     assert stored_path.read_bytes() == file_bytes
 
 
+def test_strict_durability_syncs_every_changed_directory(
+    tmp_path, monkeypatch
+) -> None:
+    synced = []
+    monkeypatch.setattr(evidence_storage, "_fsync_path", synced.append)
+    storage = LocalEvidenceStorage(root=str(tmp_path), durability="strict")
+    org_id = UUID("33333333-3333-3333-3333-333333333333")
+
+    stored = storage.store_file(org_id, uuid.uuid4(), "a.txt", b"a")
+    object_dir = (tmp_path / stored["object_key"]).parent
+    # evidence/, evidence/<org>/ and evidence/<org>/<id>/ were all created.
+    assert set(synced) == {
+        object_dir,
+        object_dir.parent,
+        object_dir.parent.parent,
+        tmp_path,
+    }
+
+    synced.clear()
+    stored = storage.store_file(org_id, uuid.uuid4(), "b.txt", b"b")
+    object_dir = (tmp_path / stored["object_key"]).parent
+    assert set(synced) == {object_dir, object_dir.parent}
+
+
+def test_group_durability_shares_one_flush_between_concurrent_uploads(
+    tmp_path, monkeypatch
+) -> None:
+    flushes = []
+    monkeypatch.setattr(GroupCommitFsync, "_flush", staticmethod(flushes.append))
+    monkeypatch.setenv("EVIDENCE_GROUP_COMMIT_WINDOW_MS", "200")
+    storage = LocalEvidenceStorage(root=str(tmp_path), durability="group")
+    org_id = UUID("33333333-3333-3333-3333-333333333333")
+    barrier = threading.Barrier(8)
+
+    def upload(index: int) -> None:
+        barrier.wait()
+        storage.store_file(org_id, uuid.uuid4(), f"{index}.txt", b"x")
+
+    threads = [threading.Thread(target=upload, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(flushes) == 1
+    assert sum(1 for path in flushes[0] if path.suffix == ".txt") == 8
+
+
+def test_group_commit_raises_flush_errors_in_every_waiter(monkeypatch) -> None:
+    def failing_flush(paths):
+        raise OSError(5, "Input/output error")
+
+    monkeypatch.setattr(GroupCommitFsync, "_flush", staticmethod(failing_flush))
+    with pytest.raises(OSError):
+        GroupCommitFsync(0).sync([])
+
+
+def test_local_storage_rejects_unknown_durability(tmp_path) -> None:
+    with pytest.raises(EvidenceStorageError):
+        LocalEvidenceStorage(root=str(tmp_path), durability="eventually")
+
+
+def test_zstd_compression_keeps_original_sha_and_size(tmp_path) -> None:
+    pytest.importorskip("zstandard")
+    storage = LocalEvidenceStorage(root=str(tmp_path), compression="zstd")
+    file_bytes = b"timestamp,user,action\n" + b"2025-04-12,alice,login\n" * 2000
+    stored = storage.store_file(
+        UUID("33333333-3333-3333-3333-333333333333"),
+        uuid.uuid4(),
+        "export.csv",
+        file_bytes,
+        "text/csv",
+    )
+
+    assert stored["content_encoding"] == "zstd"
+    assert stored["sha256"] == hashlib.sha256(file_bytes).hexdigest()
+    assert stored["size_bytes"] == len(file_bytes)
+    assert (tmp_path / stored["object_key"]).stat().st_size < len(file_bytes) // 5
+    with open_decoded_file(storage, stored["object_key"], "zstd") as handle:
+        assert handle.read() == file_bytes
+
+
+def test_zstd_compression_skips_binary_and_small_files(tmp_path) -> None:
+    storage = LocalEvidenceStorage(root=str(tmp_path), compression="zstd")
+    org_id = UUID("33333333-3333-3333-3333-333333333333")
+    pdf_bytes = b"%PDF-1.7" + b"\x00" * 10000
+
+    pdf = storage.store_file(org_id, uuid.uuid4(), "scan.pdf", pdf_bytes, None)
+    small = storage.store_file(org_id, uuid.uuid4(), "note.txt", b"short", None)
+
+    assert pdf["content_encoding"] is None
+    assert small["content_encoding"] is None
+    assert (tmp_path / pdf["object_key"]).read_bytes() == pdf_bytes
+
+
+def test_local_storage_rejects_unknown_compression(tmp_path) -> None:
+    with pytest.raises(EvidenceStorageError):
+        LocalEvidenceStorage(root=str(tmp_path), compression="brotli")
+
+
+def test_get_evidence_storage_shares_one_instance_per_configuration(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setenv("EVIDENCE_STORAGE_BACKEND", "local")
+    monkeypatch.setenv("EVIDENCE_LOCAL_ROOT", str(tmp_path / "a"))
+    clear_evidence_storages()
+    try:
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(get_evidence_storage()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(storage) for storage in seen}) == 1
+        assert get_evidence_storage("local") is seen[0]
+
+        monkeypatch.setenv("EVIDENCE_LOCAL_ROOT", str(tmp_path / "b"))
+        moved = get_evidence_storage()
+        assert moved is not seen[0]
+        assert moved.root == tmp_path / "b"
+    finally:
+        clear_evidence_storages()
+
+
+def test_clear_evidence_storages_closes_clients(monkeypatch) -> None:
+    closed = []
+    monkeypatch.setattr(
+        LocalEvidenceStorage, "close", lambda self: closed.append(self)
+    )
+    clear_evidence_storages()
+    storage = get_evidence_storage("local")
+
+    clear_evidence_storages()
+
+    assert closed == [storage]
+    assert get_evidence_storage("local") is not storage
+    clear_evidence_storages(close=False)
+    assert closed == [storage]
+
+
 def test_gcs_signed_url_uses_sanitized_filename_and_ttl() -> None:
     class FakeBlob:
         def __init__(self) -> None:
@@ -98,3 +255,184 @@ def test_gcs_signed_url_uses_sanitized_filename_and_ttl() -> None:
         fake_blob.kwargs["response_disposition"]
         == 'attachment; filename="Report_Q1.pdf"'
     )
+
+
+class FakeS3Client:
+    def __init__(self, error_code: str | None = None) -> None:
+        self.error_code = error_code
+        self.objects: dict[str, dict] = {}
+        self.calls: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def _record(self, operation: str, kwargs: dict) -> None:
+        with self._lock:
+            self.calls.append((operation, kwargs))
+        if self.error_code is not None and operation in {
+            "put_object",
+            "complete_multipart_upload",
+        }:
+            from botocore.exceptions import ClientError
+
+            raise ClientError({"Error": {"Code": self.error_code}}, operation)
+
+    def put_object(self, **kwargs) -> dict:
+        self._record("put_object", kwargs)
+        return {}
+
+    def create_multipart_upload(self, **kwargs) -> dict:
+        self._record("create_multipart_upload", kwargs)
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs) -> dict:
+        self._record("upload_part", kwargs)
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs) -> dict:
+        self._record("complete_multipart_upload", kwargs)
+        return {}
+
+    def abort_multipart_upload(self, **kwargs) -> dict:
+        self._record("abort_multipart_upload", kwargs)
+        return {}
+
+    def head_object(self, **kwargs) -> dict:
+        self._record("head_object", kwargs)
+        if kwargs["Key"] not in self.objects:
+            from botocore.exceptions import ClientError
+
+            raise ClientError({"Error": {"Code": "404"}}, "head_object")
+        return self.objects[kwargs["Key"]]
+
+
+def _fake_s3_storage(client: FakeS3Client, part_bytes: int = 4) -> S3EvidenceStorage:
+    pytest.importorskip("botocore")
+    storage = S3EvidenceStorage.__new__(S3EvidenceStorage)
+    storage.bucket_name = "evidence-bucket"
+    storage.client = client
+    storage.part_bytes = part_bytes
+    storage.multipart_threshold = 10
+    storage.upload_concurrency = 3
+    return storage
+
+
+def test_s3_storage_puts_small_files_with_checksum_and_if_none_match() -> None:
+    client = FakeS3Client()
+    storage = _fake_s3_storage(client)
+    file_bytes = b"evidence"
+
+    stored = storage.store_file(
+        UUID("33333333-3333-3333-3333-333333333333"),
+        UUID("44444444-4444-4444-4444-444444444444"),
+        "report.txt",
+        file_bytes,
+        "text/plain",
+    )
+
+    assert stored["sha256"] == hashlib.sha256(file_bytes).hexdigest()
+    [(operation, kwargs)] = client.calls
+    assert operation == "put_object"
+    assert kwargs["Key"] == stored["object_key"]
+    assert kwargs["IfNoneMatch"] == "*"
+    assert kwargs["ContentType"] == "text/plain"
+    assert base64.b64decode(kwargs["ChecksumSHA256"]).hex() == stored["sha256"]
+
+
+def test_s3_storage_never_compresses(monkeypatch) -> None:
+    monkeypatch.setenv("EVIDENCE_COMPRESSION", "zstd")
+    monkeypatch.setenv("EVIDENCE_COMPRESSION_MIN_BYTES", "1")
+    client = FakeS3Client()
+    storage = _fake_s3_storage(client)
+    file_bytes = b"a,b,c\n"
+
+    stored = storage.store_file(uuid.uuid4(), uuid.uuid4(), "x.csv", file_bytes, None)
+
+    [(_, kwargs)] = client.calls
+    assert kwargs["Body"] == file_bytes
+    assert "ContentEncoding" not in kwargs
+    assert "content_encoding" not in stored
+
+
+def test_s3_storage_uploads_large_files_in_parallel_parts() -> None:
+    client = FakeS3Client()
+    storage = _fake_s3_storage(client)
+    file_bytes = b"0123456789abcdefghij"
+
+    storage.store_file(uuid.uuid4(), uuid.uuid4(), "big.bin", file_bytes, None)
+
+    parts = sorted(
+        (kwargs for operation, kwargs in client.calls if operation == "upload_part"),
+        key=lambda kwargs: kwargs["PartNumber"],
+    )
+    assert b"".join(part["Body"] for part in parts) == file_bytes
+    assert [part["PartNumber"] for part in parts] == [1, 2, 3, 4, 5]
+    operation, complete = client.calls[-1]
+    assert operation == "complete_multipart_upload"
+    assert complete["IfNoneMatch"] == "*"
+    assert [part["ETag"] for part in complete["MultipartUpload"]["Parts"]] == [
+        f"etag-{number}" for number in range(1, 6)
+    ]
+
+
+def test_s3_storage_maps_conditional_create_failure_to_collision() -> None:
+    for file_bytes in (b"small", b"0123456789abcdefghij"):
+        client = FakeS3Client(error_code="PreconditionFailed")
+        storage = _fake_s3_storage(client)
+
+        with pytest.raises(EvidenceStorageCollision):
+            storage.store_file(uuid.uuid4(), uuid.uuid4(), "a.bin", file_bytes, None)
+
+    assert client.calls[-1][0] == "abort_multipart_upload"
+
+
+def test_s3_stat_file_reports_stored_size_and_sha256() -> None:
+    client = FakeS3Client()
+    storage = _fake_s3_storage(client)
+    client.objects["single"] = {
+        "ContentLength": 1,
+        "ChecksumSHA256": _b64_sha256(b"x"),
+    }
+    client.objects["multipart"] = {
+        "ContentLength": 8,
+        "ChecksumSHA256": _b64_sha256(b"parts") + "-2",
+    }
+
+    assert storage.stat_file("single") == {
+        "size_bytes": 1,
+        "sha256": hashlib.sha256(b"x").hexdigest(),
+    }
+    assert storage.stat_file("multipart") == {"size_bytes": 8, "sha256": None}
+    assert storage.stat_file("absent") is None
+    assert client.calls[0][1]["ChecksumMode"] == "ENABLED"
+
+
+def test_s3_presigned_urls_sign_disposition_and_conditional_put(
+    monkeypatch,
+) -> None:
+    pytest.importorskip("boto3")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "minioadmin")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "minioadmin")
+    storage = S3EvidenceStorage(
+        "evidence-bucket",
+        endpoint_url="http://minio.local:9000",
+        region_name="us-east-1",
+    )
+
+    download_url = storage.generate_signed_download_url(
+        "evidence/key", 'folder/Report "Q1".pdf', 120
+    )
+    upload_url, upload_headers = storage.generate_signed_upload_url(
+        "evidence/key", 60, hashlib.sha256(b"x").hexdigest(), "application/pdf"
+    )
+
+    assert download_url.startswith(
+        "http://minio.local:9000/evidence-bucket/evidence/key?"
+    )
+    assert "X-Amz-Expires=120" in download_url
+    assert "Report_Q1.pdf" in download_url
+    assert "X-Amz-Expires=60" in upload_url
+    assert "if-none-match" in upload_url
+    assert upload_headers == {
+        "If-None-Match": "*",
+        "x-amz-checksum-sha256": _b64_sha256(b"x"),
+        "Content-Type": "application/pdf",
+    }
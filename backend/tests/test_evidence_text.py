@@ -0,0 +1,145 @@
+import io
+import os
+import tempfile
+import zipfile
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.db.models import EvidenceItem, Job, Organisation, UserAccount
+from app.db.session import SessionLocal
+from app.main import app
+from app.services.evidence_text import (
+    EXTRACT_TEXT_JOB,
+    EvidenceTextError,
+    detect_text_format,
+    extract_text,
+)
+from app.services.jobs import execute_job
+
+
+def _docx_bytes(paragraphs: list[str]) -> bytes:
+    body = "".join(
+        f"<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>" for paragraph in paragraphs
+    )
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        f'wordprocessingml/2006/main"><w:body>{body}</w:body></w:document>'
+    )
+    archive_bytes = io.BytesIO()
+    with zipfile.ZipFile(archive_bytes, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return archive_bytes.getvalue()
+
+
+def test_detect_text_format_prefers_extension_over_content_type() -> None:
+    assert detect_text_format("policy.DOCX", "application/octet-stream") == "docx"
+    assert detect_text_format("export", "text/csv; charset=utf-8") == "csv"
+    assert detect_text_format("scan.png", "image/png") is None
+
+
+def test_extract_text_handles_plain_csv_and_docx() -> None:
+    assert extract_text(io.BytesIO("Zugriffsprüfung\n".encode()), "text") == (
+        "Zugriffsprüfung\n"
+    )
+    assert extract_text(io.BytesIO(b"user,role\nalice,admin\n"), "csv") == (
+        "user role\nalice admin\n"
+    )
+    assert extract_text(
+        io.BytesIO(_docx_bytes(["Access review", "Quarterly"])), "docx"
+    ) == "Access review\nQuarterly\n"
+
+
+def test_extract_text_stops_at_the_character_limit() -> None:
+    assert extract_text(io.BytesIO(b"a" * 10_000), "text", max_chars=5) == "aaaaa"
+
+
+def test_extract_text_rejects_corrupt_docx() -> None:
+    with pytest.raises(EvidenceTextError):
+        extract_text(io.BytesIO(b"not a zip"), "docx")
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_uploaded_evidence_contents_become_searchable_after_extraction() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Evidence Text Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="evidence-text@example.com",
+                display_name="Evidence Text",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        previous_root = os.getenv("EVIDENCE_LOCAL_ROOT")
+        os.environ["EVIDENCE_LOCAL_ROOT"] = temp_dir
+        try:
+            response = client.post(
+                f"/api/organisations/{organisation_id}/evidence/upload",
+                data={"evidence_type": "policy", "title": "Policy"},
+                files={
+                    "file": (
+                        "policy.docx",
+                        _docx_bytes(["Backups are encrypted with rotating keys."]),
+                        "application/octet-stream",
+                    )
+                },
+                headers=headers,
+            )
+            if response.status_code == 500:
+                pytest.skip("Database is unavailable.")
+            assert response.status_code == 200
+            evidence_id = UUID(response.json()["id"])
+
+            def search() -> list[str]:
+                results = client.get(
+                    f"/api/organisations/{organisation_id}/search",
+                    params={"q": "encrypted backups"},
+                    headers=headers,
+                ).json()["results"]
+                return [hit["entity_id"] for hit in results]
+
+            assert search() == []
+
+            with SessionLocal() as session:
+                job = session.execute(
+                    select(Job).where(Job.organisation_id == organisation_id)
+                ).scalar_one()
+            assert job.kind == EXTRACT_TEXT_JOB
+            assert job.payload == {"evidence_id": str(evidence_id)}
+
+            # Run the handler in-process: the test database connection cannot
+            # be shared with a forked pool worker.
+            result = execute_job(job.kind, job.organisation_id, job.payload)
+            assert result["indexed"] is True
+
+            assert search() == [str(evidence_id)]
+            with SessionLocal() as session:
+                evidence = session.get(EvidenceItem, evidence_id)
+                assert evidence.content_indexed_at is not None
+        finally:
+            if previous_root is None:
+                os.environ.pop("EVIDENCE_LOCAL_ROOT", None)
+            else:
+                os.environ["EVIDENCE_LOCAL_ROOT"] = previous_root
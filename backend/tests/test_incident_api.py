@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from uuid import UUID
 
 import pytest
@@ -298,3 +299,183 @@ def test_create_incident_rejects_actor_from_other_org() -> None:
 
     assert response.status_code == 403
     assert response.json()["detail"] == "Actor not in organisation"
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_list_incidents_as_of_returns_historical_version() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Incident As Of Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="incident-asof@example.com",
+                display_name="Incident As Of",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    incident_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents",
+        json={"title": "Outage", "severity": "high", "status": "open"},
+        headers=headers,
+    )
+    if incident_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert incident_response.status_code == 200
+    incident_id = incident_response.json()["incident_id"]
+
+    version_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents/{incident_id}/versions",
+        json={"title": "Outage", "severity": "high", "status": "resolved"},
+        headers=headers,
+    )
+    assert version_response.status_code == 200
+
+    # All requests share one test transaction, so backdate the first version
+    # to give it a distinct created_at.
+    with SessionLocal() as session:
+        first_version = session.execute(
+            select(IncidentVersion).where(
+                IncidentVersion.incident_id == UUID(incident_id),
+                IncidentVersion.version == 1,
+            )
+        ).scalar_one()
+        first_version.created_at = first_version.created_at - timedelta(days=1)
+        session.commit()
+        first_version_at = first_version.created_at + timedelta(hours=1)
+
+    historical = client.get(
+        f"/api/organisations/{organisation_id}/incidents",
+        params={"as_of": first_version_at.isoformat()},
+        headers=headers,
+    )
+    assert historical.status_code == 200
+    assert [
+        (incident["incident_id"], incident["status"], incident["latest_version"])
+        for incident in historical.json()
+    ] == [(incident_id, "open", 1)]
+
+    detail = client.get(
+        f"/api/organisations/{organisation_id}/incidents/{incident_id}",
+        params={"as_of": first_version_at.isoformat()},
+        headers=headers,
+    )
+    assert detail.status_code == 200
+    assert detail.json()["status"] == "open"
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_incident_version_diff_and_changelog() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Incident Diff Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="incident-diff@example.com",
+                display_name="Incident Diff",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    incident_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents",
+        json={"title": "Outage", "severity": "high", "status": "open"},
+        headers=headers,
+    )
+    if incident_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert incident_response.status_code == 200
+    incident_id = incident_response.json()["incident_id"]
+
+    for payload in [
+        {"title": "Outage", "severity": "critical", "status": "open"},
+        {"title": "Database outage", "severity": "critical", "status": "resolved"},
+    ]:
+        version_response = client.post(
+            f"/api/organisations/{organisation_id}/incidents/{incident_id}/versions",
+            json=payload,
+            headers=headers,
+        )
+        assert version_response.status_code == 200
+
+    base_url = f"/api/organisations/{organisation_id}/incidents/{incident_id}"
+    diff_response = client.get(f"{base_url}/versions/1/diff/3", headers=headers)
+    assert diff_response.status_code == 200
+    diff = diff_response.json()
+    assert diff["from_version"] == 1
+    assert diff["to_version"] == 3
+    assert diff["changes"] == [
+        {"field": "title", "old": "Outage", "new": "Database outage"},
+        {"field": "severity", "old": "high", "new": "critical"},
+        {"field": "status", "old": "open", "new": "resolved"},
+    ]
+
+    missing_response = client.get(f"{base_url}/versions/1/diff/9", headers=headers)
+    assert missing_response.status_code == 404
+
+    single_response = client.get(f"{base_url}/versions/2", headers=headers)
+    assert single_response.status_code == 200
+    assert single_response.json()["version"] == 2
+    assert single_response.json()["severity"] == "critical"
+    assert client.get(f"{base_url}/versions/9", headers=headers).status_code == 404
+
+    first_page = client.get(
+        f"{base_url}/changelog", params={"limit": 2}, headers=headers
+    )
+    assert first_page.status_code == 200
+    first_payload = first_page.json()
+    assert [entry["to_version"] for entry in first_payload["entries"]] == [3, 2]
+    assert first_payload["entries"][1]["changes"] == [
+        {"field": "severity", "old": "high", "new": "critical"}
+    ]
+    assert first_payload["next_before"] == 2
+
+    second_page = client.get(
+        f"{base_url}/changelog",
+        params={"limit": 2, "before": first_payload["next_before"]},
+        headers=headers,
+    )
+    assert second_page.status_code == 200
+    second_payload = second_page.json()
+    assert [entry["from_version"] for entry in second_payload["entries"]] == [None]
+    assert second_payload["next_before"] is None
+    created_fields = {
+        change["field"] for change in second_payload["entries"][0]["changes"]
+    }
+    assert created_fields == {"title", "severity", "status"}
@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta, timezone
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.models import Job, Organisation, UserAccount
+from app.db.session import SessionLocal
+from app.main import app
+from app.services.jobs import (
+    claim_jobs,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    job_handler,
+    requeue_expired_jobs,
+)
+from app.worker import JobWorker
+
+
+@job_handler("test.echo")
+def _echo_job(organisation_id, payload):
+    return {"echo": payload["value"]}
+
+
+@job_handler("test.fail")
+def _failing_job(organisation_id, payload):
+    raise RuntimeError("boom")
+
+
+@job_handler("test.square", executor="process")
+def _square_job(organisation_id, payload):
+    return {"square": payload["value"] ** 2, "pid": os.getpid()}
+
+
+def _run_once(threads: int = 1, processes: int = 0) -> None:
+    JobWorker(
+        SessionLocal, threads=threads, processes=processes, worker_id="test-worker"
+    ).run(threading.Event(), once=True)
+
+
+def _job(job_id) -> Job:
+    with SessionLocal() as session:
+        return session.get(Job, job_id)
+
+
+def test_worker_survives_database_errors_between_passes() -> None:
+    sessions = []
+
+    def broken_session():
+        sessions.append(None)
+        raise ConnectionError("database restarting")
+
+    stop = threading.Event()
+    worker = JobWorker(
+        broken_session, threads=1, processes=0, poll_seconds=0.01, worker_id="w"
+    )
+    thread = threading.Thread(target=worker.run, args=(stop,))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 2
+        while len(sessions) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(sessions) >= 3
+        assert thread.is_alive()
+    finally:
+        stop.set()
+        thread.join(2)
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_worker_runs_due_jobs_by_priority_and_leaves_scheduled_ones() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Job Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="jobs@example.com",
+                display_name="Jobs",
+                role="auditor",
+            )
+            session.add(actor_user)
+            low = enqueue_job(
+                session, "test.echo", {"value": "low"}, organisation.id
+            )
+            high = enqueue_job(
+                session, "test.echo", {"value": "high"}, organisation.id, priority=10
+            )
+            later = enqueue_job(
+                session,
+                "test.echo",
+                {"value": "later"},
+                organisation.id,
+                priority=20,
+                run_at=datetime.now(timezone.utc) + timedelta(hours=1),
+            )
+            session.commit()
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    _run_once(threads=1)
+    assert _job(high.id).status == "succeeded"
+    assert _job(high.id).result == {"echo": "high"}
+    assert _job(low.id).status == "queued"
+
+    _run_once(threads=1)
+    assert _job(low.id).status == "succeeded"
+    assert _job(later.id).status == "queued"
+    assert _job(later.id).attempts == 0
+
+    response = client.get(
+        f"/api/organisations/{organisation_id}/jobs/{high.id}",
+        headers={
+            "X-Organisation-Id": str(organisation_id),
+            "X-Actor-User-Id": str(actor_user_id),
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["attempts"] == 1
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_failed_job_is_retried_later_then_marked_failed() -> None:
+    try:
+        with SessionLocal() as session:
+            job = enqueue_job(session, "test.fail", max_attempts=2)
+            session.commit()
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    _run_once()
+    retried = _job(job.id)
+    assert retried.status == "queued"
+    assert retried.attempts == 1
+    assert retried.last_error == "RuntimeError: boom"
+    assert retried.run_at > datetime.now(timezone.utc)
+
+    with SessionLocal() as session:
+        session.get(Job, job.id).run_at = datetime.now(timezone.utc)
+        session.commit()
+    _run_once()
+    failed = _job(job.id)
+    assert failed.status == "failed"
+    assert failed.attempts == 2
+    assert failed.finished_at is not None
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_process_pool_jobs_run_outside_the_worker_process() -> None:
+    try:
+        with SessionLocal() as session:
+            job = enqueue_job(session, "test.square", {"value": 12})
+            session.commit()
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    _run_once(threads=0, processes=1)
+    finished = _job(job.id)
+    assert finished.status == "succeeded"
+    assert finished.result["square"] == 144
+    assert finished.result["pid"] != os.getpid()
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_jobs_with_expired_leases_are_requeued() -> None:
+    try:
+        with SessionLocal() as session:
+            job = enqueue_job(session, "test.echo", {"value": "stuck"})
+            session.flush()
+            job.status = "running"
+            job.attempts = 1
+            job.locked_by = "dead-worker"
+            job.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+            session.commit()
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    with SessionLocal() as session:
+        assert requeue_expired_jobs(session) == 1
+    requeued = _job(job.id)
+    assert requeued.status == "queued"
+    assert requeued.locked_by is None
+    assert requeued.last_error == "Job lease expired"
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_only_the_current_lease_holder_can_finish_a_job() -> None:
+    try:
+        with SessionLocal() as session:
+            job = enqueue_job(session, "test.echo", {"value": "contested"})
+            session.flush()
+            job.status = "running"
+            job.attempts = 1
+            job.locked_by = "slow-worker"
+            job.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+            session.commit()
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    with SessionLocal() as session:
+        requeue_expired_jobs(session)
+        session.get(Job, job.id).run_at = datetime.now(timezone.utc)
+        session.commit()
+        [claimed] = [
+            claimed
+            for claimed in claim_jobs(session, ["test.echo"], 50, "new-worker", 60)
+            if claimed.id == job.id
+        ]
+
+    with SessionLocal() as session:
+        assert complete_job(session, job.id, "slow-worker", {"echo": "late"}) is False
+        assert fail_job(session, job.id, "slow-worker", "late failure") is False
+        assert complete_job(session, job.id, "new-worker", {"echo": "ok"}) is True
+        assert complete_job(session, job.id, "new-worker", {"echo": "again"}) is False
+
+    finished = _job(job.id)
+    assert finished.status == "succeeded"
+    assert finished.result == {"echo": "ok"}
+    assert finished.attempts == 2
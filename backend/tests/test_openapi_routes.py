@@ -11,7 +11,44 @@ def test_openapi_includes_api_routes() -> None:
     assert "/api/organisations" in schema["paths"]
     assert "/api/organisations/{organisation_id}" in schema["paths"]
     assert "/api/organisations/{organisation_id}/users" in schema["paths"]
+    assert "/api/organisations/{organisation_id}/summary" in schema["paths"]
+    assert "/api/organisations/{organisation_id}/metrics" in schema["paths"]
+    assert "/api/organisations/{organisation_id}/changes" in schema["paths"]
+    assert (
+        "/api/organisations/{organisation_id}/changes/stream"
+        in schema["paths"]
+    )
+    assert "/api/organisations/{organisation_id}/jobs/{job_id}" in schema["paths"]
+    assert (
+        "/api/organisations/{organisation_id}/evidence/integrity"
+        in schema["paths"]
+    )
+    assert "/api/organisations/{organisation_id}/webhooks" in schema["paths"]
+    assert (
+        "/api/organisations/{organisation_id}/webhooks/{webhook_id}"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/webhooks/{webhook_id}/deliveries"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/risks/{risk_id}/coverage"
+        in schema["paths"]
+    )
     assert "/api/organisations/{organisation_id}/risks" in schema["paths"]
+    assert (
+        "/api/organisations/{organisation_id}/risk-control-matrix"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/risk-control-matrix/export"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/risks/heatmap"
+        in schema["paths"]
+    )
     assert (
         "/api/organisations/{organisation_id}/risks/{risk_id}"
         in schema["paths"]
@@ -20,11 +57,24 @@ def test_openapi_includes_api_routes() -> None:
         "/api/organisations/{organisation_id}/risks/{risk_id}/versions"
         in schema["paths"]
     )
+    assert (
+        "/api/organisations/{organisation_id}/risks/{risk_id}"
+        "/versions/{from_version}/diff/{to_version}"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/risks/{risk_id}/changelog"
+        in schema["paths"]
+    )
     assert (
         "/api/organisations/{organisation_id}/risks/{risk_id}/controls"
         in schema["paths"]
     )
     assert "/api/organisations/{organisation_id}/controls" in schema["paths"]
+    assert (
+        "/api/organisations/{organisation_id}/controls/lookup"
+        in schema["paths"]
+    )
     assert (
         "/api/organisations/{organisation_id}/controls/{control_id}"
         in schema["paths"]
@@ -33,6 +83,15 @@ def test_openapi_includes_api_routes() -> None:
         "/api/organisations/{organisation_id}/controls/{control_id}/versions"
         in schema["paths"]
     )
+    assert (
+        "/api/organisations/{organisation_id}/controls/{control_id}"
+        "/versions/{from_version}/diff/{to_version}"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/controls/{control_id}/changelog"
+        in schema["paths"]
+    )
     assert (
         "/api/organisations/{organisation_id}/controls/{control_id}/evidence"
         in schema["paths"]
@@ -56,6 +115,14 @@ def test_openapi_includes_api_routes() -> None:
         "/api/organisations/{organisation_id}/evidence/{evidence_id}/download-url"
         in schema["paths"]
     )
+    assert (
+        "/api/organisations/{organisation_id}/evidence/upload-url"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/evidence/{evidence_id}/complete-upload"
+        in schema["paths"]
+    )
     assert "/api/organisations/{organisation_id}/incidents" in schema["paths"]
     assert (
         "/api/organisations/{organisation_id}/incidents/{incident_id}"
@@ -65,6 +132,20 @@ def test_openapi_includes_api_routes() -> None:
         "/api/organisations/{organisation_id}/incidents/{incident_id}/versions"
         in schema["paths"]
     )
+    assert (
+        "/api/organisations/{organisation_id}/incidents/{incident_id}"
+        "/versions/{version}"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/incidents/{incident_id}"
+        "/versions/{from_version}/diff/{to_version}"
+        in schema["paths"]
+    )
+    assert (
+        "/api/organisations/{organisation_id}/incidents/{incident_id}/changelog"
+        in schema["paths"]
+    )
     assert (
         "post"
         in schema["paths"]["/api/organisations/{organisation_id}/incidents"]
@@ -91,3 +172,4 @@ def test_openapi_includes_api_routes() -> None:
             "/api/organisations/{organisation_id}/incidents/{incident_id}/versions"
         ]
     )
+    assert "/api/organisations/{organisation_id}/search" in schema["paths"]
@@ -8,6 +8,7 @@ from sqlalchemy import select
 from app.db.models import AuditEvent, Organisation, UserAccount
 from app.db.session import SessionLocal
 from app.main import app
+from app.services.org_metrics import verify_org_metrics
 
 
 @pytest.mark.skipif(
@@ -136,3 +137,198 @@ def test_create_user_rejects_actor_from_other_org() -> None:
 
     assert response.status_code == 403
     assert response.json()["detail"] == "Actor not in organisation"
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_organisation_summary_counts_and_invalidates_on_write() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Summary Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="summary@example.com",
+                display_name="Summary",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    risk_response = client.post(
+        f"/api/organisations/{organisation_id}/risks",
+        json={"title": "Risk", "likelihood": 2, "impact": 2, "status": "open"},
+        headers=headers,
+    )
+    if risk_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert risk_response.status_code == 200
+
+    control_response = client.post(
+        f"/api/organisations/{organisation_id}/controls",
+        json={"control_code": "C-1", "title": "Control", "status": "planned"},
+        headers=headers,
+    )
+    assert control_response.status_code == 200
+    control_id = control_response.json()["control_id"]
+
+    evidence_response = client.post(
+        f"/api/organisations/{organisation_id}/evidence",
+        json={"title": "Policy", "evidence_type": "policy"},
+        headers=headers,
+    )
+    assert evidence_response.status_code == 200
+
+    response = client.get(
+        f"/api/organisations/{organisation_id}/summary", headers=headers
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["risks"] == {"total": 1, "by_status": {"open": 1}}
+    assert payload["controls"] == {"total": 1, "by_status": {"planned": 1}}
+    assert payload["incidents"] == {"total": 0, "by_status": {}}
+    assert payload["evidence"] == {"total": 1, "by_type": {"policy": 1}}
+
+    version_response = client.post(
+        f"/api/organisations/{organisation_id}/controls/{control_id}/versions",
+        json={"control_code": "C-1", "title": "Control", "status": "implemented"},
+        headers=headers,
+    )
+    assert version_response.status_code == 200
+
+    refreshed = client.get(
+        f"/api/organisations/{organisation_id}/summary", headers=headers
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.json()["controls"] == {
+        "total": 1,
+        "by_status": {"implemented": 1},
+    }
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_organisation_metrics_follow_version_writes() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Metrics Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="metrics@example.com",
+                display_name="Metrics",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    risk_response = client.post(
+        f"/api/organisations/{organisation_id}/risks",
+        json={"title": "Risk", "likelihood": 2, "impact": 3, "status": "open"},
+        headers=headers,
+    )
+    if risk_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert risk_response.status_code == 200
+    risk_id = risk_response.json()["risk_id"]
+
+    second_risk_response = client.post(
+        f"/api/organisations/{organisation_id}/risks",
+        json={"title": "Other", "likelihood": 4, "impact": 4, "status": "open"},
+        headers=headers,
+    )
+    assert second_risk_response.status_code == 200
+
+    risk_version_response = client.post(
+        f"/api/organisations/{organisation_id}/risks/{risk_id}/versions",
+        json={"title": "Risk", "likelihood": 1, "impact": 2, "status": "accepted"},
+        headers=headers,
+    )
+    assert risk_version_response.status_code == 200
+
+    control_response = client.post(
+        f"/api/organisations/{organisation_id}/controls",
+        json={"control_code": "C-1", "title": "Control", "status": "planned"},
+        headers=headers,
+    )
+    assert control_response.status_code == 200
+    control_id = control_response.json()["control_id"]
+
+    control_version_response = client.post(
+        f"/api/organisations/{organisation_id}/controls/{control_id}/versions",
+        json={"control_code": "C-1", "title": "Control", "status": "implemented"},
+        headers=headers,
+    )
+    assert control_version_response.status_code == 200
+
+    incident_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents",
+        json={"title": "Outage", "severity": "high", "status": "open"},
+        headers=headers,
+    )
+    assert incident_response.status_code == 200
+    incident_id = incident_response.json()["incident_id"]
+
+    second_incident_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents",
+        json={"title": "Phish", "severity": "low", "status": "open"},
+        headers=headers,
+    )
+    assert second_incident_response.status_code == 200
+
+    incident_version_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents/{incident_id}/versions",
+        json={"title": "Outage", "severity": "high", "status": "resolved"},
+        headers=headers,
+    )
+    assert incident_version_response.status_code == 200
+
+    response = client.get(
+        f"/api/organisations/{organisation_id}/metrics", headers=headers
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["risks"] == {
+        "count": 2,
+        "average_score": 9.0,
+        "by_status": {"open": 1, "accepted": 1},
+    }
+    assert payload["controls"] == {"count": 1, "by_status": {"implemented": 1}}
+    assert payload["incidents"] == {
+        "count": 2,
+        "by_status": {"open": 1, "resolved": 1},
+        "open_by_severity": {"low": 1},
+    }
+
+    with SessionLocal() as session:
+        assert verify_org_metrics(session, organisation_id) == {}
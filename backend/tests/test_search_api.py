@@ -0,0 +1,127 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.models import Organisation, UserAccount
+from app.db.session import SessionLocal
+from app.main import app
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_search_returns_ranked_latest_versions_with_snippets() -> None:
+    client = TestClient(app)
+
+    try:
+        with SessionLocal() as session:
+            organisation = Organisation(name="Search Org")
+            session.add(organisation)
+            session.commit()
+            session.refresh(organisation)
+
+            actor_user = UserAccount(
+                organisation_id=organisation.id,
+                email="searcher@example.com",
+                display_name="Searcher",
+                role="org_admin",
+            )
+            session.add(actor_user)
+            session.commit()
+            session.refresh(actor_user)
+            organisation_id = organisation.id
+            actor_user_id = actor_user.id
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+
+    risk_response = client.post(
+        f"/api/organisations/{organisation_id}/risks",
+        json={
+            "title": "Nightly backups failing",
+            "description": "Backup jobs for the <finance> database time out",
+            "category": "resilience",
+            "likelihood": 3,
+            "impact": 4,
+            "status": "open",
+        },
+        headers=headers,
+    )
+
+    if risk_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+
+    assert risk_response.status_code == 200
+    risk_id = risk_response.json()["risk_id"]
+
+    control_response = client.post(
+        f"/api/organisations/{organisation_id}/controls",
+        json={
+            "framework": "ISO27001",
+            "control_code": "A.8.13",
+            "title": "Information backup",
+            "description": "Backup copies are tested regularly",
+            "status": "implemented",
+        },
+        headers=headers,
+    )
+    assert control_response.status_code == 200
+    control_id = control_response.json()["control_id"]
+
+    incident_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents",
+        json={
+            "title": "Backup restore drill",
+            "severity": "low",
+            "status": "open",
+        },
+        headers=headers,
+    )
+    assert incident_response.status_code == 200
+    incident_id = incident_response.json()["incident_id"]
+
+    renamed_response = client.post(
+        f"/api/organisations/{organisation_id}/incidents/{incident_id}/versions",
+        json={
+            "title": "Phishing campaign",
+            "severity": "high",
+            "status": "investigating",
+        },
+        headers=headers,
+    )
+    assert renamed_response.status_code == 200
+
+    response = client.get(
+        f"/api/organisations/{organisation_id}/search",
+        params={"q": "backup"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["has_more"] is False
+    hits = {(hit["entity_type"], hit["entity_id"]) for hit in payload["results"]}
+    assert ("risk", risk_id) in hits
+    assert ("control", control_id) in hits
+    assert ("incident", incident_id) not in hits
+
+    risk_hit = next(
+        hit for hit in payload["results"] if hit["entity_id"] == risk_id
+    )
+    assert "<mark>" in risk_hit["snippet"]
+    assert "<finance>" not in risk_hit["snippet"]
+
+    paged_response = client.get(
+        f"/api/organisations/{organisation_id}/search",
+        params={"q": "backup", "types": ["risk", "control"], "limit": 1},
+        headers=headers,
+    )
+    assert paged_response.status_code == 200
+    paged = paged_response.json()
+    assert len(paged["results"]) == 1
+    assert paged["has_more"] is True
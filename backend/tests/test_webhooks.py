@@ -0,0 +1,364 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
+import json
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.db.models import Organisation, UserAccount, WebhookDelivery
+from app.db.session import SessionLocal
+from app.main import app
+from app.services import webhooks
+from app.services.webhooks import (
+    BACKOFF_MAX_SECONDS,
+    WebhookTargetError,
+    check_webhook_url,
+    deliver_due_webhooks,
+    sign_webhook_body,
+    webhook_backoff_seconds,
+)
+
+PUBLIC_ADDRESS = "93.184.215.14"
+
+
+@pytest.fixture(autouse=True)
+def resolved_hosts(monkeypatch) -> dict[str, list[str]]:
+    # Tests must not depend on real DNS; unknown hosts resolve publicly.
+    addresses: dict[str, list[str]] = {}
+    monkeypatch.setattr(
+        webhooks,
+        "_resolve_host",
+        lambda host, port: addresses.get(host, [PUBLIC_ADDRESS]),
+    )
+    return addresses
+
+
+def test_webhook_signature_covers_timestamp_and_body() -> None:
+    body = b'{"deliveries":[]}'
+    expected = hmac.new(b"secret", b"1700000000." + body, hashlib.sha256)
+
+    assert sign_webhook_body("secret", "1700000000", body) == (
+        f"sha256={expected.hexdigest()}"
+    )
+    assert sign_webhook_body("secret", "1700000001", body) != sign_webhook_body(
+        "secret", "1700000000", body
+    )
+
+
+def test_webhook_backoff_grows_exponentially_up_to_the_cap() -> None:
+    assert 15 <= webhook_backoff_seconds(1) <= 30
+    assert 60 <= webhook_backoff_seconds(3) <= 120
+    assert webhook_backoff_seconds(30) <= BACKOFF_MAX_SECONDS
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1:5432/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.5/hook",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.1.1]/hook",
+        "http://0.0.0.0/hook",
+        "ftp://tickets.example.com/hook",
+    ],
+)
+def test_webhook_urls_must_reach_public_addresses(url: str) -> None:
+    with pytest.raises(WebhookTargetError):
+        check_webhook_url(url)
+
+
+def test_webhook_hosts_with_any_internal_record_are_rejected(
+    resolved_hosts,
+) -> None:
+    resolved_hosts["internal.example.com"] = [PUBLIC_ADDRESS, "10.1.2.3"]
+
+    with pytest.raises(WebhookTargetError):
+        check_webhook_url("https://internal.example.com/hook")
+    target = check_webhook_url("https://tickets.example.com:8443/hook")
+    assert str(target.url) == f"https://{PUBLIC_ADDRESS}:8443/hook"
+    assert target.host_header == "tickets.example.com:8443"
+
+
+def _create_org_with_admin(name: str, email: str) -> tuple:
+    with SessionLocal() as session:
+        organisation = Organisation(name=name)
+        session.add(organisation)
+        session.commit()
+        session.refresh(organisation)
+
+        actor_user = UserAccount(
+            organisation_id=organisation.id,
+            email=email,
+            display_name="Webhook Admin",
+            role="org_admin",
+        )
+        session.add(actor_user)
+        session.commit()
+        session.refresh(actor_user)
+        return organisation.id, actor_user.id
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_incident_events_are_batched_per_endpoint_and_signed() -> None:
+    client = TestClient(app)
+
+    try:
+        organisation_id, actor_user_id = _create_org_with_admin(
+            "Webhook Org", "webhooks@example.com"
+        )
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    base_url = f"/api/organisations/{organisation_id}"
+    webhook_response = client.post(
+        f"{base_url}/webhooks",
+        json={
+            "url": "https://tickets.example.com/hooks/whisper",
+            "event_types": ["incident.created", "incident.version_created"],
+        },
+        headers=headers,
+    )
+    if webhook_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    assert webhook_response.status_code == 200
+    secret = webhook_response.json()["secret"]
+    internal_response = client.post(
+        f"{base_url}/webhooks",
+        json={"url": "http://169.254.169.254/", "event_types": ["incident.created"]},
+        headers=headers,
+    )
+    assert internal_response.status_code == 400
+    listed = client.get(f"{base_url}/webhooks", headers=headers).json()
+    assert "secret" not in listed[0]
+
+    incident_response = client.post(
+        f"{base_url}/incidents",
+        json={"title": "Outage", "severity": "high", "status": "open"},
+        headers=headers,
+    )
+    assert incident_response.status_code == 200
+    incident_id = incident_response.json()["incident_id"]
+
+    received: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(204)
+
+    async def deliver() -> int:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            return await deliver_due_webhooks(SessionLocal, http_client)
+
+    assert asyncio.run(deliver()) == 2
+    assert len(received) == 1
+    request = received[0]
+    assert request.url.host == PUBLIC_ADDRESS
+    assert request.headers["Host"] == "tickets.example.com"
+    assert request.headers["X-Whisper-Signature"] == sign_webhook_body(
+        secret, request.headers["X-Whisper-Timestamp"], request.content
+    )
+    deliveries = json.loads(request.content)["deliveries"]
+    assert sorted(delivery["event"] for delivery in deliveries) == [
+        "incident.created",
+        "incident.version_created",
+    ]
+    created = next(d for d in deliveries if d["event"] == "incident.created")
+    assert created["data"]["entity_id"] == incident_id
+    assert created["data"]["metadata"]["severity"] == "high"
+
+    with SessionLocal() as session:
+        statuses = session.execute(
+            select(WebhookDelivery.status, WebhookDelivery.attempts).where(
+                WebhookDelivery.organisation_id == organisation_id
+            )
+        ).all()
+    assert sorted(statuses) == [("delivered", 1), ("delivered", 1)]
+    assert asyncio.run(deliver()) == 0
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_failing_webhook_backs_off_then_dead_letters_and_can_be_retried() -> None:
+    client = TestClient(app)
+
+    try:
+        organisation_id, actor_user_id = _create_org_with_admin(
+            "Webhook Failure Org", "webhook-failures@example.com"
+        )
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    base_url = f"/api/organisations/{organisation_id}"
+    webhook_response = client.post(
+        f"{base_url}/webhooks",
+        json={
+            "url": "https://tickets.example.com/hooks/down",
+            "event_types": ["incident.created"],
+        },
+        headers=headers,
+    )
+    if webhook_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    webhook_id = webhook_response.json()["id"]
+    incident_response = client.post(
+        f"{base_url}/incidents",
+        json={"title": "Flaky", "severity": "low", "status": "open"},
+        headers=headers,
+    )
+    assert incident_response.status_code == 200
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def deliver() -> int:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            return await deliver_due_webhooks(
+                SessionLocal, http_client, max_attempts=2
+            )
+
+    assert asyncio.run(deliver()) == 1
+    with SessionLocal() as session:
+        delivery = session.execute(
+            select(WebhookDelivery).where(
+                WebhookDelivery.organisation_id == organisation_id
+            )
+        ).scalar_one()
+        assert delivery.status == "pending"
+        assert delivery.attempts == 1
+        assert delivery.last_error == "HTTP 503"
+        assert delivery.next_attempt_at > datetime.now(timezone.utc)
+        delivery_id = delivery.id
+
+    # Not due yet, so another pass leaves it alone.
+    assert asyncio.run(deliver()) == 0
+    with SessionLocal() as session:
+        session.execute(
+            update(WebhookDelivery)
+            .where(WebhookDelivery.id == delivery_id)
+            .values(next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        session.commit()
+    assert asyncio.run(deliver()) == 1
+
+    dead_letters = client.get(
+        f"{base_url}/webhooks/{webhook_id}/deliveries",
+        params={"status": "dead_letter"},
+        headers=headers,
+    )
+    assert dead_letters.status_code == 200
+    assert [delivery["id"] for delivery in dead_letters.json()] == [str(delivery_id)]
+    assert dead_letters.json()[0]["attempts"] == 2
+
+    retry_response = client.post(
+        f"{base_url}/webhooks/{webhook_id}/deliveries/{delivery_id}/retry",
+        headers=headers,
+    )
+    assert retry_response.status_code == 200
+    assert retry_response.json()["status"] == "pending"
+    assert retry_response.json()["attempts"] == 0
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1", reason="Database tests are disabled."
+)
+def test_webhooks_can_be_disabled_and_are_rechecked_before_delivery(
+    resolved_hosts,
+) -> None:
+    client = TestClient(app)
+
+    try:
+        organisation_id, actor_user_id = _create_org_with_admin(
+            "Webhook Toggle Org", "webhook-toggle@example.com"
+        )
+    except Exception:
+        pytest.skip("Database is unavailable.")
+
+    headers = {
+        "X-Organisation-Id": str(organisation_id),
+        "X-Actor-User-Id": str(actor_user_id),
+    }
+    base_url = f"/api/organisations/{organisation_id}"
+    webhook_response = client.post(
+        f"{base_url}/webhooks",
+        json={
+            "url": "https://rebind.example.com/hook",
+            "event_types": ["incident.created"],
+        },
+        headers=headers,
+    )
+    if webhook_response.status_code == 500:
+        pytest.skip("Database is unavailable.")
+    webhook_id = webhook_response.json()["id"]
+
+    disabled = client.patch(
+        f"{base_url}/webhooks/{webhook_id}",
+        json={"is_active": False},
+        headers=headers,
+    )
+    assert disabled.status_code == 200
+    assert disabled.json()["is_active"] is False
+    client.post(
+        f"{base_url}/incidents",
+        json={"title": "Quiet", "severity": "low", "status": "open"},
+        headers=headers,
+    )
+    with SessionLocal() as session:
+        assert not session.execute(
+            select(WebhookDelivery).where(
+                WebhookDelivery.organisation_id == organisation_id
+            )
+        ).all()
+
+    client.patch(
+        f"{base_url}/webhooks/{webhook_id}",
+        json={"is_active": True},
+        headers=headers,
+    )
+    client.post(
+        f"{base_url}/incidents",
+        json={"title": "Rebound", "severity": "low", "status": "open"},
+        headers=headers,
+    )
+    # The host now points inside the network; nothing may be sent to it.
+    resolved_hosts["rebind.example.com"] = ["127.0.0.1"]
+    received: list[httpx.Request] = []
+
+    async def deliver() -> int:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: received.append(request) or httpx.Response(204)
+            )
+        ) as http_client:
+            return await deliver_due_webhooks(SessionLocal, http_client)
+
+    assert asyncio.run(deliver()) == 1
+    assert received == []
+    with SessionLocal() as session:
+        delivery = session.execute(
+            select(WebhookDelivery).where(
+                WebhookDelivery.organisation_id == organisation_id
+            )
+        ).scalar_one()
+    assert delivery.status == "pending"
+    assert delivery.last_error == "Webhook URL must resolve to a public address"
@@ -0,0 +1,90 @@
+import { ApiAuthContext, apiFetch } from "./api";
+
+export interface ChangeEvent {
+  type: "change" | "resync";
+  entity_type?: string | null;
+  entity_id?: string | null;
+  organisation_id?: string | null;
+  seq?: number | null;
+}
+
+const RECONNECT_DELAY_MS = 5000;
+
+function parseEvent(block: string): ChangeEvent | null {
+  const data = block
+    .split("\n")
+    .filter((line) => line.startsWith("data:"))
+    .map((line) => line.slice(5).trimStart())
+    .join("\n");
+  if (!data) {
+    return null;
+  }
+  try {
+    return JSON.parse(data) as ChangeEvent;
+  } catch {
+    return null;
+  }
+}
+
+// EventSource cannot send the auth headers, so the stream is read with fetch.
+export function subscribeToChanges(
+  organisationId: string,
+  auth: ApiAuthContext,
+  onEvent: (event: ChangeEvent) => void
+): () => void {
+  const controller = new AbortController();
+
+  const run = async () => {
+    // Set when an open stream drops; cleared by the reconnect that follows.
+    let missedChanges = false;
+    while (!controller.signal.aborted) {
+      try {
+        const response = await apiFetch(
+          `/api/organisations/${organisationId}/changes/stream`,
+          {
+            auth,
+            headers: { Accept: "text/event-stream" },
+            signal: controller.signal,
+          }
+        );
+        const reader = response.body?.pipeThrough(new TextDecoderStream()).getReader();
+        if (!reader) {
+          return;
+        }
+        if (missedChanges) {
+          // Changes may have been missed while disconnected. Failed attempts
+          // in between do not repeat this, so callers refetch only once.
+          missedChanges = false;
+          onEvent({ type: "resync" });
+        }
+        missedChanges = true;
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) {
+            break;
+          }
+          buffer += value;
+          let boundary = buffer.indexOf("\n\n");
+          while (boundary !== -1) {
+            const event = parseEvent(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            if (event) {
+              onEvent(event);
+            }
+            boundary = buffer.indexOf("\n\n");
+          }
+        }
+      } catch {
+        // Fall through to reconnect unless the subscription was closed.
+      }
+      if (controller.signal.aborted) {
+        return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
+    }
+  };
+
+  void run();
+  return () => controller.abort();
+}
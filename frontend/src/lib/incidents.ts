@@ -1,4 +1,5 @@
 import { ApiAuthContext, apiJson } from "./api";
+import type { VersionChangelog } from "./versions";
 
 export interface IncidentSummary {
   incident_id: string;
@@ -68,6 +69,31 @@ export async function listIncidentVersions(
   );
 }
 
+export async function getIncidentVersion(
+  organisationId: string,
+  incidentId: string,
+  version: number,
+  auth: ApiAuthContext
+) {
+  return apiJson<IncidentVersion>(
+    `/api/organisations/${organisationId}/incidents/${incidentId}/versions/${version}`,
+    { auth }
+  );
+}
+
+export async function getIncidentChangelog(
+  organisationId: string,
+  incidentId: string,
+  auth: ApiAuthContext,
+  before?: number | null
+) {
+  const query = before ? `?before=${before}` : "";
+  return apiJson<VersionChangelog>(
+    `/api/organisations/${organisationId}/incidents/${incidentId}/changelog${query}`,
+    { auth }
+  );
+}
+
 export async function createIncident(
   organisationId: string,
   payload: IncidentPayload,
@@ -1,5 +1,7 @@
 import { ApiAuthContext, apiJson } from "./api";
 import type { ControlSummary } from "./controls";
+import type { EvidenceItem } from "./evidence";
+import type { VersionChangelog } from "./versions";
 
 export interface RiskSummary {
   risk_id: string;
@@ -17,6 +19,14 @@ export interface RiskDetail extends RiskSummary {
   owner_user_id?: string | null;
 }
 
+export interface RiskCoverageControl extends ControlSummary {
+  evidence: EvidenceItem[];
+}
+
+export interface RiskCoverage extends RiskDetail {
+  controls: RiskCoverageControl[];
+}
+
 export interface RiskVersion {
   id?: string | null;
   organisation_id?: string | null;
@@ -52,6 +62,17 @@ export async function getRisk(organisationId: string, riskId: string, auth: ApiA
   });
 }
 
+export async function getRiskCoverage(
+  organisationId: string,
+  riskId: string,
+  auth: ApiAuthContext
+) {
+  return apiJson<RiskCoverage>(
+    `/api/organisations/${organisationId}/risks/${riskId}/coverage`,
+    { auth }
+  );
+}
+
 export async function listRiskVersions(
   organisationId: string,
   riskId: string,
@@ -63,6 +84,19 @@ export async function listRiskVersions(
   );
 }
 
+export async function getRiskChangelog(
+  organisationId: string,
+  riskId: string,
+  auth: ApiAuthContext,
+  before?: number | null
+) {
+  const query = before ? `?before=${before}` : "";
+  return apiJson<VersionChangelog>(
+    `/api/organisations/${organisationId}/risks/${riskId}/changelog${query}`,
+    { auth }
+  );
+}
+
 export async function createRisk(
   organisationId: string,
   payload: RiskPayload,
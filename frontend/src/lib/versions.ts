@@ -0,0 +1,28 @@
+export interface VersionFieldChange {
+  field: string;
+  old?: string | number | null;
+  new?: string | number | null;
+}
+
+export interface VersionDiff {
+  from_version?: number | null;
+  to_version: number;
+  created_at?: string | null;
+  created_by_user_id?: string | null;
+  changes: VersionFieldChange[];
+}
+
+export interface VersionChangelog {
+  entries: VersionDiff[];
+  next_before?: number | null;
+}
+
+export function formatVersionChanges(diff: VersionDiff): string {
+  if (diff.from_version == null) {
+    return "Created";
+  }
+  if (diff.changes.length === 0) {
+    return "No field changes";
+  }
+  return diff.changes.map((change) => change.field).join(", ");
+}
@@ -7,11 +7,13 @@ import { getApiErrorMessage } from "../lib/api";
 import {
   createIncidentVersion,
   getIncident,
-  listIncidentVersions,
+  getIncidentChangelog,
+  getIncidentVersion,
   type IncidentDetail,
   type IncidentPayload,
   type IncidentVersion,
 } from "../lib/incidents";
+import { formatVersionChanges, type VersionDiff } from "../lib/versions";
 
 type IncidentFormState = {
   title: string;
@@ -55,7 +57,8 @@ export function IncidentDetailPage() {
   const { incidentId } = useParams();
   const { identity, status } = useAuth();
   const [incident, setIncident] = useState<IncidentDetail | null>(null);
-  const [versions, setVersions] = useState<IncidentVersion[]>([]);
+  const [versions, setVersions] = useState<VersionDiff[]>([]);
+  // An earlier version picked from the history; null shows the latest.
   const [selectedVersion, setSelectedVersion] = useState<IncidentVersion | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -84,10 +87,11 @@ export function IncidentDetailPage() {
     try {
       const [incidentData, versionData] = await Promise.all([
         getIncident(organisationId, incidentId, identity ?? {}),
-        listIncidentVersions(organisationId, incidentId, identity ?? {}),
+        getIncidentChangelog(organisationId, incidentId, identity ?? {}),
       ]);
       setIncident(incidentData);
-      setVersions(versionData);
+      setVersions(versionData.entries);
+      setSelectedVersion(null);
     } catch (fetchError) {
       setError(getApiErrorMessage(fetchError));
     } finally {
@@ -100,19 +104,11 @@ export function IncidentDetailPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [organisationId, userId, identity?.email, incidentId]);
 
-  useEffect(() => {
-    if (versions.length === 0) {
-      setSelectedVersion(null);
-      return;
-    }
-    const existing = selectedVersion
-      ? versions.find((version) => version.id === selectedVersion.id)
-      : null;
-    setSelectedVersion(existing ?? versions[0]);
-  }, [versions, selectedVersion]);
-
-  const activeVersion = selectedVersion ?? versions[0] ?? null;
-  const latestVersion = versions[0] ?? null;
+  const activeVersion = selectedVersion ?? incident;
+  const activeVersionNumber = selectedVersion?.version ?? incident?.latest_version ?? null;
+  const activeCreatedAt = selectedVersion
+    ? selectedVersion.created_at
+    : versions.find((entry) => entry.to_version === incident?.latest_version)?.created_at;
 
   const overviewFields = useMemo(() => {
     if (!incident || !activeVersion) {
@@ -132,25 +128,23 @@ export function IncidentDetailPage() {
   }, [incident, activeVersion]);
 
   const versionRows = versions.map((version) => [
-    version.version?.toString() || "-",
+    version.to_version.toString(),
     formatTimestamp(version.created_at),
-    version.status || "-",
-    version.severity || "-",
-    version.title || "-",
+    version.created_by_user_id || "-",
+    formatVersionChanges(version),
   ]);
 
   const handleOpenModal = () => {
-    const base = latestVersion ?? activeVersion;
-    if (!base) {
+    if (!incident) {
       return;
     }
     setCreateError(null);
     setFormState({
-      title: base.title ?? "",
-      description: base.description ?? "",
-      severity: base.severity ?? "",
-      status: base.status ?? "",
-      category: base.category ?? "",
+      title: incident.title ?? "",
+      description: incident.description ?? "",
+      severity: incident.severity ?? "",
+      status: incident.status ?? "",
+      category: incident.category ?? "",
     });
     setModalOpen(true);
   };
@@ -165,10 +159,24 @@ export function IncidentDetailPage() {
     setFormState((prev) => ({ ...prev, [field]: value }));
   };
 
-  const handleSelectVersion = (index: number) => {
-    const version = versions[index];
-    if (version) {
-      setSelectedVersion(version);
+  // Versions are fetched one at a time as they are picked, so opening an
+  // incident never downloads its whole history.
+  const handleSelectVersion = async (index: number) => {
+    const entry = versions[index];
+    if (!entry || !organisationId || !incidentId) {
+      return;
+    }
+    if (entry.to_version === incident?.latest_version) {
+      setSelectedVersion(null);
+      return;
+    }
+    setError(null);
+    try {
+      setSelectedVersion(
+        await getIncidentVersion(organisationId, incidentId, entry.to_version, identity ?? {})
+      );
+    } catch (fetchError) {
+      setError(getApiErrorMessage(fetchError));
     }
   };
 
@@ -233,8 +241,8 @@ export function IncidentDetailPage() {
               {activeVersion?.title || incident?.title || "—"}
             </h2>
             <p className="text-sm text-slate-400">Incident ID: {incident?.incident_id || "—"}</p>
-            {activeVersion?.version ? (
-              <p className="mt-1 text-xs text-slate-500">Viewing version {activeVersion.version}</p>
+            {activeVersionNumber ? (
+              <p className="mt-1 text-xs text-slate-500">Viewing version {activeVersionNumber}</p>
             ) : null}
           </div>
           <button
@@ -286,10 +294,10 @@ export function IncidentDetailPage() {
           <h3 className="text-sm font-semibold text-slate-100">Version snapshot</h3>
           <div className="mt-4 space-y-3 text-sm text-slate-400">
             <p>
-              <span className="text-slate-500">Version:</span> {activeVersion?.version ?? "-"}
+              <span className="text-slate-500">Version:</span> {activeVersionNumber ?? "-"}
             </p>
             <p>
-              <span className="text-slate-500">Created:</span> {formatTimestamp(activeVersion?.created_at)}
+              <span className="text-slate-500">Created:</span> {formatTimestamp(activeCreatedAt)}
             </p>
             <p>
               <span className="text-slate-500">Owner:</span> {activeVersion?.owner_user_id ?? "-"}
@@ -305,7 +313,7 @@ export function IncidentDetailPage() {
         </p>
         <div className="mt-4">
           <Table
-            headers={["Version", "Created", "Status", "Severity", "Title"]}
+            headers={["Version", "Created", "Author", "Changes"]}
             rows={versionRows}
             loading={loading}
             emptyState="No versions available yet."
@@ -6,14 +6,13 @@ import { useAuth } from "../contexts/AuthContext";
 import { getApiErrorMessage } from "../lib/api";
 import {
   createRiskVersion,
-  getRisk,
-  listRiskControls,
-  listRiskVersions,
+  getRiskChangelog,
+  getRiskCoverage,
+  type RiskCoverageControl,
   type RiskDetail,
   type RiskPayload,
-  type RiskVersion,
 } from "../lib/risks";
-import type { ControlSummary } from "../lib/controls";
+import { formatVersionChanges, type VersionDiff } from "../lib/versions";
 
 type RiskFormState = {
   title: string;
@@ -62,8 +61,8 @@ export function RiskDetailPage() {
   const { riskId } = useParams();
   const { identity, status } = useAuth();
   const [risk, setRisk] = useState<RiskDetail | null>(null);
-  const [versions, setVersions] = useState<RiskVersion[]>([]);
-  const [linkedControls, setLinkedControls] = useState<ControlSummary[]>([]);
+  const [versions, setVersions] = useState<VersionDiff[]>([]);
+  const [linkedControls, setLinkedControls] = useState<RiskCoverageControl[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [banner, setBanner] = useState<string | null>(null);
@@ -89,14 +88,14 @@ export function RiskDetailPage() {
     setLoading(true);
     setError(null);
     try {
-      const [riskData, versionData, controlsData] = await Promise.all([
-        getRisk(organisationId, riskId, identity ?? {}),
-        listRiskVersions(organisationId, riskId, identity ?? {}),
-        listRiskControls(organisationId, riskId, identity ?? {}),
+      const [coverageData, versionData] = await Promise.all([
+        getRiskCoverage(organisationId, riskId, identity ?? {}),
+        getRiskChangelog(organisationId, riskId, identity ?? {}),
       ]);
+      const { controls, ...riskData } = coverageData;
       setRisk(riskData);
-      setVersions(versionData);
-      setLinkedControls(controlsData);
+      setVersions(versionData.entries);
+      setLinkedControls(controls);
     } catch (fetchError) {
       setError(getApiErrorMessage(fetchError));
     } finally {
@@ -126,20 +125,18 @@ export function RiskDetailPage() {
     return fields;
   }, [risk]);
 
-  const versionRows = versions.map((version, index) => {
-    const actor = version.created_by_user_id || "-";
-    return [
-      version.version?.toString() || `${versions.length - index}`,
-      formatTimestamp(version.created_at),
-      actor,
-      version.title || "-",
-    ];
-  });
+  const versionRows = versions.map((version) => [
+    version.to_version.toString(),
+    formatTimestamp(version.created_at),
+    version.created_by_user_id || "-",
+    formatVersionChanges(version),
+  ]);
 
   const controlRows = linkedControls.map((control) => [
     control.control_code || "-",
     control.title || "Untitled control",
     control.status || "-",
+    control.evidence.length.toString(),
     formatTimestamp(control.updated_at ?? control.created_at ?? null),
   ]);
 
@@ -246,7 +243,7 @@ export function RiskDetailPage() {
         <p className="mt-1 text-sm text-slate-400">Track changes made to this risk.</p>
         <div className="mt-4">
           <Table
-            headers={["Version", "Created", "Actor", "Title"]}
+            headers={["Version", "Created", "Actor", "Changes"]}
             rows={versionRows}
             loading={loading}
             emptyState="No versions available yet."
@@ -259,7 +256,7 @@ export function RiskDetailPage() {
         <p className="mt-1 text-sm text-slate-400">Controls mitigating this risk.</p>
         <div className="mt-4">
           <Table
-            headers={["Control", "Title", "Status", "Last updated"]}
+            headers={["Control", "Title", "Status", "Evidence", "Last updated"]}
             rows={controlRows}
             loading={loading}
             emptyState="No controls linked yet."
@@ -5,6 +5,7 @@ import { StatCard } from "../components/StatCard";
 import { Table } from "../components/Table";
 import { useAuth } from "../contexts/AuthContext";
 import { getApiErrorMessage } from "../lib/api";
+import { subscribeToChanges } from "../lib/changes";
 import { createRisk, listRisks, type RiskPayload, type RiskSummary } from "../lib/risks";
 
 type RiskFormState = {
@@ -59,6 +60,7 @@ export function RisksPage() {
   const [formState, setFormState] = useState<RiskFormState>(emptyForm);
   const [createLoading, setCreateLoading] = useState(false);
   const [createError, setCreateError] = useState<string | null>(null);
+  const [refreshKey, setRefreshKey] = useState(0);
 
   const organisationId = identity?.organisationId ?? null;
   const userId = identity?.userId ?? null;
@@ -98,6 +100,18 @@ export function RisksPage() {
     return () => {
       isActive = false;
     };
+  }, [organisationId, userId, identity?.email, refreshKey]);
+
+  useEffect(() => {
+    if (!organisationId || !userId) {
+      return;
+    }
+
+    return subscribeToChanges(organisationId, identity ?? {}, (event) => {
+      if (event.type === "resync" || event.entity_type === "risk") {
+        setRefreshKey((key) => key + 1);
+      }
+    });
   }, [organisationId, userId, identity?.email]);
 
   const stats = useMemo(() => {
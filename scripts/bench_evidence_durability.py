@@ -0,0 +1,65 @@
+"""Measure local evidence uploads per second under each durability policy.
+
+Runs concurrent LocalEvidenceStorage.store_file calls the way parallel
+upload requests would, once with per-file strict fsyncs and once with
+group commit. Point --root at the disk evidence is stored on; a tmpfs makes
+fsync free and the comparison meaningless.
+
+Run from backend/:
+    PYTHONPATH=. python ../scripts/bench_evidence_durability.py --root /srv/evidence-bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.evidence_storage import LocalEvidenceStorage
+
+
+def _run(policy: str, root: str, uploads: int, concurrency: int, size: int) -> float:
+    storage = LocalEvidenceStorage(root=root, durability=policy)
+    organisation_id = uuid.uuid4()
+    payload = os.urandom(size)
+
+    def upload(index: int) -> None:
+        storage.store_file(organisation_id, uuid.uuid4(), f"{index}.bin", payload)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(upload, range(uploads)))
+        return uploads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=None)
+    parser.add_argument("--uploads", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size", type=int, default=64 * 1024)
+    parser.add_argument("--window-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ["EVIDENCE_GROUP_COMMIT_WINDOW_MS"] = str(args.window_ms)
+    base = args.root or tempfile.mkdtemp(prefix="evidence-bench-", dir=".")
+    print(
+        f"{args.uploads} uploads of {args.size} bytes, "
+        f"{args.concurrency} concurrent, under {os.path.abspath(base)}"
+    )
+    try:
+        for policy in ("strict", "group"):
+            root = tempfile.mkdtemp(prefix=f"{policy}-", dir=base)
+            rate = _run(policy, root, args.uploads, args.concurrency, args.size)
+            print(f"{policy:>6}: {rate:8.1f} uploads/s")
+    finally:
+        if args.root is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure per-request compile and planner overhead for hot lookups.
+
+Compares building a fresh select() per call against the shared statements in
+app.db.statements, each with psycopg server-side preparation off and on.
+
+Run from backend/ against a migrated database:
+    PYTHONPATH=. python ../scripts/bench_hot_statements.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_database_url
+from app.db.models import Risk
+from app.db.statements import RISK_FOR_ORG
+
+
+def _fresh_lookup(db: Session, organisation_id, risk_id):
+    return (
+        db.execute(
+            select(Risk).where(
+                Risk.id == risk_id,
+                Risk.organisation_id == organisation_id,
+            )
+        )
+        .scalars()
+        .first()
+    )
+
+
+def _shared_lookup(db: Session, organisation_id, risk_id):
+    return (
+        db.execute(
+            RISK_FOR_ORG,
+            {"risk_id": risk_id, "organisation_id": organisation_id},
+        )
+        .scalars()
+        .first()
+    )
+
+
+def _run(prepare_threshold, lookup, target, iterations: int) -> float:
+    engine = create_engine(
+        get_database_url(),
+        connect_args={"prepare_threshold": prepare_threshold},
+    )
+    organisation_id, risk_id = target
+    try:
+        with Session(engine) as db:
+            for _ in range(50):
+                lookup(db, organisation_id, risk_id)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                lookup(db, organisation_id, risk_id)
+                # Drop the identity map so every call hydrates a row, as a
+                # fresh request session would.
+                db.expunge_all()
+            return (time.perf_counter() - start) / iterations * 1_000_000
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_url())
+    with Session(engine) as db:
+        row = db.execute(select(Risk.organisation_id, Risk.id).limit(1)).first()
+    engine.dispose()
+    target = tuple(row) if row else (uuid.uuid4(), uuid.uuid4())
+
+    lookups = (("fresh select", _fresh_lookup), ("shared", _shared_lookup))
+    for label, lookup in lookups:
+        for prepare_threshold in (None, 1):
+            micros = _run(prepare_threshold, lookup, target, args.iterations)
+            print(
+                f"{label:>12} prepare_threshold={prepare_threshold!s:>4}: "
+                f"{micros:.1f} us/lookup"
+            )
+
+
+if __name__ == "__main__":
+    main()
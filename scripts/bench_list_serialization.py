@@ -0,0 +1,72 @@
+"""Compare the per-model and column-tuple serialization paths for risk lists.
+
+Run from backend/: PYTHONPATH=. python ../scripts/bench_list_serialization.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.responses import orjson_list_response
+from app.schemas.risk import RISK_ROWS_ADAPTER, RiskOut
+
+MODEL_LIST_ADAPTER = TypeAdapter(list[RiskOut])
+
+
+def _rows(count: int) -> list[dict]:
+    organisation_id = uuid.uuid4()
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "risk_id": uuid.uuid4(),
+            "organisation_id": organisation_id,
+            "latest_version": 1 + index % 4,
+            "title": f"Risk {index}",
+            "description": "Supplier outage affecting payroll processing",
+            "category": "operational",
+            "likelihood": 1 + index % 5,
+            "impact": 1 + index % 3,
+            "score": (1 + index % 5) * (1 + index % 3),
+            "status": "open",
+            "owner_user_id": None,
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(seconds=index),
+        }
+        for index in range(count)
+    ]
+
+
+def model_path(rows: list[dict]) -> bytes:
+    # Mirrors the previous route: one RiskOut per row, then FastAPI validates
+    # the list against response_model and serializes it.
+    models = [RiskOut(**row) for row in rows]
+    return MODEL_LIST_ADAPTER.dump_json(
+        MODEL_LIST_ADAPTER.validate_python(models)
+    )
+
+
+def fast_path(rows: list[dict]) -> bytes:
+    return orjson_list_response(RISK_ROWS_ADAPTER, rows, Response()).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    assert model_path(rows) == fast_path(rows)
+    for name, func in (("model", model_path), ("fast", fast_path)):
+        best = min(timeit.repeat(lambda: func(rows), number=1, repeat=args.repeat))
+        print(f"{name:>5}: {best * 1000:.1f} ms for {args.rows} rows")
+
+
+if __name__ == "__main__":
+    main()